@@ -0,0 +1,81 @@
+#
+# Measures the memory used by the instances of the most frequently created classes, with and without __slots__.
+# Run with: python benchmark.py
+#
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+import tracemalloc
+
+from data.cards import CardData
+from data.enemies import EnemyIntentionData
+from game_objects import GameObject, GameCard, EnemyCharacter
+from utils.animations import Tween, GetterTween, TupleTween, GetterTupleTween, Animation
+from utils.drawing import Drawable, DrawCall
+
+if TYPE_CHECKING:
+    from typing import List
+
+BENCHMARKED_CLASSES = [Drawable, DrawCall, GameObject, GameCard, EnemyCharacter, Tween, GetterTween, TupleTween, GetterTupleTween, Animation, CardData, EnemyIntentionData]
+INSTANCE_COUNT = 10000
+
+
+def get_slot_names(cls: type) -> List[str]:
+    """
+    :return: The names of the instance attributes declared in the __slots__ of the class and its bases, with private names mangled.
+    """
+    slot_names = []
+    for owner in cls.__mro__:
+        for slot_name in owner.__dict__.get("__slots__", ()):
+            if slot_name == "__weakref__":
+                continue
+            if slot_name.startswith("__") and not slot_name.endswith("__"):
+                slot_name = f"_{owner.__name__.lstrip('_')}{slot_name}"
+            slot_names.append(slot_name)
+    return slot_names
+
+
+def create_instances(cls: type, attribute_names: List[str], count: int) -> list:
+    """
+    Creates instances without calling __init__, and sets every attribute to the same value, so only the layout of the instances is measured.
+    """
+    instances = []
+    for _ in range(count):
+        instance = cls.__new__(cls)
+        for attribute_name in attribute_names:
+            object.__setattr__(instance, attribute_name, None)
+        instances.append(instance)
+    return instances
+
+
+def measure(cls: type, attribute_names: List[str]) -> tuple[float, float]:
+    """
+    :return: The bytes and the number of allocated memory blocks per instance.
+    """
+    tracemalloc.start()
+    start_size, _ = tracemalloc.get_traced_memory()
+    start_blocks = sum(statistic.count for statistic in tracemalloc.take_snapshot().statistics("filename"))
+    instances = create_instances(cls, attribute_names, INSTANCE_COUNT)
+    size, _ = tracemalloc.get_traced_memory()
+    blocks = sum(statistic.count for statistic in tracemalloc.take_snapshot().statistics("filename"))
+    tracemalloc.stop()
+    # The list holding the instances is not part of the instances
+    size -= instances.__sizeof__()
+    blocks -= 1
+    return (size - start_size) / INSTANCE_COUNT, (blocks - start_blocks) / INSTANCE_COUNT
+
+
+def main():
+    print(f"{'Class':<20}{'Bytes (dict)':>14}{'Bytes (slots)':>15}{'Saved':>8}{'Blocks (dict)':>15}{'Blocks (slots)':>16}")
+    for cls in BENCHMARKED_CLASSES:
+        attribute_names = get_slot_names(cls)
+        # A subclass without __slots__ has a __dict__, like the classes had before they were slotted
+        dict_cls = type(f"{cls.__name__}WithDict", (cls,), {})
+        dict_size, dict_blocks = measure(dict_cls, attribute_names)
+        slots_size, slots_blocks = measure(cls, attribute_names)
+        saved = 1 - slots_size / dict_size
+        print(f"{cls.__name__:<20}{dict_size:>14.0f}{slots_size:>15.0f}{saved:>8.0%}{dict_blocks:>15.1f}{slots_blocks:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
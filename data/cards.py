@@ -7,6 +7,9 @@ class CardData:
         "uncommon": 30,     # 30% chance
         "rare": 10          # 10% chance
     }
+    __slots__ = ("card_info_name", "card_info_description", "card_rarity", "card_damage_all", "card_target_damage", "card_target_remove_block", "card_self_damage", "card_self_block",
+                 "card_self_heal", "card_draw_additional_cards", "card_change_draw_limit", "card_change_draw_limit_next_turn", "card_change_mana_limit",
+                 "card_change_mana_limit_permanent", "card_change_mana", "card_change_mana_next_turn", "card_cost", "exhaust", "delete", "sprite_path")
 
     def __init__(self, card_info_name,
                  card_info_description,
@@ -6,6 +6,8 @@ if TYPE_CHECKING:
 
 
 class EnemyIntentionData:
+    __slots__ = ("gain_health_amount", "gain_block_amount", "deal_damage_amount")
+
     def __init__(self, gain_health_amount, gain_block_amount, deal_damage_amount):
         self.gain_health_amount = gain_health_amount
         self.gain_block_amount = gain_block_amount
@@ -85,3 +87,20 @@ class EnemySpawnData:
             data["intention_pattern"],
             data["extras"]
         )
+
+    def get_sprite_variant_path(self, variant_name: str) -> str:
+        """
+        Inserts the variant name (like "_damaged") before the file extension of the sprite path.
+        """
+        return self.sprite_path[:-4] + variant_name + self.sprite_path[-4:]
+
+    def get_sprite_variant_paths(self) -> List[str]:
+        """
+        :return: The sprite paths of every variant this enemy can show: the normal and damaged sprites, and the turn sprites of its intentions.
+        """
+        variant_names = ["", "_damaged"]
+        for intention in self.intention_pattern:
+            variant_name = intention.get_turn_sprite_path_prefix()
+            if variant_name not in variant_names:
+                variant_names.append(variant_name)
+        return [self.get_sprite_variant_path(variant_name) for variant_name in variant_names]
@@ -12,6 +12,7 @@ from utils import constants, audio
 from utils.constants import SAVE_GAME_FOLDER, FONT_SAVE_SELECTION, FONT_SAVE_SELECTION_S
 from data.cards import CardData
 from utils.input import Inputs
+from utils.text import render_text
 
 if TYPE_CHECKING:
     from typing import List
@@ -105,7 +106,7 @@ def display_blocking_save_selection_screen(screen, clock, available_save_games):
     delta_time = 1 / 60
     input_ticker: float = 1
     input_ticker_flip: bool = False
-    input_ticker_text = FONT_SAVE_SELECTION.render("|", True, (255, 255, 255))
+    input_ticker_text = render_text(FONT_SAVE_SELECTION, "|", True, (255, 255, 255)).copy()   # Copied, as the alpha is changed
     input_ticker_text_rect = input_ticker_text.get_rect()
 
     while input_active:     # Quick and dirty
@@ -141,9 +142,9 @@ def display_blocking_save_selection_screen(screen, clock, available_save_games):
         screen.fill((0, 0, 0))
 
         # Draw the title
-        note_text = FONT_SAVE_SELECTION.render("Start typing to name your new save.", True, (180, 180, 180))
+        note_text = render_text(FONT_SAVE_SELECTION, "Start typing to name your new save.", True, (180, 180, 180))
         screen.blit(note_text, (10, 15))
-        note_text = FONT_SAVE_SELECTION_S.render("Note: Your save name is used as the world generation seed.", True, (180, 180, 180))
+        note_text = render_text(FONT_SAVE_SELECTION_S, "Note: Your save name is used as the world generation seed.", True, (180, 180, 180))
         screen.blit(note_text, (10, 50))
 
         # Draw a rect around the input
@@ -151,7 +152,7 @@ def display_blocking_save_selection_screen(screen, clock, available_save_games):
         pygame.draw.rect(screen, (100, 100, 100), input_rect, 1)
 
         # Draw the input text
-        input_text = FONT_SAVE_SELECTION.render("New save name: " + save_game_name, True, (255, 255, 255))
+        input_text = render_text(FONT_SAVE_SELECTION, "New save name: " + save_game_name, True, (255, 255, 255))
         input_text_rect = input_text.get_rect()
         input_text_rect.midleft = (input_rect.left + 10, input_rect.centery)
         screen.blit(input_text, input_text_rect)
@@ -161,7 +162,7 @@ def display_blocking_save_selection_screen(screen, clock, available_save_games):
         screen.blit(input_ticker_text, input_ticker_text_rect)
 
         # Draw available saved games title
-        saved_games_title_text = FONT_SAVE_SELECTION.render("Available saved games (click to load):", True, (180, 180, 180))
+        saved_games_title_text = render_text(FONT_SAVE_SELECTION, "Available saved games (click to load):", True, (180, 180, 180))
         saved_games_title_text_rect = saved_games_title_text.get_rect()
         saved_games_title_text_rect.topleft = (10, 220)
         screen.blit(saved_games_title_text, saved_games_title_text_rect)
@@ -185,8 +186,8 @@ def display_blocking_save_selection_screen(screen, clock, available_save_games):
             screen.blit(button, button_rect)
 
             # Split the text into two parts
-            name_text = FONT_SAVE_SELECTION.render(existing_game_save, True, (0, 0, 0))
-            info_text = FONT_SAVE_SELECTION.render(f"(room {save.dungeon_room_index + 1}, {save.player_health} health, {len(save.player_cards)} cards)", True, (0, 0, 0))
+            name_text = render_text(FONT_SAVE_SELECTION, existing_game_save, True, (0, 0, 0))
+            info_text = render_text(FONT_SAVE_SELECTION, f"(room {save.dungeon_room_index + 1}, {save.player_health} health, {len(save.player_cards)} cards)", True, (0, 0, 0))
 
             # Get rectangles for both texts
             name_rect = name_text.get_rect()
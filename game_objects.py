@@ -2,55 +2,270 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Dict
 
 from utils import audio, constants
-from utils.drawing import Drawable, TextTooltip
-from utils.input import Inputs
+from utils.debugging import get_referrer_owners
+from utils.drawing import Drawable, FrameBuffer, RenderTarget, composite_blits, get_text_tooltip
 from utils.logging import log_warning, log_info
 
 if TYPE_CHECKING:
     from typing import List, Optional
 
+import gc
 import random
+import weakref
 import pygame
-import numpy as np
+from collections import Counter
 
 from utils.constants import LAYER_ENEMY, LAYER_PLAYER_HAND, LAYER_EFFECTS, LAYER_DEFAULT, ANIM_PRIORITY_CARD_DRAW, ANIM_PRIORITY_CARD_DISCARD, ANIM_PRIORITY_DEFAULT, FONT_ENEMY_HEALTH, \
     FONT_ENEMY_ICON_HINT, FONT_ENEMY_DAMAGE_EFFECT, FONT_CARD_NAME, FONT_CARD_DESCRIPTION, FONT_CARD_MANA_COST, ANIM_PRIORITY_CARD_REPOSITION, ENEMY_SPRITE_SCALING_FACTOR, SYMBOLS_FONT, \
     SYMBOLS_FONT_BG
 from data.cards import CardData
 from data.enemies import EnemySpawnData, EnemyIntentionData
-from utils.animations import Animation, Tween, GetterTween, GetterTupleTween
-from utils.io import ImageLibrary, load_image
+from utils.animations import Animation, Tween, GetterTween, GetterTupleTween, tween_scheduler
+from utils.io import ImageLibrary, load_sprite
 from utils.math import get_random_inside_rect
+from utils.particles import ParticleSystem
+from utils.pooling import ObjectPool, create_object_pool
+from utils.scaling import get_scaled_surface
+from utils.text import render_text
+
+
+class GameObjectHandle:
+    """
+    Refers to a game object by its slot and the generation of the slot in a collection, without keeping the object alive.
+    Store a handle instead of the game object when the object can be destroyed while the reference is held.
+    """
+    __slots__ = ("game_object_collection", "slot", "generation")
+
+    def __init__(self, game_object_collection: GameObjectCollection, slot: int, generation: int):
+        self.game_object_collection: GameObjectCollection = game_object_collection
+        self.slot: int = slot
+        self.generation: int = generation
+
+    def get(self) -> Optional[GameObject]:
+        """
+        :return: The game object, or None if it has been destroyed.
+        """
+        game_object = self.game_object_collection.get(self)
+        if (game_object is None) or game_object.is_awaiting_destruction:
+            return None
+        return game_object
 
 
 class GameObjectCollection:
     """
     A collection of game object references.
+    Game objects in the collection are retained in the frame buffer, so they don't have to be re-added every frame.
+    The objects are stored in a slot map: each object gets a handle of a slot index and a generation,
+    so adding, removing and looking up objects take constant time, and handles of removed objects stop resolving.
+    Destroyed objects are queued, and released at the end of the frame by destroy_queued_game_objects().
     """
 
-    def __init__(self):
+    def __init__(self, frame_buffer: Optional[FrameBuffer] = None):
         self.game_objects: List[GameObject] = []
+        """
+        The game objects in the order they were added, for iterating.
+        Removed objects stay in the list until the next compact(), so it can be iterated while objects are destroyed.
+        """
+        self.frame_buffer: Optional[FrameBuffer] = frame_buffer
+        """The frame buffer the game objects are drawn with."""
+        self.live_counts: Counter = Counter()
+        """The number of game objects in the collection, per type."""
+        self.destruction_queue: List[GameObject] = []
+        """The objects destroyed this frame. They keep their slots until destroy_queued_game_objects() is called."""
+        self.__slots: List[Optional[GameObject]] = []
+        self.__slot_generations: List[int] = []
+        self.__free_slots: List[int] = []
+        self.__has_removed_game_objects: bool = False
+        self.__interpolated_game_objects: List[GameObject] = []
+        self.particle_systems: Dict[int, ParticleSystem] = {}
+        """The particle systems for short-lived effects, one per draw order. Created when first used."""
+        self.__destroyed_game_object_references: List[tuple[weakref.ReferenceType, str, int]] = []
+        """Weak references to the released objects that are not pooled, with their names and destruction times. Used to detect leaks."""
 
     def add(self, game_object: GameObject):
         if game_object is None:
             raise Exception("Trying to add a None GameObject.")
-        if game_object in self.game_objects:
+        if self.contains(game_object):
             raise Exception("Trying to add a GameObject reference that is already in the collection.")
+        if self.__free_slots:
+            slot = self.__free_slots.pop()
+        else:
+            slot = len(self.__slots)
+            self.__slots.append(None)
+            self.__slot_generations.append(0)
+        self.__slots[slot] = game_object
+        game_object.handle = GameObjectHandle(self, slot, self.__slot_generations[slot])
         self.game_objects.append(game_object)
+        self.live_counts[type(game_object)] += 1
+        if self.frame_buffer:
+            self.frame_buffer.add_retained_drawable(game_object)
 
     def remove(self, game_object: GameObject):
+        """
+        Stops drawing the object, and queues it for destruction at the end of the frame.
+        """
         if game_object is None:
             raise Exception("Trying to remove a None GameObject.")
         if not game_object.is_awaiting_destruction:
             game_object.destroy()
             return
-        self.game_objects.remove(game_object)
+        if not self.contains(game_object):
+            raise Exception(f"Trying to remove {game_object.name}, which is not in the collection.")
+        if self.frame_buffer:
+            self.frame_buffer.remove_retained_drawable(game_object)
+        self.destruction_queue.append(game_object)
+
+    def destroy_queued_game_objects(self):
+        """
+        Frees the slots of the objects destroyed since the last call, and releases their animations, tooltips and surfaces.
+        Pooled objects are returned to their pools. Called at the end of every frame and before every simulation step.
+        """
+        if not self.destruction_queue:
+            return
+        destruction_queue = self.destruction_queue
+        self.destruction_queue = []
+        for game_object in destruction_queue:
+            slot = game_object.handle.slot
+            self.__slots[slot] = None
+            # Invalidates the handles of the removed object
+            self.__slot_generations[slot] += 1
+            self.__free_slots.append(slot)
+            game_object.handle = None
+            self.live_counts[type(game_object)] -= 1
+            if self.live_counts[type(game_object)] <= 0:
+                del self.live_counts[type(game_object)]
+            game_object.on_destroyed()
+            if game_object.pool is not None:
+                game_object.pool.release(game_object)
+            else:
+                self.__destroyed_game_object_references.append((weakref.ref(game_object), f"{type(game_object).__name__} {game_object.name}", game_object.time_destroyed_at))
+        self.__has_removed_game_objects = True
+
+    def report_leaked_game_objects(self):
+        """
+        Warns about the released objects that are still referenced LEAK_REPORT_DELAY milliseconds after their destruction, naming the owners of the references.
+        Pooled objects are not checked, as their pools keep them alive.
+        """
+        references = self.__destroyed_game_object_references
+        current_time = pygame.time.get_ticks()
+        # The references are in the order of destruction, so the oldest one is checked first
+        if (not references) or (current_time - references[0][2] < constants.LEAK_REPORT_DELAY):
+            return
+        expired_count = 0
+        while (expired_count < len(references)) and (current_time - references[expired_count][2] >= constants.LEAK_REPORT_DELAY):
+            expired_count += 1
+        expired_references = references[:expired_count]
+        self.__destroyed_game_object_references = references[expired_count:]
+        # Released objects that are part of a reference cycle stay alive until the garbage collector runs
+        if any(reference() is not None for reference, name, time_destroyed_at in expired_references):
+            gc.collect()
+        for reference, name, time_destroyed_at in expired_references:
+            game_object = reference()
+            if game_object is None:
+                continue
+            owners = ", ".join(get_referrer_owners(game_object)) or "unknown"
+            log_warning(f"{name} was destroyed {(current_time - time_destroyed_at) / 1000:.1f}s ago, but is still referenced by {owners}. This is a memory leak!")
+
+    def contains(self, drawable: Drawable) -> bool:
+        handle = getattr(drawable, "handle", None)
+        return (handle is not None) and (handle.game_object_collection is self) and (self.__slots[handle.slot] is drawable)
+
+    def get(self, handle: GameObjectHandle) -> Optional[GameObject]:
+        """
+        :return: The game object of the handle, or None if it has been removed.
+        """
+        slot = handle.slot
+        if (handle.game_object_collection is self) and (slot < len(self.__slots)) and (self.__slot_generations[slot] == handle.generation):
+            return self.__slots[slot]
+        return None
+
+    def get_particle_system(self, draw_order: int) -> ParticleSystem:
+        particle_system = self.particle_systems.get(draw_order)
+        if particle_system is None:
+            particle_system = ParticleSystem(draw_order)
+            self.particle_systems[draw_order] = particle_system
+            if self.frame_buffer:
+                self.frame_buffer.add_retained_drawable(particle_system)
+        return particle_system
+
+    def update_particle_systems(self, delta_time: float):
+        for particle_system in self.particle_systems.values():
+            particle_system.update(delta_time)
+
+    def get_live_count(self, game_object_type: type) -> int:
+        return self.live_counts[game_object_type]
+
+    def compact(self):
+        """
+        Drops the removed game objects from the game_objects list. Called once per frame, before the game objects are updated.
+        """
+        if not self.__has_removed_game_objects:
+            return
+        # An object removed and added again since the last compaction is listed twice, keep the first entry
+        self.game_objects = list(dict.fromkeys(game_object for game_object in self.game_objects if self.contains(game_object)))
+        self.__has_removed_game_objects = False
+
+    def store_previous_positions(self):
+        """
+        Stores the positions of the game objects before the last simulation step of the frame, to interpolate from when drawing.
+        """
+        for game_object in self.game_objects:
+            game_object.previous_position = game_object.rect.topleft
+
+    def store_simulated_positions(self):
+        """
+        Stores the positions of the game objects after the last simulation step of the frame.
+        """
+        for game_object in self.game_objects:
+            game_object.simulated_position = game_object.rect.topleft
+
+    def interpolate_positions(self, interpolation: float):
+        """
+        Moves the game objects between their previous and simulated positions, for drawing. Call restore_positions() after drawing.
+        Objects moved outside the simulation steps are drawn where they are.
+        """
+        self.__interpolated_game_objects.clear()
+        for game_object in self.game_objects:
+            position = game_object.rect.topleft
+            previous_position = game_object.previous_position
+            if (position == previous_position) or (position != game_object.simulated_position):
+                continue
+            game_object.rect.topleft = (round(previous_position[0] + (position[0] - previous_position[0]) * interpolation),
+                                        round(previous_position[1] + (position[1] - previous_position[1]) * interpolation))
+            self.__interpolated_game_objects.append(game_object)
+
+    def restore_positions(self):
+        for game_object in self.__interpolated_game_objects:
+            game_object.rect.topleft = game_object.simulated_position
+        self.__interpolated_game_objects.clear()
+
+    def has_animating_game_objects(self) -> bool:
+        for particle_system in self.particle_systems.values():
+            if particle_system.is_animating():
+                return True
+        for game_object in self.game_objects:
+            if game_object.is_active and (not game_object.is_awaiting_destruction) and game_object.is_animating():
+                return True
+        return False
+
+    def change_draw_order(self, game_object: GameObject, draw_order: int):
+        """
+        Changes the draw order of a game object, moving it to the correct layer of the frame buffer.
+        """
+        if self.frame_buffer and self.contains(game_object):
+            self.frame_buffer.remove_retained_drawable(game_object)
+            game_object.draw_order = draw_order
+            self.frame_buffer.add_retained_drawable(game_object)
+        else:
+            game_object.draw_order = draw_order
 
 
 class GameObject(Drawable):
     """
     A base class for all game objects. Game objects are objects that are updated and drawn every frame.
     """
+    __slots__ = ("game_object_collection", "animations", "is_awaiting_destruction", "is_active", "is_queued_for_update", "time_destroyed_at", "is_debugged", "name",
+                 "previous_position", "simulated_position", "pool", "handle")
 
     def __init__(self, game_object_collection: GameObjectCollection, drawn_surface: pygame.Surface, position, draw_order=LAYER_DEFAULT, name="unnamed game object"):
         super().__init__(drawn_surface, position, draw_order, None)
@@ -64,6 +279,7 @@ class GameObject(Drawable):
         Use queue_animation() to add an animation to the dict.
         The key is used to determine the order in which animations are updated.
         Higher priority animations override lower priority animations.
+        Only the highest priority animation is played by the tween scheduler, the others are paused until it's finished.
         """
         self.is_awaiting_destruction: bool = False
         """If True, the object will be destroyed either at the end of the frame, or the next frame."""
@@ -77,6 +293,31 @@ class GameObject(Drawable):
         """If this object is currently shown in the debug inspector."""
         self.name = name
         """The name of the object. Used for debugging."""
+        self.previous_position: tuple = self.rect.topleft
+        """The position before the last simulation step. The object is drawn between this and the simulated position."""
+        self.simulated_position: tuple = self.rect.topleft
+        """The position after the last simulation step."""
+        self.pool: Optional[ObjectPool] = None
+        """The pool the object is released to when destroyed, if it was created by a pooled factory."""
+        self.handle: Optional[GameObjectHandle] = None
+        """The handle of the object in its collection, or None if it's not in a collection."""
+
+    def reset(self, game_object_collection: GameObjectCollection, position):
+        """
+        Prepares a destroyed object for reuse by a pooled factory, as if it had just been created at the position.
+        Subclasses reset their own state first, and then call this.
+        """
+        self.game_object_collection = game_object_collection
+        self.rect.center = position
+        self.animations.clear()
+        self.is_awaiting_destruction = False
+        self.is_active = True
+        self.is_queued_for_update = False
+        self.time_destroyed_at = -1
+        self.is_debugged = False
+        self.previous_position = self.rect.topleft
+        self.simulated_position = self.rect.topleft
+        self.alpha = 255
 
     def on_initialized(self):
         """
@@ -90,6 +331,8 @@ class GameObject(Drawable):
         Cancels all animations.
         :return: None
         """
+        for animation in self.animations.values():
+            tween_scheduler.stop(animation)
         self.animations.clear()
 
     def queue_animation(self, animation: Animation, priority: int):
@@ -100,49 +343,59 @@ class GameObject(Drawable):
         Higher priority animations override lower priority animations.
         :return: None
         """
+        replaced_animation = self.animations.get(priority)
+        if (replaced_animation is not None) and (replaced_animation is not animation):
+            tween_scheduler.stop(replaced_animation)
         self.animations[priority] = animation
+        self.__play_highest_priority_animation()
+
+    def __play_highest_priority_animation(self):
+        if not self.animations:
+            return
+        highest_priority = max(self.animations)
+        for priority, animation in self.animations.items():
+            if (priority == highest_priority) and self.is_active:
+                tween_scheduler.play(animation)
+            else:
+                tween_scheduler.pause(animation)
+
+    def is_animating(self) -> bool:
+        """
+        If the object is changing over time by itself, and has to be updated and drawn at full frame rate.
+        Override this if the object animates without queued animations.
+        """
+        return len(self.animations) > 0
 
     def update(self, delta_time):
-        # Check destruction
-        if self.is_awaiting_destruction and self.time_destroyed_at > 0:
-            current_time = pygame.time.get_ticks()
-            seconds_waited_for_destruction = (current_time - self.time_destroyed_at) / 1000
-            if seconds_waited_for_destruction > 3:
-                log_warning(f"{self} has been waiting for destruction for {seconds_waited_for_destruction}s! This is a memory leak!")
-                return
         # Ensure that the object is queued for updates
         if not self.is_queued_for_update:
             raise Exception(f"GameObject {self.name} is not queued for updates. Did you forget to call GameObject.queue() after creating it, or did you not call super in your subclass?")
 
-        # Update the highest priority animation
+        # The highest priority animation is advanced by the tween scheduler. Once it's finished, the next one continues.
         if self.animations:
-            sorted_keys = sorted(self.animations.keys())
-            animation = self.animations[sorted_keys[-1]]
-            animation.update(delta_time)
+            highest_priority = max(self.animations)
+            animation = self.animations[highest_priority]
             if self.is_debugged:
-                log_info(f"{self.name} update anim {animation.name} (priority {sorted_keys[-1]})")
+                log_info(f"{self.name} update anim {animation.name} (priority {highest_priority})")
             if animation.is_finished:
-                del self.animations[sorted_keys[-1]]
+                del self.animations[highest_priority]
+                self.__play_highest_priority_animation()
 
-    def draw(self, screen: pygame.Surface):
-        if not self.is_active:
-            return
-
-        # Check destruction
-        if self.is_awaiting_destruction and self.time_destroyed_at > 0:
-            current_time = pygame.time.get_ticks()
-            seconds_waited_for_destruction = (current_time - self.time_destroyed_at) / 1000
-            if seconds_waited_for_destruction > 3:
-                log_warning(f"{self} has been waiting for destruction for {seconds_waited_for_destruction}s! This is a memory leak!")
-                return
+    def should_draw(self) -> bool:
+        return self.is_active and not self.is_awaiting_destruction
 
-        super().draw(screen)
+    def set_draw_order(self, draw_order: int):
+        if self.game_object_collection:
+            self.game_object_collection.change_draw_order(self, draw_order)
+        else:
+            self.draw_order = draw_order
 
     def set_tooltip_text(self, tooltip_text_lines: Optional[List[str]]):
-        self.tooltip = TextTooltip(tooltip_text_lines)
+        self.tooltip = get_text_tooltip(tooltip_text_lines)
 
     def set_active(self, should_be_active):
         self.is_active = should_be_active
+        self.__play_highest_priority_animation()
 
     def set_position(self, new_position):
         self.rect.topleft = new_position
@@ -151,32 +404,60 @@ class GameObject(Drawable):
         return self.rect.topleft
 
     def destroy(self):
-        # print(f"Destroying {self}")
+        """
+        Stops updating and drawing the object, and queues it for destruction at the end of the frame.
+        Destroying an object that is already awaiting destruction does nothing.
+        """
+        if self.is_awaiting_destruction:
+            return
         self.is_awaiting_destruction = True
         self.time_destroyed_at = pygame.time.get_ticks()
+        self.cancel_all_animations()
         if self.game_object_collection:
             self.game_object_collection.remove(self)
         else:
             raise Exception("GameObject was never queued. Did you forget to call GameObject.queue() after creating it, or did you not call super in your subclass?")
 
+    def on_destroyed(self):
+        """
+        Called at the end of the frame the object was destroyed in, after it has been removed from its collection.
+        Releases the animations and the tooltip, and the surface of objects that are not pooled. Subclasses release their own resources, and then call this.
+        """
+        self.cancel_all_animations()
+        self.animations.clear()
+        self.tooltip = None
+        if self.pool is None:
+            self.drawn_surface = None
+
 
 class GameObjectFactory:
     """
     A template for a game object.
     Call instantiate() to create an instance of the game object.
+    If the factory has a pool, destroyed instances are reset and reused instead of creating new ones.
     """
 
-    def __init__(self, game_object_collection: GameObjectCollection, game_object_create_func):
+    def __init__(self, game_object_collection: GameObjectCollection, game_object_create_func, pool: Optional[ObjectPool] = None, game_object_reset_func=None):
         self.game_object_collection = game_object_collection
         self.game_object_create_func = game_object_create_func
+        self.pool: Optional[ObjectPool] = pool
+        self.game_object_reset_func = game_object_reset_func
+        """Resets a pooled game object with the factory's current settings. Takes the game object and the position."""
 
     def instantiate(self, position):
         """
-        Instantiates a new game object.
+        Instantiates a new game object, or reuses a pooled one.
         :return: A reference to the game object.
         """
-        # Create a new game object
-        game_object = self.game_object_create_func(position)
+        game_object = None
+        if self.pool is not None:
+            game_object = self.pool.acquire()
+            if game_object is not None:
+                self.game_object_reset_func(game_object, position)
+        if game_object is None:
+            # Create a new game object
+            game_object = self.game_object_create_func(position)
+            game_object.pool = self.pool
 
         # Queue the game object with a strong reference
         if game_object.is_queued_for_update:
@@ -208,24 +489,26 @@ class EnemyCharacterFactory(GameObjectFactory):
 
 
 class EnemyCharacter(GameObject):
+    __slots__ = ("enemy_spawn_data", "image_library", "normal_image", "damaged_image", "damaged_image_alpha", "damage_animation", "max_health", "current_health", "current_block",
+                 "current_round_index", "turn_sprite", "turn_sprite_alpha", "turn_animation", "has_completed_turn", "health_font", "icon_subscript_font", "damage_effect_font", "text_color", "health_bar_background_rect",
+                 "dies_after_turns")
+
     def __init__(self, game_object_collection: GameObjectCollection, position, enemy_spawn_data: EnemySpawnData, image_library: ImageLibrary, health_font, icon_subscript_font,
                  damage_effect_font):
         self.enemy_spawn_data: EnemySpawnData = enemy_spawn_data
         self.image_library: ImageLibrary = image_library
-        loaded_image = load_image(self.enemy_spawn_data.sprite_path)
-        self.normal_image = pygame.transform.scale(loaded_image, (loaded_image.get_rect().width * ENEMY_SPRITE_SCALING_FACTOR, loaded_image.get_rect().height * ENEMY_SPRITE_SCALING_FACTOR))
-        # Insert "_damaged" before the file extension
-        damage_sprite_path = self.get_sprite_variant_path("_damaged")
-        loaded_image = load_image(damage_sprite_path)
-        self.damaged_image = pygame.transform.scale(loaded_image, (loaded_image.get_rect().width * ENEMY_SPRITE_SCALING_FACTOR, loaded_image.get_rect().height * ENEMY_SPRITE_SCALING_FACTOR))
+        self.normal_image = enemy_sprite_cache.get_sprite(self.enemy_spawn_data.sprite_path, ENEMY_SPRITE_SCALING_FACTOR)
+        self.damaged_image = enemy_sprite_cache.get_sprite(self.get_sprite_variant_path("_damaged"), ENEMY_SPRITE_SCALING_FACTOR)
         super().__init__(game_object_collection, self.normal_image, position, LAYER_ENEMY)
-        self.damaged_image.set_alpha(0)
+        self.damaged_image_alpha: float = 0
+        """The opacity the damaged sprite is drawn with on top of the normal sprite. The sprites are shared with other enemies, so they are faded when blitted."""
         self.damage_animation: Optional[Animation] = None
         self.max_health = random.randint(self.enemy_spawn_data.max_health_min, self.enemy_spawn_data.max_health_max)
         self.current_health = self.max_health
         self.current_block = 0
         self.current_round_index = -1
         self.turn_sprite: Optional[pygame.Surface] = None
+        self.turn_sprite_alpha: float = 255
         self.turn_animation: Optional[Animation] = None
         self.has_completed_turn = False
         self.health_font = health_font
@@ -234,8 +517,6 @@ class EnemyCharacter(GameObject):
         self.text_color = (255, 255, 255)
         health_bar_background_width = int(self.rect.width / 2)
         self.health_bar_background_rect = pygame.Rect(self.rect.left, self.rect.top - 10, health_bar_background_width, 5)
-        self.visual_effect_factory = RandomVisualEffectFactory(self.game_object_collection, self.image_library.slash_effects_list, 1000)
-        self.damage_number_visual_effect_factory = DamageNumberVisualEffectFactory(self.game_object_collection, self.damage_effect_font, "0", self.text_color, 3000)
         self.set_tooltip_text([enemy_spawn_data.name])
         self.dies_after_turns = 999
         if self.enemy_spawn_data.extras:
@@ -245,12 +526,11 @@ class EnemyCharacter(GameObject):
 
     def update(self, delta_time):
         super().update(delta_time)
+        # The damage and turn animations play alongside the queued animations, and are advanced by the tween scheduler
         if self.damage_animation:
-            self.damage_animation.update(delta_time)
             if self.damage_animation.is_finished:
                 self.damage_animation = None
         if self.turn_animation:
-            self.turn_animation.update(delta_time)
             if self.turn_animation.is_finished:
                 self.turn_animation = None
                 self.turn_sprite = None
@@ -258,13 +538,28 @@ class EnemyCharacter(GameObject):
     def draw(self, screen):
         super().draw(screen)
         if self.damage_animation:
-            screen.blit(self.damaged_image, self.rect)
+            screen.blit(self.damaged_image, self.rect, alpha=self.damaged_image_alpha)
         if self.turn_animation:
-            screen.blit(self.turn_sprite, self.rect)
+            screen.blit(self.turn_sprite, self.rect, alpha=self.turn_sprite_alpha)
         self.draw_health_bar(screen)
         if self.current_round_index >= 0:
             self.__draw_intentions(screen, self.current_round_index)
 
+    def is_animating(self) -> bool:
+        return super().is_animating() or (self.damage_animation is not None) or (self.turn_animation is not None)
+
+    def get_draw_bounds(self) -> pygame.Rect:
+        # The block icon is drawn to the left of the sprite, and the intentions and health text above it
+        block_icon_width = self.image_library.icon_intention_block.get_width()
+        header_height = self.rect.top - self.health_bar_background_rect.top + self.image_library.icon_intention_unknown.get_height()
+        return pygame.Rect(self.rect.left - block_icon_width, self.rect.top - header_height, self.rect.width + block_icon_width * 2, self.rect.height + header_height)
+
+    def get_draw_state(self) -> tuple:
+        turn_sprite_alpha = int(self.turn_sprite_alpha) if self.turn_sprite else None
+        damaged_image_alpha = int(self.damaged_image_alpha) if self.damage_animation else None
+        return (int(self.alpha), damaged_image_alpha, self.turn_sprite, turn_sprite_alpha, self.current_health, self.max_health, self.current_block,
+                self.current_round_index, self.dies_after_turns)
+
     def draw_health_bar(self, screen):
         has_block = self.current_block > 0
 
@@ -276,20 +571,20 @@ class EnemyCharacter(GameObject):
         health_bar_rect = pygame.Rect(self.rect.left, self.rect.top - 10, health_bar_width, 5)
 
         # Draw the actual health next to the health bar
-        health_text_surface = self.health_font.render(f"{self.current_health} / {self.max_health}", True, self.text_color)
+        health_text_surface = render_text(self.health_font, f"{self.current_health} / {self.max_health}", True, self.text_color)
         health_text_rect = health_text_surface.get_rect()
         health_text_rect.midleft = (self.health_bar_background_rect.right + 5, self.health_bar_background_rect.centery)
 
         # Draw the health bar with a green color if there is no shield, otherwise draw it with a blue color
-        pygame.draw.rect(screen, (255, 0, 0), self.health_bar_background_rect)
+        screen.draw_rect((255, 0, 0), self.health_bar_background_rect)
         if has_block:
-            pygame.draw.rect(screen, (0, 0, 255), health_bar_rect)
+            screen.draw_rect((0, 0, 255), health_bar_rect)
         else:
-            pygame.draw.rect(screen, (0, 200, 0), health_bar_rect)
+            screen.draw_rect((0, 200, 0), health_bar_rect)
         # Draw the outline of the health bar
-        pygame.draw.rect(screen, (255, 255, 255), health_bar_rect, 1)
+        screen.draw_rect((255, 255, 255), health_bar_rect, 1)
 
-        screen.blit(pygame.transform.scale(health_text_surface, (health_text_surface.get_width(), health_text_surface.get_height())), health_text_rect)
+        screen.blit(health_text_surface, health_text_rect)
 
         # Draw the current block
         if has_block:
@@ -298,7 +593,7 @@ class EnemyCharacter(GameObject):
             screen.blit(self.image_library.icon_intention_block, block_icon_rect)
 
             block_text_color = (0, 0, 0)
-            block_text_surface = self.icon_subscript_font.render(f"{self.current_block}", True, block_text_color)
+            block_text_surface = render_text(self.icon_subscript_font, f"{self.current_block}", True, block_text_color)
             block_text_rect = block_text_surface.get_rect()
             block_text_rect.center = block_icon_rect.center
             screen.blit(block_text_surface, block_text_rect)
@@ -319,26 +614,38 @@ class EnemyCharacter(GameObject):
             audio.play_one_shot_delayed(constants.damaged_sound, 0.1)
 
         # Play the damage animation
+        if self.damage_animation:
+            tween_scheduler.stop(self.damage_animation)
         self.damage_animation = Animation([
             Tween(0, 255, 0.5, self.__update_normal_sprite_alpha),
             Tween(255, 0, 0.5, self.__update_damage_sprite_alpha),
         ], name="Damage animation")
+        tween_scheduler.play(self.damage_animation)
 
         # Draw a damage effect
-        effect_pos = self.rect.center
-        self.visual_effect_factory.instantiate(effect_pos)
+        slash_effect = random.choice(self.image_library.slash_effects_list)
+        self.game_object_collection.get_particle_system(LAYER_EFFECTS).emit(slash_effect, self.rect.center, constants.SLASH_EFFECT_LIFETIME)
 
         if self.current_health <= 0:
             self.destroy()
             audio.play_one_shot_delayed(constants.killed_sound, 0.15)
 
+    def on_destroyed(self):
+        for animation in (self.damage_animation, self.turn_animation):
+            if animation:
+                tween_scheduler.stop(animation)
+        self.damage_animation = None
+        self.turn_animation = None
+        self.normal_image = None
+        self.damaged_image = None
+        self.turn_sprite = None
+        super().on_destroyed()
+
     def __instantiate_damage_number_effect(self, position, damage_amount, color):
-        self.damage_number_visual_effect_factory.set_target_text(f"-{damage_amount}")
-        self.damage_number_visual_effect_factory.set_target_color(color)
-        self.damage_number_visual_effect_factory.instantiate(position)
+        emit_damage_number(self.game_object_collection, self.damage_effect_font, f"-{damage_amount}", color, position)
 
     def get_sprite_variant_path(self, variant_name):
-        return self.enemy_spawn_data.sprite_path[:-4] + variant_name + self.enemy_spawn_data.sprite_path[-4:]
+        return self.enemy_spawn_data.get_sprite_variant_path(variant_name)
 
     def gain_health(self, amount):
         self.current_health = min(self.current_health + amount, self.max_health)
@@ -368,21 +675,23 @@ class EnemyCharacter(GameObject):
 
     def play_turn_animation(self, intention: EnemyIntentionData):
         sprite_path = self.get_sprite_variant_path(intention.get_turn_sprite_path_prefix())
-        loaded_image = load_image(sprite_path)
-        self.turn_sprite = pygame.transform.scale(loaded_image, (loaded_image.get_rect().width * ENEMY_SPRITE_SCALING_FACTOR, loaded_image.get_rect().height * ENEMY_SPRITE_SCALING_FACTOR))
+        self.turn_sprite = enemy_sprite_cache.get_sprite(sprite_path, ENEMY_SPRITE_SCALING_FACTOR)
+        if self.turn_animation:
+            tween_scheduler.stop(self.turn_animation)
         self.turn_animation = Animation([
             Tween(255, 0, 1, self.__update_turn_sprite_alpha),
             Tween(0, 255, 1.5, self.__update_normal_sprite_alpha, self.__hide_intentions)
         ], name="Turn animation")
+        tween_scheduler.play(self.turn_animation)
 
     def __update_turn_sprite_alpha(self, new_alpha):
-        self.turn_sprite.set_alpha(new_alpha)
+        self.turn_sprite_alpha = new_alpha
 
     def __update_normal_sprite_alpha(self, new_alpha):
-        self.normal_image.set_alpha(new_alpha)
+        self.alpha = new_alpha
 
     def __update_damage_sprite_alpha(self, new_alpha):
-        self.damaged_image.set_alpha(new_alpha)
+        self.damaged_image_alpha = new_alpha
 
     def __hide_intentions(self):
         self.current_round_index = -1
@@ -412,7 +721,7 @@ class EnemyCharacter(GameObject):
             next_rect_pos = icon_rect.bottomright
 
             text_color = (255, 255, 255)
-            text_surface = self.icon_subscript_font.render(f"{next_intention.deal_damage_amount}", True, text_color)
+            text_surface = render_text(self.icon_subscript_font, f"{next_intention.deal_damage_amount}", True, text_color)
             text_rect = text_surface.get_rect()
             text_rect.center = (icon_rect.left + 20, icon_rect.bottom - 20)
             screen.blit(text_surface, text_rect)
@@ -448,6 +757,138 @@ class EnemyCharacter(GameObject):
         return icon_rect
 
 
+class CardFaceCache:
+    """
+    Composites the face of a card (the card image with the name, rarity, description and mana cost drawn on top) into a single surface.
+    The faces are baked once per card data and text colors, and shared between all cards using them, so they must not be modified.
+    """
+
+    def __init__(self):
+        self.faces: Dict[tuple, tuple] = {}
+        """The baked card faces and their card image positions, keyed by the card data and text colors used to bake them."""
+        self.card_images: Dict[str, pygame.Surface] = {}
+        """The loaded card images, keyed by sprite path."""
+
+    def get_face(self, card_data: CardData, name_font: pygame.font.Font, description_font: pygame.font.Font, mana_cost_font: pygame.font.Font,
+                 info_text_color: tuple, description_text_color: tuple, mana_text_color: tuple) -> tuple:
+        """
+        :return: The baked face, and the position of the card image on the face. The texts may overhang the card image.
+        """
+        key = (card_data.sprite_path, card_data.card_info_name, card_data.card_info_description, card_data.card_rarity, card_data.card_cost,
+               name_font, description_font, mana_cost_font, info_text_color, description_text_color, mana_text_color)
+        baked_face = self.faces.get(key)
+        if baked_face is None:
+            baked_face = self.__compose_face(card_data, name_font, description_font, mana_cost_font, info_text_color, description_text_color, mana_text_color)
+            self.faces[key] = baked_face
+        return baked_face
+
+    def get_card_image(self, sprite_path: str) -> pygame.Surface:
+        card_image = self.card_images.get(sprite_path)
+        if card_image is None:
+            card_image = load_sprite(sprite_path)
+            self.card_images[sprite_path] = card_image
+        return card_image
+
+    def clear(self):
+        self.faces.clear()
+        self.card_images.clear()
+
+    def __compose_face(self, card_data: CardData, name_font: pygame.font.Font, description_font: pygame.font.Font, mana_cost_font: pygame.font.Font,
+                       info_text_color: tuple, description_text_color: tuple, mana_text_color: tuple) -> tuple:
+        card_image = self.get_card_image(card_data.sprite_path)
+        image_rect = card_image.get_rect()
+        face_blits = [(card_image, image_rect)]
+
+        # Card name
+        name_surface = render_text(name_font, card_data.card_info_name, True, info_text_color)
+        name_rect = name_surface.get_rect()
+        name_rect.midtop = (image_rect.centerx + 20, image_rect.top + 30)
+        face_blits.append((name_surface, name_rect))
+
+        # Rarity
+        rarity_stars, color = get_card_rarity_stars(card_data)
+        previous_x = image_rect.centerx - 110
+        for i in range(rarity_stars):
+            rarity_bg_surface = render_text(SYMBOLS_FONT_BG, "I", True, (0, 0, 0))
+            rarity_bg_rect = rarity_bg_surface.get_rect()
+            rarity_bg_rect.topleft = (previous_x, image_rect.bottom - 55)
+            previous_x = rarity_bg_rect.right + 5
+            face_blits.append((rarity_bg_surface, rarity_bg_rect))
+            rarity_surface = render_text(SYMBOLS_FONT, "I", True, color)
+            rarity_rect = rarity_surface.get_rect()
+            rarity_rect.center = rarity_bg_rect.center
+            face_blits.append((rarity_surface, rarity_rect))
+
+        # Card description
+        previous_description_midbottom = (image_rect.centerx + 5, image_rect.bottom - 150)
+        for description in card_data.card_info_description.split("\n"):
+            description_surface = render_text(description_font, description, True, description_text_color)
+            description_rect = description_surface.get_rect()
+            description_rect.midtop = previous_description_midbottom
+            previous_description_midbottom = (description_rect.midbottom[0], description_rect.midbottom[1] - 10)
+            face_blits.append((description_surface, description_rect))
+
+        # Card cost
+        cost_surface = render_text(mana_cost_font, f"{card_data.card_cost}", True, mana_text_color)
+        cost_rect = cost_surface.get_rect()
+        cost_rect.center = (image_rect.left + 50, image_rect.top + 44)
+        face_blits.append((cost_surface, cost_rect))
+
+        # Long texts may overhang the card image, so the face is grown to fit them
+        face, face_rect = composite_blits(face_blits)
+        return face, (image_rect.x - face_rect.x, image_rect.y - face_rect.y)
+
+
+card_face_cache = CardFaceCache()
+
+
+class EnemySpriteCache:
+    """
+    Loads and scales enemy sprites once, and shares them between all enemies using them.
+    Preload the sprites of a room's enemies before the room starts, so enemy turns don't have to load sprites from disk.
+    """
+
+    def __init__(self):
+        self.sprites: Dict[tuple[str, int], pygame.Surface] = {}
+        """The scaled sprites, keyed by sprite path and scaling factor."""
+
+    def get_sprite(self, sprite_path: str, scaling_factor: int) -> pygame.Surface:
+        """
+        :return: The shared scaled sprite. Must not be changed, fade it with the alpha of the blit instead.
+        """
+        key = (sprite_path, scaling_factor)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            loaded_image = load_sprite(sprite_path)
+            sprite = pygame.transform.scale(loaded_image, (loaded_image.get_width() * scaling_factor, loaded_image.get_height() * scaling_factor))
+            self.sprites[key] = sprite
+        return sprite
+
+    def preload(self, enemy_spawn_data: EnemySpawnData, scaling_factor: int):
+        """
+        Loads every sprite variant the enemy can show.
+        """
+        for sprite_path in enemy_spawn_data.get_sprite_variant_paths():
+            self.get_sprite(sprite_path, scaling_factor)
+
+    def clear(self):
+        self.sprites.clear()
+
+
+enemy_sprite_cache = EnemySpriteCache()
+
+
+def get_card_rarity_stars(card_data: CardData) -> tuple:
+    """
+    :return: The number of rarity stars shown on the card, and their color.
+    """
+    if card_data.card_rarity == "uncommon":
+        return 2, (0, 255, 0)
+    if card_data.card_rarity == "rare":
+        return 3, (255, 0, 255)
+    return 1, (255, 255, 255)
+
+
 class GameCardFactory(GameObjectFactory):
     def __init__(self, game_object_collection: GameObjectCollection, draw_pile_position: tuple, discard_pile_position: tuple, card_data: CardData):
         self.card_data: CardData = card_data
@@ -456,19 +897,56 @@ class GameCardFactory(GameObjectFactory):
         self.card_name_font = FONT_CARD_NAME
         self.card_description_font = FONT_CARD_DESCRIPTION
         self.card_mana_cost_font = FONT_CARD_MANA_COST
-        super().__init__(game_object_collection, self.create)
+        super().__init__(game_object_collection, self.create, game_card_pool, self.reset)
 
     def create(self, position) -> GameCard:
         return GameCard(self.game_object_collection, self.draw_pile_position, self.discard_pile_position, position, self.card_data,
                         self.card_name_font, self.card_description_font, self.card_mana_cost_font)
 
+    def reset(self, game_card: GameCard, position):
+        game_card.reset_card(self.game_object_collection, self.draw_pile_position, self.discard_pile_position, position, self.card_data,
+                             self.card_name_font, self.card_description_font, self.card_mana_cost_font)
+
     def set_target_card_data(self, card_data: CardData):
         self.card_data = card_data
 
 
 class GameCard(GameObject):
+    __slots__ = ("card_face", "card_face_offset", "card_data", "draw_pile_position", "discard_pile_position", "home_position", "card_name_font", "card_description_font",
+                 "card_mana_cost_font", "card_info_text_color", "card_info_mana_text_color", "card_description_text_color", "current_scale_factor", "can_be_clicked",
+                 "has_been_played", "is_self_hovered", "is_other_card_hovered")
+
     def __init__(self, game_object_collection: GameObjectCollection, draw_pile_position: tuple, discard_pile_position: tuple, card_position: tuple, card_data: CardData,
                  card_name_font, card_description_font, card_mana_cost_font):
+        self.card_face: pygame.Surface
+        """The pre-composited face of the card. Shared with other cards, so only its scaled copies are drawn."""
+        self.card_face_offset: tuple
+        """The position of the card image on the card face."""
+        self.__set_card_state(draw_pile_position, discard_pile_position, card_position, card_data, card_name_font, card_description_font, card_mana_cost_font)
+
+        super().__init__(game_object_collection, get_scaled_surface(self.card_face, self.current_scale_factor), card_position, LAYER_PLAYER_HAND, name=f"Card {self.card_data.card_info_name}")
+        # The rect only covers the card image, and not the texts overhanging it
+        self.rect = pygame.Rect((0, 0), card_face_cache.get_card_image(self.card_data.sprite_path).get_size())
+        self.rect.center = card_position
+        self.blocks_tooltips = True
+        self.__update_tooltip()
+
+    def reset_card(self, game_object_collection: GameObjectCollection, draw_pile_position: tuple, discard_pile_position: tuple, card_position: tuple, card_data: CardData,
+                   card_name_font, card_description_font, card_mana_cost_font):
+        """
+        Turns a destroyed, pooled card into a new card. Takes the same arguments as the constructor.
+        """
+        self.__set_card_state(draw_pile_position, discard_pile_position, card_position, card_data, card_name_font, card_description_font, card_mana_cost_font)
+        self.drawn_surface = get_scaled_surface(self.card_face, self.current_scale_factor)
+        self.rect.size = card_face_cache.get_card_image(self.card_data.sprite_path).get_size()
+        self.draw_order = LAYER_PLAYER_HAND
+        self.name = f"Card {self.card_data.card_info_name}"
+        self.tooltip = None
+        self.__update_tooltip()
+        self.reset(game_object_collection, card_position)
+
+    def __set_card_state(self, draw_pile_position: tuple, discard_pile_position: tuple, card_position: tuple, card_data: CardData,
+                         card_name_font, card_description_font, card_mana_cost_font):
         self.card_data: CardData = card_data
         self.current_scale_factor = 1
         self.draw_pile_position = draw_pile_position
@@ -480,20 +958,13 @@ class GameCard(GameObject):
         self.can_be_clicked = False     # NOTE: This may cause unexpected behaviour.
         self.alpha = 255
 
-        self.original_card_image = load_image(self.card_data.sprite_path)
-        self.original_scale = (int(self.original_card_image.get_width()), int(self.original_card_image.get_height()))
-        image_copy = self.original_card_image.copy()
-
         self.card_name_font = card_name_font
         self.card_description_font = card_description_font
         self.card_mana_cost_font = card_mana_cost_font
         self.card_info_text_color = (0, 0, 0)
         self.card_description_text_color = (255, 255, 255)
         self.card_info_mana_text_color = (0, 0, 0)
-
-        super().__init__(game_object_collection, image_copy, card_position, LAYER_PLAYER_HAND, name=f"Card {self.card_data.card_info_name}")
-        self.blocks_tooltips = True
-        self.__update_tooltip()
+        self.card_face, self.card_face_offset = self.__get_card_face()
 
     def __update_tooltip(self):
         generated_tooltip_lines = self.__generate_tooltip_lines()
@@ -525,10 +996,24 @@ class GameCard(GameObject):
         self.alpha = new_alpha
 
     def __update_scale(self, new_scale):
-        image_copy = self.original_card_image.copy()
-        self.drawn_surface = pygame.transform.scale(image_copy, (int(self.original_scale[0] * new_scale), int(self.original_scale[1] * new_scale)))
+        # The scaled faces are shared and never drawn onto, so their cached masks stay valid and are shared too
+        self.drawn_surface = get_scaled_surface(self.card_face, new_scale)
         self.current_scale_factor = new_scale
 
+    def __get_card_face(self) -> tuple:
+        return card_face_cache.get_face(self.card_data, self.card_name_font, self.card_description_font, self.card_mana_cost_font,
+                                        self.card_info_text_color, self.card_description_text_color, self.card_info_mana_text_color)
+
+    def set_mana_text_color(self, color: tuple):
+        """
+        Changes the color of the mana cost text, switching to the card face baked with that color.
+        """
+        if color == self.card_info_mana_text_color:
+            return
+        self.card_info_mana_text_color = color
+        self.card_face, self.card_face_offset = self.__get_card_face()
+        self.__update_scale(self.current_scale_factor)
+
     def play_draw_animation(self, target_position):
         self.home_position = target_position
         self.can_be_clicked = False
@@ -588,158 +1073,38 @@ class GameCard(GameObject):
     def __get_scale_factor(self):
         return self.current_scale_factor
 
-    def draw(self, screen):
-        self.drawn_surface.set_alpha(self.alpha)
-        super().draw(screen)
-
-        # Draw card name
-        name_surface = self.card_name_font.render(self.card_data.card_info_name, True, self.card_info_text_color)
-        name_rect = name_surface.get_rect()
-        name_rect.midtop = (self.rect.centerx + 20, self.rect.top + 30)
-        size = (name_surface.get_width() * self.current_scale_factor, name_surface.get_height() * self.current_scale_factor)
-        name_surface.set_alpha(self.alpha)
-        screen.blit(pygame.transform.scale(name_surface, size), name_rect)
-
-        # Draw rarity
-        rarity_stars = 1
-        previous_x = self.rect.centerx - 110
-        color = (255, 255, 255)
-        if self.card_data.card_rarity == "uncommon":
-            rarity_stars = 2
-            color = (0, 255, 0)
-        elif self.card_data.card_rarity == "rare":
-            rarity_stars = 3
-            color = (255, 0, 255)
-        last_rarity_rect = None
-        for i in range(rarity_stars):
-            rarity_bg_surface = SYMBOLS_FONT_BG.render("I", True, (0, 0, 0))
-            rarity_bg_rect = rarity_bg_surface.get_rect()
-            rarity_bg_rect.topleft = (previous_x, self.rect.bottom - 55)
-            previous_x = rarity_bg_rect.right + 5
-            size = (rarity_bg_surface.get_width() * self.current_scale_factor, rarity_bg_surface.get_height() * self.current_scale_factor)
-            rarity_bg_surface.set_alpha(self.alpha)
-            last_rarity_rect = rarity_bg_rect
-            screen.blit(pygame.transform.scale(rarity_bg_surface, size), rarity_bg_rect)
-            rarity_surface = SYMBOLS_FONT.render("I", True, color)
-            rarity_rect = rarity_surface.get_rect()
-            rarity_rect.center = rarity_bg_rect.center
-            size = (rarity_surface.get_width() * self.current_scale_factor, rarity_surface.get_height() * self.current_scale_factor)
-            rarity_surface.set_alpha(self.alpha)
-            screen.blit(pygame.transform.scale(rarity_surface, size), rarity_rect)
-        if last_rarity_rect:
-            rarity_tooltip_rect = pygame.Rect(self.rect.centerx - 115, self.rect.bottom - 60, (last_rarity_rect.width + 5) * rarity_stars, last_rarity_rect.height + 5)
-            if rarity_tooltip_rect.collidepoint(Inputs.get_mouse_position()):
-                self.set_tooltip_text(["Rarity:", self.card_data.card_rarity.capitalize()])
-            elif self.tooltip and (self.tooltip.text_lines == ["Rarity:", self.card_data.card_rarity.capitalize()]):
-                self.__update_tooltip()
-
-        # Draw card description
-        previous_description_midbottom = (self.rect.centerx + 5, self.rect.bottom - 150)
-        for description in self.card_data.card_info_description.split("\n"):
-            description_surface = self.card_description_font.render(description, True, self.card_description_text_color)
-            description_rect = description_surface.get_rect()
-            description_rect.midtop = previous_description_midbottom
-            size = (description_surface.get_width() * self.current_scale_factor, description_surface.get_height() * self.current_scale_factor)
-            description_surface.set_alpha(self.alpha)
-            previous_description_midbottom = (description_rect.midbottom[0], description_rect.midbottom[1] - 10)
-            screen.blit(pygame.transform.scale(description_surface, size), description_rect)
-
-        # Draw card cost
-        cost_surface = self.card_mana_cost_font.render(f"{self.card_data.card_cost}", True, self.card_info_mana_text_color)
-        cost_rect = cost_surface.get_rect()
-        cost_rect.center = (self.rect.topleft[0] + 50, self.rect.topleft[1] + 44)
-        size = (cost_surface.get_width() * self.current_scale_factor, cost_surface.get_height() * self.current_scale_factor)
-        cost_surface.set_alpha(self.alpha)
-        screen.blit(pygame.transform.scale(cost_surface, size), cost_rect)
-
-
-class VisualEffectFactory(GameObjectFactory):
-    def __init__(self, game_object_collection: GameObjectCollection, effect_surface: pygame.Surface, lifetime: int):
-        self.effect_surface = effect_surface
-        self.lifetime = lifetime
-        super().__init__(game_object_collection, self.create)
-
-    def create(self, position) -> VisualEffect:
-        return VisualEffect(self.game_object_collection, self.effect_surface, position, self.lifetime)
-
-
-class RandomVisualEffectFactory(GameObjectFactory):
-    def __init__(self, game_object_collection: GameObjectCollection, effect_surfaces: List[pygame.Surface], lifetime: int):
-        self.effect_surfaces = effect_surfaces
-        self.lifetime = lifetime
-        super().__init__(game_object_collection, self.create)
-
-    def create(self, position) -> VisualEffect:
-        random_effect = random.choice(self.effect_surfaces)
-        return VisualEffect(self.game_object_collection, random_effect, position, self.lifetime)
-
-
-class VisualEffect(GameObject):
-    """
-    A visual effect that is drawn on the screen for a certain amount of time.
-    Fades out over time.
-    Destroyed when the lifetime is over.
-    """
-
-    def __init__(self, game_object_collection: GameObjectCollection, drawn_surface: pygame.Surface, position: tuple[int, int], lifetime, layer=None):
-        self.lifetime = lifetime
-        self.start_time = pygame.time.get_ticks()
-        self.alpha = 255
-        if layer is None:
-            layer = LAYER_EFFECTS
-        super().__init__(game_object_collection, drawn_surface, position, layer)
+    def get_surface_position(self) -> tuple:
+        return (self.rect.x - int(self.card_face_offset[0] * self.current_scale_factor),
+                self.rect.y - int(self.card_face_offset[1] * self.current_scale_factor))
 
-    def update(self, delta_time):
-        super().update(delta_time)
-        elapsed_time = pygame.time.get_ticks() - self.start_time
-        if elapsed_time >= self.lifetime:
-            self.destroy()
-        else:
-            # Calculate alpha value based on elapsed time and lifetime
-            progress_factor = elapsed_time / self.lifetime
-            self.alpha = 255 - int(progress_factor * 255)
-            self.drawn_surface.set_alpha(self.alpha)
-
-
-class DamageNumberVisualEffectFactory(GameObjectFactory):
-    def __init__(self, game_object_collection: GameObjectCollection, font, text, color, lifetime: int):
-        self.font = font
-        self.text = text
-        self.color = color
-        self.lifetime = lifetime
-        self.layer = None
-        super().__init__(game_object_collection, self.create)
-
-    def create(self, position) -> DamageNumberVisualEffect:
-        return DamageNumberVisualEffect(self.game_object_collection, self.font, self.text, self.color, position, self.lifetime, self.layer)
+    def get_draw_bounds(self) -> pygame.Rect:
+        return self.drawn_surface.get_rect(topleft=self.get_surface_position()).union(self.rect)
 
-    def set_target_text(self, text):
-        self.text = text
+    def get_draw_state(self) -> tuple:
+        return self.drawn_surface, int(self.alpha)
 
-    def set_target_color(self, color):
-        self.color = color
+    def should_show_tooltip(self, mouse_pos):
+        # The tooltip is picked here instead of when drawing, as a card that isn't moving may not be redrawn
+        self.__update_rarity_tooltip(mouse_pos)
+        return super().should_show_tooltip(mouse_pos)
 
-    def set_layer(self, layer):
-        self.layer = layer
+    def __update_rarity_tooltip(self, mouse_pos):
+        rarity_stars, _ = get_card_rarity_stars(self.card_data)
+        rarity_width, rarity_height = SYMBOLS_FONT_BG.size("I")
+        rarity_tooltip_rect = pygame.Rect(self.rect.centerx - 115, self.rect.bottom - 60, (rarity_width + 5) * rarity_stars, rarity_height + 5)
+        if rarity_tooltip_rect.collidepoint(mouse_pos):
+            self.set_tooltip_text(["Rarity:", self.card_data.card_rarity.capitalize()])
+        elif self.tooltip and (self.tooltip.text_lines == ["Rarity:", self.card_data.card_rarity.capitalize()]):
+            self.__update_tooltip()
 
 
-class DamageNumberVisualEffect(VisualEffect):
+def emit_damage_number(game_object_collection: GameObjectCollection, font, text: str, color, position, layer=None):
     """
-    A visual effect that is drawn on the screen for a certain amount of time.
-    Moves up and fades out over time.
+    Shows a number that floats up, sways sideways and fades out.
     """
+    text_surface = render_text(font, text, True, color)
+    particle_system = game_object_collection.get_particle_system(LAYER_EFFECTS if layer is None else layer)
+    particle_system.emit(text_surface, position, constants.DAMAGE_NUMBER_LIFETIME, constants.DAMAGE_NUMBER_RISE, constants.DAMAGE_NUMBER_SWAY)
 
-    def __init__(self, game_object_collection: GameObjectCollection, font, text, color, position: tuple[int, int], lifetime, layer=None):
-        text_surface = font.render(f"{text}", True, color)
-        self.start_x = position[0]
-        tween_start_y = position[1]
-        tween_end_y = tween_start_y - 200
-        self.tween = Tween(tween_start_y, tween_end_y, lifetime / 1000)
-        super().__init__(game_object_collection, text_surface, position, lifetime, layer)
 
-    def update(self, delta_time):
-        new_y = self.tween.update(delta_time)
-        # Get sine value in range 0 to 1
-        new_x = self.start_x + (np.sin(new_y / 20) * 20)
-        self.rect.center = (new_x, new_y)
-        super().update(delta_time)
+game_card_pool = create_object_pool("Card", constants.GAME_OBJECT_POOL_MAX_SIZE)
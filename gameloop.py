@@ -2,13 +2,13 @@ import pygame
 
 from data.rooms import SpecialRoomAction
 from utils import audio, constants
-from utils.constants import LAYER_TARGETED_ENEMY_ICON, LAYER_CARD_CHOOSE_TITLE, LAYER_PLAYER_UI_BACKGROUND, LAYER_PLAYER_UI_TEXT, LAYER_OVERRIDE_BG, LAYER_OVERRIDE_FG, LAYER_UI_EFFECTS, \
-    FONT_CARD_CHOOSE, FONT_DUNGEON_LEVEL, FONT_DUNGEON_LEVEL_HINT, FONT_CARD_PILE_COUNT, FONT_PLAYER_MANA, FONT_PLAYER_HEALTH, FONT_PLAYER_BLOCK, \
-    FONT_SPECIAL_ROOM_TITLE, FONT_SPECIAL_ROOM_DESCRIPTION, FONT_HELP
+from utils.constants import LAYER_TARGETED_ENEMY_ICON, LAYER_CARD_CHOOSE_TITLE, LAYER_PLAYER_UI_TEXT, LAYER_OVERRIDE_BG, LAYER_OVERRIDE_FG, LAYER_UI_EFFECTS, \
+    FONT_CARD_CHOOSE, FONT_DUNGEON_LEVEL, FONT_SPECIAL_ROOM_TITLE, FONT_SPECIAL_ROOM_DESCRIPTION, FONT_HELP
 from game_objects import GameCard
 from state_management import GameState
-from utils.drawing import DrawCall, draw_button, is_rect_clicked
+from utils.drawing import DrawCall, draw_button, is_rect_clicked, get_button_surface, composite_blits, static_screen_cache
 from utils.input import Inputs
+from utils.text import render_text
 
 
 def update(screen: pygame.Surface, game_state: GameState):
@@ -20,10 +20,10 @@ def update(screen: pygame.Surface, game_state: GameState):
         draw_win_screen(screen, game_state)
         return
 
-    game_state.update_game_objects()
+    game_state.simulate()
 
     if game_state.card_grid_layout:
-        game_state.card_grid_layout.update(game_state.delta_time)
+        game_state.card_grid_layout.handle_scroll_input()
 
     draw_damage_overlay(game_state)
     clean_up_finished_animations(game_state)
@@ -63,7 +63,6 @@ def update(screen: pygame.Surface, game_state: GameState):
         finish_room(game_state, True)
 
     if game_state.gameplay_pause_timer > 0:
-        game_state.gameplay_pause_timer -= game_state.delta_time
         return  # Don't update the game if it's paused. TODO: Move this further up, so that we can have more "transitions".
 
     update_characters_turns(screen, game_state)
@@ -78,9 +77,9 @@ def update_characters_turns(screen: pygame.Surface, game_state: GameState):
         # Color cards' mana cost red if the player can't afford them
         for hand_card in game_state.current_hand:
             if can_play_card(game_state, hand_card):
-                hand_card.card_info_mana_text_color = (50, 50, 100)
+                hand_card.set_mana_text_color((50, 50, 100))
             else:
-                hand_card.card_info_mana_text_color = (255, 0, 0)
+                hand_card.set_mana_text_color((255, 0, 0))
 
         hovered_card_vertical_offset = -200
         non_hovered_card_vertical_offset = 150
@@ -239,45 +238,44 @@ def has_player_won(game_state):
 
 
 def draw_game_over_screen(screen, game_state):
-    # Draw a game-over text
-    text_surface = FONT_DUNGEON_LEVEL.render("Game over!", True, (255, 0, 0))
-    text_rect = text_surface.get_rect()
-    text_rect.center = screen.get_rect().center
-    screen.blit(text_surface, text_rect)
+    draw_end_screen(screen, game_state, "Game over!", (255, 0, 0))
 
-    # Draw a button to return to the main menu
-    button_rect = pygame.Rect(0, 0, 300, 50)
-    button_rect.midtop = (screen.get_rect().centerx, text_rect.bottom + 20)
-    draw_button(game_state.frame_buffer, "Return to main menu", button_rect, (100, 100, 100), (255, 255, 255))
+
+def draw_win_screen(screen, game_state):
+    draw_end_screen(screen, game_state, "You won!", (0, 255, 0))
+
+
+def draw_end_screen(screen, game_state, text: str, text_color: tuple):
+    # Draw the text, with a button to return to the main menu
+    end_screen_surface, end_screen_rect, button_rect = static_screen_cache.get("end", (screen.get_size(), text, text_color),
+                                                                               lambda: build_end_screen(screen, text, text_color))
+    DrawCall(end_screen_surface, end_screen_rect, LAYER_OVERRIDE_BG).queue(game_state.frame_buffer)
     if is_rect_clicked(button_rect):
         # Delete the save game
         game_state.delete_current_save()
 
 
-def draw_win_screen(screen, game_state):
-    # Draw a win text
-    text_surface = FONT_DUNGEON_LEVEL.render("You won!", True, (0, 255, 0))
+def build_end_screen(screen, text: str, text_color: tuple) -> tuple:
+    text_surface = render_text(FONT_DUNGEON_LEVEL, text, True, text_color)
     text_rect = text_surface.get_rect()
     text_rect.center = screen.get_rect().center
-    screen.blit(text_surface, text_rect)
 
-    # Draw a button to return to the main menu
     button_rect = pygame.Rect(0, 0, 300, 50)
     button_rect.midtop = (screen.get_rect().centerx, text_rect.bottom + 20)
-    draw_button(game_state.frame_buffer, "Return to main menu", button_rect, (100, 100, 100), (255, 255, 255))
-    if is_rect_clicked(button_rect):
-        # Delete the save game
-        game_state.delete_current_save()
+    button_surface, button_offset = get_button_surface(button_rect.size, "Return to main menu", (100, 100, 100), (255, 255, 255))
+    button_surface_rect = button_surface.get_rect(topleft=(button_rect.x + button_offset[0], button_rect.y + button_offset[1]))
+
+    end_screen_surface, end_screen_rect = composite_blits([(text_surface, text_rect), (button_surface, button_surface_rect)])
+    return end_screen_surface, end_screen_rect, button_rect
 
 
 def draw_damage_overlay(game_state: GameState):
     if game_state.player_damaged_animation:
-        game_state.player_damaged_animation.update(game_state.delta_time)
         if game_state.player_damaged_animation.is_finished:
             game_state.player_damaged_animation = None
     if game_state.player_damaged_animation:
         screen_center = game_state.screen.get_rect().center
-        DrawCall(game_state.player_damaged_overlay, screen_center, LAYER_OVERRIDE_BG).queue(game_state.frame_buffer)
+        DrawCall(game_state.player_damaged_overlay, screen_center, LAYER_OVERRIDE_BG, alpha=game_state.player_damaged_overlay_alpha).queue(game_state.frame_buffer)
 
 
 def check_assigned_target(game_state: GameState):
@@ -285,12 +283,12 @@ def check_assigned_target(game_state: GameState):
     if not game_state.current_targeted_enemy_character:
         if len(game_state.current_alive_enemy_characters) > 0:
             game_state.current_targeted_enemy_character = game_state.current_alive_enemy_characters[0]
-    else:
-        for enemy in game_state.current_alive_enemy_characters:
-            # If the player clicks the enemy, select it as the current target
-            if Inputs.is_mouse_button_up(1) and (enemy != game_state.current_targeted_enemy_character):
-                if enemy.rect.collidepoint(Inputs.get_mouse_position()):
-                    game_state.current_targeted_enemy_character = enemy
+    elif Inputs.is_mouse_button_up(1):
+        # If the player clicks an enemy, select it as the current target
+        for drawable in game_state.frame_buffer.hover_index.get_hovered_drawables(Inputs.get_mouse_position()):
+            if (drawable in game_state.current_alive_enemy_characters) and (drawable != game_state.current_targeted_enemy_character):
+                game_state.current_targeted_enemy_character = drawable
+                break
 
 
 def animate_target_icon(game_state: GameState):
@@ -304,9 +302,8 @@ def animate_target_icon(game_state: GameState):
     if game_state.current_targeted_enemy_character:
         target_x = game_state.current_targeted_enemy_character.rect.centerx
         target_y = game_state.current_targeted_enemy_character.rect.top - 100
-        game_state.game_data.image_library.icon_target.set_alpha(game_state.target_icon_alpha)
         DrawCall(game_state.game_data.image_library.icon_target, (target_x, target_y), LAYER_TARGETED_ENEMY_ICON,
-                 ["Currently targeted enemy.", "Click an enemy to set it as target."], False).queue(game_state.frame_buffer)
+                 ["Currently targeted enemy.", "Click an enemy to set it as target."], False, alpha=game_state.target_icon_alpha).queue(game_state.frame_buffer)
 
 
 def can_play_card(game_state: GameState, card: GameCard):
@@ -351,9 +348,11 @@ def play_card(game_state: GameState, card: GameCard):
                 if len(game_state.current_alive_enemy_characters) > 0:
                     game_state.current_targeted_enemy_character = game_state.current_alive_enemy_characters[0]
     if card.card_data.card_target_damage > 0:
-        game_state.current_targeted_enemy_character.take_damage(card.card_data.card_target_damage)
-        if game_state.current_targeted_enemy_character.current_health <= 0:
-            game_state.current_alive_enemy_characters.remove(game_state.current_targeted_enemy_character)
+        # The target is gone from the game state as soon as it's killed
+        target_enemy_character = game_state.current_targeted_enemy_character
+        target_enemy_character.take_damage(card.card_data.card_target_damage)
+        if target_enemy_character.current_health <= 0:
+            game_state.current_alive_enemy_characters.remove(target_enemy_character)
             if len(game_state.current_alive_enemy_characters) > 0:
                 game_state.current_targeted_enemy_character = game_state.current_alive_enemy_characters[0]
     game_state.current_hand.remove(card)
@@ -380,7 +379,7 @@ def draw_player_reward_cards(screen: pygame.Surface, game_state: GameState):
     text_color = (255, 255, 255)
 
     # Draw the info text
-    text_surface = FONT_CARD_CHOOSE.render(f"Choose a new card to add to your deck:", True, text_color)
+    text_surface = render_text(FONT_CARD_CHOOSE, f"Choose a new card to add to your deck:", True, text_color)
     text_rect = text_surface.get_rect()
     text_rect.midtop = screen.get_rect().midtop
     DrawCall(text_surface, text_rect, LAYER_CARD_CHOOSE_TITLE).queue(game_state.frame_buffer)
@@ -429,7 +428,7 @@ def player_remove_cards(screen: pygame.Surface, game_state: GameState):
     text_color = (255, 255, 255)
 
     # Draw the info text
-    text_surface = FONT_CARD_CHOOSE.render(f"Choose {game_state.player_can_remove_cards_count} cards to remove from your deck:", True, text_color)
+    text_surface = render_text(FONT_CARD_CHOOSE, f"Choose {game_state.player_can_remove_cards_count} cards to remove from your deck:", True, text_color)
     text_rect = text_surface.get_rect()
     text_rect.midtop = (screen.get_rect().centerx, screen.get_rect().top + 20)
     DrawCall(text_surface, text_rect, LAYER_CARD_CHOOSE_TITLE).queue(game_state.frame_buffer)
@@ -443,7 +442,7 @@ def player_remove_cards(screen: pygame.Surface, game_state: GameState):
                 game_state.current_draw_pile.remove(card.card_data)
                 game_state.card_grid_layout.remove_item(card)
                 card.on_played(exhausted=True)
-                card.draw_order = LAYER_OVERRIDE_FG
+                card.set_draw_order(LAYER_OVERRIDE_FG)
                 game_state.player_can_remove_cards_count -= 1
 
     # Draw a button to skip choosing a card
@@ -459,163 +458,71 @@ def player_remove_cards(screen: pygame.Surface, game_state: GameState):
 
 
 def handle_special_room(game_state: GameState):
-    # Draw the player health
-    draw_player_health(game_state, bottom_left_pos=(game_state.screen.get_rect().left + 10, game_state.screen.get_rect().bottom - 10))
+    # Draw the player health and the current level
+    game_state.special_room_hud.queue(game_state.frame_buffer, game_state)
+
+    # Draw the room name, description and the action descriptions
+    room_surface, room_rect, action_button_rects, action_effects_texts = static_screen_cache.get(
+        "special room", (game_state.screen.get_size(), game_state.current_special_room_data, game_state.current_game_save.player_health), lambda: build_special_room_screen(game_state))
+    DrawCall(room_surface, room_rect, LAYER_CARD_CHOOSE_TITLE).queue(game_state.frame_buffer)
+
+    # Draw the available actions
+    available_actions = game_state.current_special_room_data.room_available_actions
+    for action, button_rect, effects_text in zip(available_actions, action_button_rects, action_effects_texts):
+        action: SpecialRoomAction
+        # Draw a button for the action and check if it's pressed.
+        draw_button(game_state.frame_buffer, action.action_name, button_rect, (0, 200, 0), (0, 50, 0), effects_text)
+        if is_rect_clicked(button_rect):
+            action.execute(game_state)
+            # game_state.current_special_room_data = None
+            finish_room(game_state, False)
+            audio.play_one_shot(constants.button_sound)
+            return
+
 
-    # Draw the current level
-    draw_current_level(game_state.screen, game_state)
+def build_special_room_screen(game_state: GameState) -> tuple:
+    """
+    Builds the static parts of the special room screen, and resolves the effects text of each action.
+    """
+    blits = []
 
-    # Draw the room name
-    text_surface = FONT_SPECIAL_ROOM_TITLE.render(game_state.current_special_room_data.room_name, True, (255, 255, 255))
+    # Room name
+    text_surface = render_text(FONT_SPECIAL_ROOM_TITLE, game_state.current_special_room_data.room_name, True, (255, 255, 255))
     text_rect = text_surface.get_rect()
     text_rect.midtop = (game_state.screen.get_rect().centerx, game_state.screen.get_rect().top + 20)
-    DrawCall(text_surface, text_rect, LAYER_CARD_CHOOSE_TITLE).queue(game_state.frame_buffer)
+    blits.append((text_surface, text_rect))
 
-    # Draw the room description
-    text_surface = FONT_SPECIAL_ROOM_DESCRIPTION.render(game_state.current_special_room_data.room_description, True, (255, 255, 255))
+    # Room description
+    text_surface = render_text(FONT_SPECIAL_ROOM_DESCRIPTION, game_state.current_special_room_data.room_description, True, (255, 255, 255))
     desc_text_rect = text_surface.get_rect()
     desc_text_rect.midtop = (text_rect.midbottom[0], text_rect.midbottom[1] + 10)
-    DrawCall(text_surface, desc_text_rect, LAYER_CARD_CHOOSE_TITLE).queue(game_state.frame_buffer)
+    blits.append((text_surface, desc_text_rect))
 
-    # Draw the available actions
-    available_actions = game_state.current_special_room_data.room_available_actions
-    for index, action in enumerate(available_actions):
+    # Action descriptions
+    action_button_rects = []
+    action_effects_texts = []
+    for index, action in enumerate(game_state.current_special_room_data.room_available_actions):
         action: SpecialRoomAction
-        # Draw a button for the action and check if it's pressed.
         pos_x = game_state.screen.get_rect().centerx - 200
         pos_y = game_state.screen.get_rect().centery - 200 + (index * 50)
         width = 200
         height = 40
         # if len(action.action_name) > 10:
         #     width = 300
-        button_rect = draw_button(game_state.frame_buffer, action.action_name, pygame.Rect(pos_x - 100, pos_y, width, height),
-                                  (0, 200, 0), (0, 50, 0), action.get_effects_text(game_state.current_game_save.player_health))
-        if is_rect_clicked(button_rect):
-            action.execute(game_state)
-            # game_state.current_special_room_data = None
-            finish_room(game_state, False)
-            audio.play_one_shot(constants.button_sound)
-            return
-        # Draw the action description
-        text_surface = FONT_SPECIAL_ROOM_DESCRIPTION.render(action.action_description, True, (255, 255, 255))
+        button_rect = pygame.Rect(pos_x - 100, pos_y, width, height)
+        action_button_rects.append(button_rect)
+        action_effects_texts.append(action.get_effects_text(game_state.current_game_save.player_health))
+        text_surface = render_text(FONT_SPECIAL_ROOM_DESCRIPTION, action.action_description, True, (255, 255, 255))
         text_rect = text_surface.get_rect()
         text_rect.midleft = (button_rect.right + 10, button_rect.centery)
-        DrawCall(text_surface, text_rect, LAYER_CARD_CHOOSE_TITLE).queue(game_state.frame_buffer)
+        blits.append((text_surface, text_rect))
+
+    room_surface, room_rect = composite_blits(blits)
+    return room_surface, room_rect, action_button_rects, action_effects_texts
 
 
 def draw_player_stats(screen: pygame.Surface, game_state: GameState):
-    # TODO: Refactor this function. Split to DrawHealth, DrawMana, DrawBlock, DrawPiles, DrawLevel
-    # Draw current level icon
-    draw_current_level(screen, game_state)
-
-    # Draw pile icon
-    width = game_state.game_data.image_library.icon_draw_pile.get_width()
-    height = game_state.game_data.image_library.icon_draw_pile.get_height()
-    left = screen.get_rect().left
-    top = screen.get_rect().bottom - height
-    draw_pile_icon_rect = pygame.Rect(left, top, width, height)
-    DrawCall(game_state.game_data.image_library.icon_draw_pile, draw_pile_icon_rect, LAYER_PLAYER_UI_BACKGROUND,
-             ["Your draw pile.", "When your draw pile is empty,", "the discard pile is shuffled", "into the draw pile."]).queue(game_state.frame_buffer)
-
-    # Draw pile text
-    draw_pile_text_surface = FONT_CARD_PILE_COUNT.render(f"{len(game_state.current_draw_pile)}", True, (255, 255, 255))
-    draw_pile_text_rect = draw_pile_text_surface.get_rect()
-    draw_pile_text_rect.center = (draw_pile_icon_rect.centerx + 32, draw_pile_icon_rect.centery + 18)
-    DrawCall(draw_pile_text_surface, draw_pile_text_rect, LAYER_PLAYER_UI_TEXT).queue(game_state.frame_buffer)
-
-    # Discard pile icon
-    width = game_state.game_data.image_library.icon_discard_pile.get_width()
-    height = game_state.game_data.image_library.icon_discard_pile.get_height()
-    left = screen.get_rect().right - width
-    top = screen.get_rect().bottom - height
-    discard_pile_icon_rect = pygame.Rect(left, top, width, height)
-    DrawCall(game_state.game_data.image_library.icon_discard_pile, discard_pile_icon_rect, LAYER_PLAYER_UI_BACKGROUND,
-             ["Your discard pile.", "Your played cards end up here."]).queue(game_state.frame_buffer)
-
-    # Discard pile text
-    discard_pile_text_surface = FONT_CARD_PILE_COUNT.render(f"{len(game_state.current_discard_pile)}", True, (255, 255, 255))
-    discard_pile_text_rect = discard_pile_text_surface.get_rect()
-    discard_pile_text_rect.center = (discard_pile_icon_rect.centerx - 32, discard_pile_icon_rect.centery + 18)
-    DrawCall(discard_pile_text_surface, discard_pile_text_rect, LAYER_PLAYER_UI_TEXT).queue(game_state.frame_buffer)
-
-    # Mana icon
-    left = screen.get_rect().left
-    top = draw_pile_icon_rect.top - game_state.game_data.image_library.icon_mana.get_height()
-    mana_icon_rect = pygame.Rect(left, top, game_state.game_data.image_library.icon_mana.get_width(), game_state.game_data.image_library.icon_mana.get_height())
-    DrawCall(game_state.game_data.image_library.icon_mana, mana_icon_rect, LAYER_PLAYER_UI_BACKGROUND,
-             ["Your current mana.", "Playing cards requires mana.", "Your mana is regenerated at", "the start of each turn."]).queue(game_state.frame_buffer)
-
-    # Mana text
-    mana_text_color = (0, 0, 0)
-    if game_state.current_player_mana < 1:
-        mana_text_color = (255, 60, 60)
-    elif game_state.current_player_mana < 2:
-        mana_text_color = (140, 0, 0)
-    mana_text_surface = FONT_PLAYER_MANA.render(
-        f"{game_state.current_player_mana} / {game_state.current_game_save.player_base_mana + game_state.player_base_mana_limit_addition_this_combat}", True, mana_text_color)
-    mana_text_rect = mana_text_surface.get_rect()
-    mana_text_rect.center = mana_icon_rect.center
-    DrawCall(mana_text_surface, mana_text_rect, LAYER_PLAYER_UI_TEXT).queue(game_state.frame_buffer)
-
-    health_icon_rect = draw_player_health(game_state, bottom_left_pos=(mana_icon_rect.left, mana_icon_rect.top))
-
-    if game_state.current_player_block > 0:
-        shield_icon_rect = pygame.Rect(0, 0, game_state.game_data.image_library.icon_block.get_width(), game_state.game_data.image_library.icon_block.get_height())
-        shield_icon_rect.midbottom = health_icon_rect.midtop
-        DrawCall(game_state.game_data.image_library.icon_block, shield_icon_rect, LAYER_PLAYER_UI_BACKGROUND,
-                 ["Your current block.", "Block cancels incoming damage."]).queue(game_state.frame_buffer)
-
-        shield_text_color = (0, 0, 0)
-        if game_state.current_player_block < 3:
-            shield_text_color = (255, 60, 60)
-        shield_text_surface = FONT_PLAYER_BLOCK.render(f"{game_state.current_player_block}", True, shield_text_color)
-        shield_text_rect = shield_text_surface.get_rect()
-        shield_text_rect.center = shield_icon_rect.center
-        DrawCall(shield_text_surface, shield_text_rect, LAYER_PLAYER_UI_TEXT).queue(game_state.frame_buffer)
-
-
-def draw_current_level(screen: pygame.Surface, game_state: GameState):
-    width = game_state.game_data.image_library.icon_level.get_width()
-    height = game_state.game_data.image_library.icon_level.get_height()
-    left = screen.get_rect().right - width - 10
-    top = screen.get_rect().top + 60
-    level_icon_rect = pygame.Rect(left, top, width, height)
-    DrawCall(game_state.game_data.image_library.icon_level, level_icon_rect, LAYER_PLAYER_UI_BACKGROUND, ["Current room.", "The last room is a boss room."]).queue(game_state.frame_buffer)
-
-    # Draw current level text
-    level_text_surface = FONT_DUNGEON_LEVEL.render(f"{game_state.current_game_save.dungeon_room_index + 1} / {game_state.game_data.boss_room_index + 1}", True, (255, 255, 255))
-    level_text_rect = level_text_surface.get_rect()
-    level_text_rect.center = (level_icon_rect.centerx, level_icon_rect.centery)
-    DrawCall(level_text_surface, level_text_rect, LAYER_PLAYER_UI_TEXT).queue(game_state.frame_buffer)
-    if game_state.current_game_save.dungeon_room_index == game_state.game_data.boss_room_index:
-        boss_level_text_surface = FONT_DUNGEON_LEVEL_HINT.render("(boss room)", True, (255, 255, 255))
-        boss_level_text_rect = boss_level_text_surface.get_rect()
-        boss_level_text_rect.midtop = level_text_rect.midbottom
-        DrawCall(boss_level_text_surface, boss_level_text_rect, LAYER_PLAYER_UI_TEXT).queue(game_state.frame_buffer)
-    return level_icon_rect
-
-
-def draw_player_health(game_state: GameState, top_left_pos=None, bottom_left_pos=None) -> pygame.Rect:
-    # Health icon
-    health_icon_rect = pygame.Rect(0, 0, game_state.game_data.image_library.icon_health.get_width(), game_state.game_data.image_library.icon_health.get_height())
-    if bottom_left_pos:
-        health_icon_rect.bottomleft = bottom_left_pos
-    elif top_left_pos:
-        health_icon_rect.topleft = top_left_pos
-    DrawCall(game_state.game_data.image_library.icon_health, health_icon_rect, LAYER_PLAYER_UI_BACKGROUND,
-             ["Your current health.", "Health does not regenerate,", "but some cards may have", "healing properties."]).queue(game_state.frame_buffer)
-
-    # Health text
-    health_text_color = (0, 0, 0)
-    if game_state.current_game_save.player_health < 20:
-        health_text_color = (255, 60, 60)
-    elif game_state.current_game_save.player_health < 50:
-        health_text_color = (140, 0, 0)
-    health_text_surface = FONT_PLAYER_HEALTH.render(f"{game_state.current_game_save.player_health}", True, health_text_color)
-    health_text_rect = health_text_surface.get_rect()
-    health_text_rect.center = health_icon_rect.center
-    DrawCall(health_text_surface, health_text_rect, LAYER_PLAYER_UI_TEXT).queue(game_state.frame_buffer)
-    return health_icon_rect
+    game_state.player_hud.queue(game_state.frame_buffer, game_state)
 
 
 def is_end_turn_button_pressed(game_state: GameState):
@@ -678,22 +585,16 @@ def is_help_button_pressed(game_state: GameState, pause_background_rect: pygame.
 
 def is_game_paused(screen, game_state) -> bool:
     if not game_state.is_pause_menu_shown:
-        help_text = FONT_HELP.render("Press 'Esc' to pause", True, (180, 180, 180))
+        help_text = render_text(FONT_HELP, "Press 'Esc' to pause", True, (180, 180, 180))
         help_text_rect = help_text.get_rect()
         help_text_rect.topleft = (5, 5)
-        screen.blit(help_text, help_text_rect)
+        DrawCall(help_text, help_text_rect, LAYER_PLAYER_UI_TEXT).queue(game_state.frame_buffer)
         return False
     else:
-        pause_background = pygame.Surface((1280, 720))
-        pause_background.fill((0, 0, 0))
-        pause_background.set_alpha(230)
-        pause_background_rect = pause_background.get_rect()
+        pause_background_rect = pygame.Rect(0, 0, 1280, 720)
         pause_background_rect.center = screen.get_rect().center
-        DrawCall(pause_background, pause_background_rect, LAYER_OVERRIDE_BG, blocks_tooltips=True, mask_tooltip_surface=False).queue(game_state.frame_buffer)
-        help_text = FONT_SPECIAL_ROOM_TITLE.render("Paused ('Esc' to close):", True, (180, 180, 180))
-        help_text_rect = help_text.get_rect()
-        help_text_rect.midtop = (pause_background_rect.midtop[0], 10)
-        DrawCall(help_text, help_text_rect, LAYER_OVERRIDE_BG).queue(game_state.frame_buffer)
+        pause_surface, pause_rect = static_screen_cache.get("pause", pause_background_rect.topleft, lambda: build_pause_screen(pause_background_rect))
+        DrawCall(pause_surface, pause_rect, LAYER_OVERRIDE_BG, blocks_tooltips=True, mask_tooltip_surface=False).queue(game_state.frame_buffer)
 
     if is_main_menu_button_pressed(game_state, pause_background_rect):
         game_state.exit_current_save()
@@ -710,62 +611,74 @@ def is_game_paused(screen, game_state) -> bool:
         audio.play_one_shot(constants.button_sound)
 
     if game_state.is_help_shown:
-        # WARN: We are regenerating the pygame surface every frame here. This is not optimal.
-        help_text_lines = [
-            "",
-            "#GENERAL",
-            "-> The goal of the game is to defeat all enemies in each room.",
-            "-> There's a boss at the end of each dungeon.",
-            "-> Your stats are shown in the bottom left corner.",
-            "-> Your stats are 'health', 'mana', and 'block'.",
-            "",
-            "#HEALTH",
-            "-> Your health does not regenerate between rooms.",
-            "-> Certain cards have healing properties.",
-            "",
-            "#MANA",
-            "-> Your mana resets at the start of each turn.",
-            "-> You can only play a card if you have the required mana.",
-            "",
-            "#BLOCK",
-            "-> Your block resets at the start of each turn.",
-            "-> Block negates the damage you take.",
-            "",
-            "#COMBAT",
-            "-> Enemies' next round intentions are shown on top of them.",
-            "-> Enemies can heal by casting a buff (blue fire icon).",
-            "-> Click an enemy to set it as the target.",
-            "",
-            "#CARDS",
-            "-> You can play cards by clicking on them.",
-            "-> The mana cost of a card is shown in card's top left corner.",
-            "",
-            "#SAVING",
-            "-> Game is automatically saved when you enter a new room.",
-            "-> When a run is over, the save is deleted.",
-        ]
-        help_background = pygame.Surface((500, 700))
-        help_background.fill((0, 0, 0))
-        help_background.set_alpha(230)
-        help_background_rect = help_background.get_rect()
-        help_background_rect.midtop = (screen.get_width() / 2, 10)
-        DrawCall(help_background, help_background_rect, LAYER_OVERRIDE_BG).queue(game_state.frame_buffer)
-        help_text = FONT_HELP.render("Help ('Esc' to close):", True, (180, 180, 180))
-        help_text_rect = help_text.get_rect()
-        help_text_rect.midtop = (help_background_rect.midtop[0], 20)
-        previous_rect = help_text_rect
-        DrawCall(help_text, help_text_rect, LAYER_OVERRIDE_BG).queue(game_state.frame_buffer)
-        for help_text_line in help_text_lines:
-            if help_text_line.startswith("#"):
-                help_text = FONT_HELP.render(help_text_line[1:], True, (255, 255, 255))
-                help_text_rect = help_text.get_rect()
-                help_text_rect.topleft = (help_background_rect.topleft[0] + 20, previous_rect.bottom + 10)
-                previous_rect = help_text_rect
-                DrawCall(help_text, help_text_rect, LAYER_OVERRIDE_BG).queue(game_state.frame_buffer)
-            else:
-                help_text = FONT_HELP.render(help_text_line, True, (180, 180, 180))
-                help_text_rect = help_text.get_rect()
-                help_text_rect.topleft = (help_background_rect.topleft[0] + 20, previous_rect.bottom)
-                previous_rect = help_text_rect
-                DrawCall(help_text, help_text_rect, LAYER_OVERRIDE_BG).queue(game_state.frame_buffer)
+        help_surface, help_rect = static_screen_cache.get("help", screen.get_size(), lambda: build_help_screen(screen))
+        DrawCall(help_surface, help_rect, LAYER_OVERRIDE_BG).queue(game_state.frame_buffer)
     return True
+
+
+def build_pause_screen(pause_background_rect: pygame.Rect) -> tuple:
+    pause_background = pygame.Surface(pause_background_rect.size, pygame.SRCALPHA)
+    pause_background.fill((0, 0, 0, 230))
+    help_text = render_text(FONT_SPECIAL_ROOM_TITLE, "Paused ('Esc' to close):", True, (180, 180, 180))
+    help_text_rect = help_text.get_rect()
+    help_text_rect.midtop = (pause_background_rect.midtop[0], 10)
+    return composite_blits([(pause_background, pause_background_rect), (help_text, help_text_rect)])
+
+
+def build_help_screen(screen) -> tuple:
+    help_text_lines = [
+        "",
+        "#GENERAL",
+        "-> The goal of the game is to defeat all enemies in each room.",
+        "-> There's a boss at the end of each dungeon.",
+        "-> Your stats are shown in the bottom left corner.",
+        "-> Your stats are 'health', 'mana', and 'block'.",
+        "",
+        "#HEALTH",
+        "-> Your health does not regenerate between rooms.",
+        "-> Certain cards have healing properties.",
+        "",
+        "#MANA",
+        "-> Your mana resets at the start of each turn.",
+        "-> You can only play a card if you have the required mana.",
+        "",
+        "#BLOCK",
+        "-> Your block resets at the start of each turn.",
+        "-> Block negates the damage you take.",
+        "",
+        "#COMBAT",
+        "-> Enemies' next round intentions are shown on top of them.",
+        "-> Enemies can heal by casting a buff (blue fire icon).",
+        "-> Click an enemy to set it as the target.",
+        "",
+        "#CARDS",
+        "-> You can play cards by clicking on them.",
+        "-> The mana cost of a card is shown in card's top left corner.",
+        "",
+        "#SAVING",
+        "-> Game is automatically saved when you enter a new room.",
+        "-> When a run is over, the save is deleted.",
+    ]
+    blits = []
+    help_background = pygame.Surface((500, 700), pygame.SRCALPHA)
+    help_background.fill((0, 0, 0, 230))
+    help_background_rect = help_background.get_rect()
+    help_background_rect.midtop = (screen.get_width() / 2, 10)
+    blits.append((help_background, help_background_rect))
+    help_text = render_text(FONT_HELP, "Help ('Esc' to close):", True, (180, 180, 180))
+    help_text_rect = help_text.get_rect()
+    help_text_rect.midtop = (help_background_rect.midtop[0], 20)
+    previous_rect = help_text_rect
+    blits.append((help_text, help_text_rect))
+    for help_text_line in help_text_lines:
+        if help_text_line.startswith("#"):
+            help_text = render_text(FONT_HELP, help_text_line[1:], True, (255, 255, 255))
+            help_text_rect = help_text.get_rect()
+            help_text_rect.topleft = (help_background_rect.topleft[0] + 20, previous_rect.bottom + 10)
+        else:
+            help_text = render_text(FONT_HELP, help_text_line, True, (180, 180, 180))
+            help_text_rect = help_text.get_rect()
+            help_text_rect.topleft = (help_background_rect.topleft[0] + 20, previous_rect.bottom)
+        previous_rect = help_text_rect
+        blits.append((help_text, help_text_rect))
+    return composite_blits(blits)
@@ -0,0 +1,174 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+import pygame
+
+from utils.constants import LAYER_PLAYER_UI_BACKGROUND, FONT_DUNGEON_LEVEL, FONT_DUNGEON_LEVEL_HINT, FONT_CARD_PILE_COUNT, FONT_PLAYER_MANA, FONT_PLAYER_HEALTH, \
+    FONT_PLAYER_BLOCK, TOOLTIP_HIT_TEST_USE_PIXEL_ALPHA
+from utils.drawing import Drawable, TextTooltip, FrameBuffer, composite_blits, mask_cache, is_surface_pixel_set, get_text_tooltip
+from utils.text import render_text
+
+if TYPE_CHECKING:
+    from typing import List, Dict, Callable
+    from state_management import GameState
+
+
+class HudIcon:
+    """
+    An icon of a HUD panel, with the tooltip shown when hovering it.
+    """
+    def __init__(self, image: pygame.Surface, rect: pygame.Rect, tooltip: TextTooltip):
+        self.image: pygame.Surface = image
+        self.rect: pygame.Rect = rect
+        self.tooltip: TextTooltip = tooltip
+
+    def is_hovered(self, mouse_pos) -> bool:
+        if not self.rect.collidepoint(mouse_pos):
+            return False
+        pos = (mouse_pos[0] - self.rect.x, mouse_pos[1] - self.rect.y)
+        if TOOLTIP_HIT_TEST_USE_PIXEL_ALPHA:
+            return is_surface_pixel_set(self.image, pos)
+        return mask_cache.get_mask(self.image).get_at(pos)
+
+
+class HudPanel(Drawable):
+    """
+    A group of HUD icons and texts, composited into a single surface.
+    Shows the tooltip of the hovered icon.
+    """
+    def __init__(self, blits: List[tuple[pygame.Surface, pygame.Rect]], icons: List[HudIcon], stats: tuple):
+        panel_surface, panel_rect = composite_blits(blits)
+        super().__init__(panel_surface, panel_rect.center, LAYER_PLAYER_UI_BACKGROUND, None)
+        self.rect.topleft = panel_rect.topleft
+        self.icons: List[HudIcon] = icons
+        self.stats: tuple = stats
+        """The stats the panel was built with."""
+
+    def should_show_tooltip(self, mouse_pos):
+        for icon in self.icons:
+            if icon.is_hovered(mouse_pos):
+                self.tooltip = icon.tooltip
+                return True
+        self.tooltip = None
+        return False
+
+
+class PlayerHud:
+    """
+    The player's stats (draw and discard piles, mana, health, block and the current room).
+    Each corner of the HUD is a single cached panel, which is only rebuilt when one of the stats it shows changes.
+    """
+    def __init__(self, show_combat_stats: bool = True):
+        self.show_combat_stats: bool = show_combat_stats
+        """If False, only the health and the current room are shown. Used outside of combat."""
+        self.panels: Dict[str, HudPanel] = {}
+        """The built panels, keyed by name."""
+        self.draw_pile_tooltip = get_text_tooltip(["Your draw pile.", "When your draw pile is empty,", "the discard pile is shuffled", "into the draw pile."])
+        self.discard_pile_tooltip = get_text_tooltip(["Your discard pile.", "Your played cards end up here."])
+        self.mana_tooltip = get_text_tooltip(["Your current mana.", "Playing cards requires mana.", "Your mana is regenerated at", "the start of each turn."])
+        self.health_tooltip = get_text_tooltip(["Your current health.", "Health does not regenerate,", "but some cards may have", "healing properties."])
+        self.block_tooltip = get_text_tooltip(["Your current block.", "Block cancels incoming damage."])
+        self.level_tooltip = get_text_tooltip(["Current room.", "The last room is a boss room."])
+
+    def queue(self, frame_buffer: FrameBuffer, game_state: GameState):
+        """
+        Rebuilds the panels whose stats have changed, and adds all panels to the frame buffer for this frame.
+        """
+        screen_size = game_state.screen.get_size()
+        save = game_state.current_game_save
+        if self.show_combat_stats:
+            mana_limit = save.player_base_mana + game_state.player_base_mana_limit_addition_this_combat
+            self.__queue_panel(frame_buffer, game_state, "left", self.__build_left_panel,
+                               (screen_size, len(game_state.current_draw_pile), game_state.current_player_mana, mana_limit, save.player_health, game_state.current_player_block))
+            self.__queue_panel(frame_buffer, game_state, "discard pile", self.__build_discard_pile,
+                               (screen_size, len(game_state.current_discard_pile)))
+        else:
+            self.__queue_panel(frame_buffer, game_state, "health", self.__build_health_panel,
+                               (screen_size, save.player_health))
+        self.__queue_panel(frame_buffer, game_state, "current level", self.__build_current_level,
+                           (screen_size, save.dungeon_room_index, game_state.game_data.boss_room_index))
+
+    def __queue_panel(self, frame_buffer: FrameBuffer, game_state: GameState, name: str, build_panel: Callable, stats: tuple):
+        panel = self.panels.get(name)
+        if (panel is None) or (panel.stats != stats):
+            blits = []
+            icons = []
+            build_panel(game_state, game_state.screen.get_rect(), blits, icons)
+            panel = HudPanel(blits, icons, stats)
+            self.panels[name] = panel
+        frame_buffer.add_drawable(panel)
+
+    @staticmethod
+    def __add_icon(blits: list, icons: list, image: pygame.Surface, rect: pygame.Rect, tooltip: TextTooltip):
+        icons.append(HudIcon(image, rect, tooltip))
+        blits.append((image, rect))
+
+    @staticmethod
+    def __add_text(blits: list, font: pygame.font.Font, text: str, color: tuple, **position) -> pygame.Rect:
+        text_surface = render_text(font, text, True, color)
+        text_rect = text_surface.get_rect(**position)
+        blits.append((text_surface, text_rect))
+        return text_rect
+
+    def __build_left_panel(self, game_state: GameState, screen_rect: pygame.Rect, blits: list, icons: list):
+        image_library = game_state.game_data.image_library
+
+        # Draw pile
+        draw_pile_icon_rect = image_library.icon_draw_pile.get_rect(bottomleft=screen_rect.bottomleft)
+        self.__add_icon(blits, icons, image_library.icon_draw_pile, draw_pile_icon_rect, self.draw_pile_tooltip)
+        self.__add_text(blits, FONT_CARD_PILE_COUNT, f"{len(game_state.current_draw_pile)}", (255, 255, 255),
+                        center=(draw_pile_icon_rect.centerx + 32, draw_pile_icon_rect.centery + 18))
+
+        # Mana
+        mana_icon_rect = image_library.icon_mana.get_rect(bottomleft=(screen_rect.left, draw_pile_icon_rect.top))
+        self.__add_icon(blits, icons, image_library.icon_mana, mana_icon_rect, self.mana_tooltip)
+        mana_text_color = (0, 0, 0)
+        if game_state.current_player_mana < 1:
+            mana_text_color = (255, 60, 60)
+        elif game_state.current_player_mana < 2:
+            mana_text_color = (140, 0, 0)
+        mana_limit = game_state.current_game_save.player_base_mana + game_state.player_base_mana_limit_addition_this_combat
+        self.__add_text(blits, FONT_PLAYER_MANA, f"{game_state.current_player_mana} / {mana_limit}", mana_text_color, center=mana_icon_rect.center)
+
+        # Health
+        health_icon_rect = self.__add_health(game_state, mana_icon_rect.topleft, blits, icons)
+
+        # Block
+        if game_state.current_player_block > 0:
+            shield_icon_rect = image_library.icon_block.get_rect(midbottom=health_icon_rect.midtop)
+            self.__add_icon(blits, icons, image_library.icon_block, shield_icon_rect, self.block_tooltip)
+            shield_text_color = (0, 0, 0)
+            if game_state.current_player_block < 3:
+                shield_text_color = (255, 60, 60)
+            self.__add_text(blits, FONT_PLAYER_BLOCK, f"{game_state.current_player_block}", shield_text_color, center=shield_icon_rect.center)
+
+    def __build_discard_pile(self, game_state: GameState, screen_rect: pygame.Rect, blits: list, icons: list):
+        image_library = game_state.game_data.image_library
+        discard_pile_icon_rect = image_library.icon_discard_pile.get_rect(bottomright=screen_rect.bottomright)
+        self.__add_icon(blits, icons, image_library.icon_discard_pile, discard_pile_icon_rect, self.discard_pile_tooltip)
+        self.__add_text(blits, FONT_CARD_PILE_COUNT, f"{len(game_state.current_discard_pile)}", (255, 255, 255),
+                        center=(discard_pile_icon_rect.centerx - 32, discard_pile_icon_rect.centery + 18))
+
+    def __build_health_panel(self, game_state: GameState, screen_rect: pygame.Rect, blits: list, icons: list):
+        self.__add_health(game_state, (screen_rect.left + 10, screen_rect.bottom - 10), blits, icons)
+
+    def __add_health(self, game_state: GameState, bottom_left_pos, blits: list, icons: list) -> pygame.Rect:
+        image_library = game_state.game_data.image_library
+        health_icon_rect = image_library.icon_health.get_rect(bottomleft=bottom_left_pos)
+        self.__add_icon(blits, icons, image_library.icon_health, health_icon_rect, self.health_tooltip)
+        health_text_color = (0, 0, 0)
+        if game_state.current_game_save.player_health < 20:
+            health_text_color = (255, 60, 60)
+        elif game_state.current_game_save.player_health < 50:
+            health_text_color = (140, 0, 0)
+        self.__add_text(blits, FONT_PLAYER_HEALTH, f"{game_state.current_game_save.player_health}", health_text_color, center=health_icon_rect.center)
+        return health_icon_rect
+
+    def __build_current_level(self, game_state: GameState, screen_rect: pygame.Rect, blits: list, icons: list):
+        image_library = game_state.game_data.image_library
+        level_icon_rect = image_library.icon_level.get_rect(topleft=(screen_rect.right - image_library.icon_level.get_width() - 10, screen_rect.top + 60))
+        self.__add_icon(blits, icons, image_library.icon_level, level_icon_rect, self.level_tooltip)
+        level_text = f"{game_state.current_game_save.dungeon_room_index + 1} / {game_state.game_data.boss_room_index + 1}"
+        level_text_rect = self.__add_text(blits, FONT_DUNGEON_LEVEL, level_text, (255, 255, 255), center=level_icon_rect.center)
+        if game_state.current_game_save.dungeon_room_index == game_state.game_data.boss_room_index:
+            self.__add_text(blits, FONT_DUNGEON_LEVEL_HINT, "(boss room)", (255, 255, 255), midtop=level_text_rect.midbottom)
@@ -2,6 +2,9 @@
 # Project: Slay the Python
 # Author: Jasper Honkasalo
 #
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
 import random
 import time
 
@@ -12,7 +15,12 @@ from gameloop import update
 from state_management import GameState
 from utils.input import Inputs
 
+if TYPE_CHECKING:
+    from typing import Optional
+
 MAX_DELTA_TIME = 1 / 30  # Cap the delta time to 30fps (to prevent the game from running too fast if the FPS drops)
+FPS_LIMIT = 144
+IDLE_FPS_LIMIT = 15  # The frame rate when nothing is animating. The next input event wakes the game up immediately.
 DEBUG_HELP = "(F1: Toggle debug, F2: Toggle extended referrer debug, F3: Debug object under mouse, F4: Debug game state, F5: Debug alive game objects)"
 
 
@@ -60,20 +68,23 @@ def main():
 
         fps = round(clock.get_fps())
         delta_time = clock.get_time() / 1000
-        debugging.set_stats(fps, delta_time, framebuffer_time, gameloop_update_time, debug_update_time)
-        debugging.draw_debug_window()
+        debugging.set_stats(fps, delta_time, framebuffer_time, gameloop_update_time, debug_update_time, game_state.game_object_collection.live_counts,
+                            game_state.frame_buffer.culled_count)
+        if debugging.enable_debugging:
+            # The debug window is drawn directly to the screen, bypassing the frame buffer
+            game_state.frame_buffer.synchronize()
+            debugging.draw_debug_window()
+            game_state.frame_buffer.invalidate()
 
-        end_frame(clock, game_state, delta_time)
+        end_frame(clock, game_state)
 
+    game_state.frame_buffer.synchronize()
     pygame.quit()
 
 
 def start_frame(screen, game_state: GameState):
-    # Clear the screen
-    if game_state and game_state.current_room_background:
-        screen.blit(game_state.current_room_background, (0, 0))
-    else:
-        screen.fill("black")
+    # The frame buffer clears the screen to the background itself when drawing
+    game_state.frame_buffer.set_background(game_state.current_room_background)
 
     # Clear the frame buffer
     game_state.frame_buffer.clear()
@@ -96,7 +107,10 @@ def update_gameloop(screen, game_state: GameState):
 
 def draw_framebuffer(game_state: GameState):
     start = time.time()
+    # Draw the game objects between their last two simulated positions, so movement stays smooth at any frame rate
+    game_state.game_object_collection.interpolate_positions(game_state.game_clock.get_interpolation())
     game_state.frame_buffer.draw()
+    game_state.game_object_collection.restore_positions()
     end = time.time()
     return end - start
 
@@ -114,9 +128,11 @@ def process_debug_inputs(game_state: GameState):
     if Inputs.is_key_pressed(pygame.K_F3):
         debugging.set_enable_debugging(True)
         previous_target = debugging.debug_target_object
-        for game_object in game_state.game_object_collection.game_objects:
-            if game_object.rect.collidepoint(pygame.mouse.get_pos()):
-                debugging.set_debug_target_object(game_object)
+        # Pick the topmost game object under the mouse
+        for drawable in game_state.frame_buffer.hover_index.get_hovered_drawables(Inputs.get_mouse_position()):
+            if game_state.game_object_collection.contains(drawable):
+                debugging.set_debug_target_object(drawable)
+                break
         if debugging.debug_target_object == previous_target:
             debugging.set_debug_target_object(None)
         debugging.update_debug_window(True)
@@ -142,13 +158,42 @@ def process_debug_inputs(game_state: GameState):
     return end - start
 
 
-def end_frame(clock, game_state, delta_time):
-    pygame.display.flip()
-
-    # Limit FPS to 144
-    clock.tick(144)
-    # Cap the delta time to 30fps (to prevent the game from running too fast if the FPS drops)
-    game_state.delta_time = min(delta_time, MAX_DELTA_TIME)
+def end_frame(clock, game_state, frame_time_override: Optional[float] = None):
+    """
+    Presents the frame, waits until the next frame is due, and adds the frame time to the game clock.
+    The game clock turns it into fixed simulation steps, which are run by the next frame.
+    :param frame_time_override: Overrides the simulated time of this frame. By default, the measured frame time is used.
+    """
+    game_state.frame_buffer.present()
+
+    # The objects destroyed this frame are not drawn or updated anymore, so they can be released
+    game_state.game_object_collection.destroy_queued_game_objects()
+    game_state.game_object_collection.report_leaked_game_objects()
+
+    # If nothing is animating, wait for input at the idle frame rate instead of redrawing an unchanged screen
+    waited_time = 0
+    woken_by_event = False
+    if game_state.is_idle() and not Inputs.has_events_this_frame():
+        # With the render thread, the frame would otherwise only be shown after the wait
+        game_state.frame_buffer.flush()
+        wait_start = time.time()
+        woken_by_event = Inputs.wait_for_event(1 / IDLE_FPS_LIMIT)
+        waited_time = time.time() - wait_start
+
+    # Limit FPS
+    frame_time = clock.tick(FPS_LIMIT) / 1000
+    if frame_time_override is not None:
+        frame_time = frame_time_override
+    elif woken_by_event:
+        # Animations started by the event must not be advanced by the time spent waiting for it
+        frame_time = min(max(frame_time - waited_time, 0), MAX_DELTA_TIME)
+    elif waited_time > 0:
+        # An idle frame: only the ambient animations run, at the idle frame rate
+        frame_time = min(frame_time, max(1 / IDLE_FPS_LIMIT, MAX_DELTA_TIME))
+    else:
+        # Cap the delta time to 30fps (to prevent the game from running too fast if the FPS drops)
+        frame_time = min(frame_time, MAX_DELTA_TIME)
+    game_state.game_clock.advance(frame_time)
 
 
 if __name__ == "__main__":
@@ -8,13 +8,16 @@ import pygame
 from data.cards import CardData
 from data.rooms import CombatRoomData, SpecialRoomData, RoomData
 from data.saves import GameSave, display_blocking_save_selection_screen
-from game_objects import EnemyCharacter, GameCard, GameObjectCollection, EnemyCharacterFactory, GameCardFactory, DamageNumberVisualEffectFactory
+from game_objects import EnemyCharacter, GameCard, GameObjectCollection, GameObjectHandle, EnemyCharacterFactory, GameCardFactory, emit_damage_number, enemy_sprite_cache
+from hud import PlayerHud
 from utils import drawing, layout, audio, constants
-from utils.animations import Tween
+from utils.animations import Tween, tween_scheduler
+from utils.clock import GameClock
 from utils.constants import FONT_DAMAGE_EFFECT_GENERIC
 from utils.io import ImageLibrary, load_image
 from utils.logging import log_info, log_warning
 from utils.math import initialize_dungeon_random
+from utils.pooling import recycle_object_pools, clear_object_pools
 
 if TYPE_CHECKING:
     from typing import Optional, List
@@ -22,18 +25,22 @@ if TYPE_CHECKING:
 
 class GameState:
     def __init__(self, screen: pygame.Surface, clock: pygame.time.Clock):
-        self.frame_buffer: drawing.FrameBuffer = drawing.FrameBuffer(screen)
+        self.frame_buffer: drawing.FrameBuffer = drawing.FrameBuffer(screen, constants.USE_DIRTY_RECT_RENDERING, constants.RENDER_SCALE, constants.USE_RENDER_THREAD)
         self.game_data: GameData = GameData()
         self.screen: pygame.Surface = screen
         self.clock: pygame.time.Clock = clock
+        self.game_clock: GameClock = GameClock(constants.SIMULATION_TIME_STEP, constants.MAX_SIMULATION_STEPS_PER_FRAME)
+        """Advances the simulation in fixed steps. See simulate()."""
         self.delta_time: float = 1 / 60
+        """The simulated time of the current frame, in whole simulation steps."""
         self.current_game_save: Optional[GameSave] = None
         self.current_room_background: Optional[pygame.Surface] = None
         self.current_round_index: int = 0
         self.current_player_mana: int = 0
         self.player_base_mana_limit_addition_this_combat: int = 0
         self.current_player_block: int = 0
-        self.current_targeted_enemy_character: Optional[EnemyCharacter] = None
+        self.__current_targeted_enemy_handle: Optional[GameObjectHandle] = None
+        """The handle of the targeted enemy, so a killed enemy is not kept alive by the game state."""
         self.current_hand: List[GameCard] = []
         self.current_draw_pile: List[CardData] = []
         self.current_discard_pile: List[CardData] = []
@@ -45,9 +52,12 @@ class GameState:
         self.current_special_room_data: Optional[SpecialRoomData] = None
         self.mana_addition_next_turn: int = 0
         self.draw_limit_addition_next_turn: int = 0
-        self.target_icon_alpha: int = 255
+        self.target_icon_alpha: float = 255
         self.target_icon_alpha_direction: int = 1
-        self.game_object_collection: GameObjectCollection = GameObjectCollection()
+        self.game_object_collection: GameObjectCollection = GameObjectCollection(self.frame_buffer)
+        # The tweens and pooled objects of the previous game state are not needed anymore
+        tween_scheduler.clear()
+        clear_object_pools()
         self.is_player_choosing_reward_cards: bool = False
         self.is_player_removing_cards: bool = False
         self.is_pause_menu_shown = False
@@ -59,36 +69,51 @@ class GameState:
         self.discard_pile_position = self.screen.get_rect().bottomright
         self.player_damaged_animation: Optional[Tween] = None
         self.player_damaged_overlay = self.game_data.image_library.effect_damaged_self
+        self.player_damaged_overlay_alpha: float = 255
+        """The opacity the damage overlay is drawn with. The overlay is a shared library image, so it is faded when blitted."""
         self.text_color = (255, 255, 255)
         self.tooltip_font_color = (255, 255, 255)
         self.card_grid_layout = layout.GridLayout((312, 410), 4)
-        self.damage_number_visual_effect_factory = DamageNumberVisualEffectFactory(self.game_object_collection, FONT_DAMAGE_EFFECT_GENERIC, "0", self.text_color, 3000)
+        self.player_hud: PlayerHud = PlayerHud()
+        self.special_room_hud: PlayerHud = PlayerHud(show_combat_stats=False)
         # noinspection PyTypeChecker
         self.enemy_character_factory = EnemyCharacterFactory(self.game_object_collection, None, self.game_data.image_library)
         # noinspection PyTypeChecker
         self.game_card_factory = GameCardFactory(self.game_object_collection, self.draw_pile_position, self.discard_pile_position, None)
 
+    @property
+    def current_targeted_enemy_character(self) -> Optional[EnemyCharacter]:
+        """
+        The enemy targeted by the player's cards, or None if there is none or it has been killed.
+        """
+        if self.__current_targeted_enemy_handle is None:
+            return None
+        return self.__current_targeted_enemy_handle.get()
+
+    @current_targeted_enemy_character.setter
+    def current_targeted_enemy_character(self, enemy_character: Optional[EnemyCharacter]):
+        self.__current_targeted_enemy_handle = enemy_character.handle if enemy_character else None
+
     def play_player_damaged_animation(self):
+        if self.player_damaged_animation:
+            tween_scheduler.stop_tween(self.player_damaged_animation)
         self.player_damaged_animation = Tween(255, 0, 0.5, self.__update_damage_overlay_alpha)
+        tween_scheduler.play_tween(self.player_damaged_animation)
 
-    def __update_damage_overlay_alpha(self, new_alpha: int):
-        self.player_damaged_overlay.set_alpha(new_alpha)
+    def __update_damage_overlay_alpha(self, new_alpha: float):
+        self.player_damaged_overlay_alpha = new_alpha
 
     def instantiate_damage_number(self, damage_amount: int, was_blocked: bool, position: tuple[int, int], layer=None):
-        self.damage_number_visual_effect_factory.set_layer(layer)
-        if was_blocked:
-            self.damage_number_visual_effect_factory.set_target_text(f"-{damage_amount}")
-            self.damage_number_visual_effect_factory.set_target_color((0, 0, 255))
-        else:
-            self.damage_number_visual_effect_factory.set_target_text(f"-{damage_amount}")
-            self.damage_number_visual_effect_factory.set_target_color((255, 0, 0))
-        return self.damage_number_visual_effect_factory.instantiate(position)
+        color = (0, 0, 255) if was_blocked else (255, 0, 0)
+        emit_damage_number(self.game_object_collection, FONT_DAMAGE_EFFECT_GENERIC, f"-{damage_amount}", color, position, layer)
 
     def enter_main_menu(self):
         """
         Displays a screen where the player can choose to load an existing save or create a new one.
         Warning: This function is blocking and will not return until the player has chosen a save.
         """
+        # The save selection screen draws directly to the screen, so the render thread must be done with it
+        self.frame_buffer.synchronize()
         pygame.display.set_caption("Slay the Python - Initializing...")
         audio.play_one_shot(constants.scene_change_sound)
         available_save_games = GameSave.list_available_save_games()
@@ -171,6 +196,9 @@ class GameState:
             return
 
         if isinstance(selected_room_data, CombatRoomData):
+            # Load the enemy sprites up front, so enemy turns don't stall on loading them
+            for enemy_spawn_data in selected_room_data.room_enemies:
+                enemy_sprite_cache.preload(enemy_spawn_data, constants.ENEMY_SPRITE_SCALING_FACTOR)
             self.player_draw_new_hand_cards()
             self.spawn_enemies_from_room_data(self.screen.get_width(), self.screen.get_height(), selected_room_data, self.enemy_character_factory, self.current_alive_enemy_characters)
             # Ensure that the player has a target
@@ -372,11 +400,61 @@ class GameState:
             return "PLAYER_LOSE"
         return "IN_PROGRESS"
 
-    def update_game_objects(self):
+    def is_idle(self) -> bool:
+        """
+        If nothing is moving or about to happen on its own: no animation, effect, timer or delayed sound is pending.
+        Ambient animations (the pulsing target icon) don't count, they keep running at the idle frame rate.
+        """
+        if ((self.gameplay_pause_timer > 0) and self.is_combat_shown()) or (self.player_damaged_animation is not None) or (not self.is_players_turn):
+            return False
+        if self.card_grid_layout.is_moving:
+            return False
+        if audio.has_delayed_sounds():
+            return False
+        return not self.game_object_collection.has_animating_game_objects()
+
+    def simulate(self):
+        """
+        Runs the simulation steps accumulated by the game clock since the previous frame.
+        Game objects are drawn between their positions before and after the last step.
+        """
+        # Objects destroyed during the previous frame are dropped from the collection, and can be reused from now on
+        self.game_object_collection.compact()
+        recycle_object_pools()
+        step_count = self.game_clock.take_steps()
+        self.delta_time = step_count * self.game_clock.time_step
+        for step_index in range(step_count):
+            if step_index == step_count - 1:
+                self.game_object_collection.store_previous_positions()
+            self.step(self.game_clock.time_step)
+        if step_count > 0:
+            self.game_object_collection.store_simulated_positions()
+
+    def step(self, time_step: float):
+        """
+        Advances the game by a single fixed time step. Can be called directly to run the game headless, or faster than real time.
+        """
+        self.game_object_collection.destroy_queued_game_objects()
+        self.game_object_collection.compact()
+        # Advance all playing tweens at once, before the game objects check for finished animations
+        tween_scheduler.update(time_step)
+        self.game_object_collection.update_particle_systems(time_step)
         for game_object in self.game_object_collection.game_objects:
             if (not game_object.is_awaiting_destruction) and game_object.is_active:
-                game_object.update(self.delta_time)
-                self.frame_buffer.add_drawable(game_object)
+                game_object.update(time_step)
+        if self.card_grid_layout:
+            self.card_grid_layout.update(time_step)
+        # The gameplay pause is a transition between turns, so it only runs while the combat is shown
+        if (self.gameplay_pause_timer > 0) and self.is_combat_shown():
+            self.gameplay_pause_timer -= time_step
+
+    def is_combat_shown(self) -> bool:
+        """
+        If the combat is being played, and not covered by the pause menu or by the reward, card removal or special room screens.
+        """
+        if self.is_pause_menu_shown or self.is_player_choosing_reward_cards or self.is_player_removing_cards:
+            return False
+        return self.current_special_room_data is None
 
 
 class GameData:
@@ -1,102 +1,266 @@
-from pygame.math import lerp, Vector2
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from typing import List, Optional, Callable
+
+
+EASING_LINEAR = 0
+"""Interpolates from the start value to the end value by the elapsed fraction of the duration."""
+EASING_FOLLOW = 1
+"""Re-reads the current value every update, and moves it towards the end value by the elapsed time in seconds."""
 
 
 class Tween:
     """
     Gradually changes a value from start_value to end_value over a duration.
+    The tween is advanced by the tween scheduler while it's playing. Play it with tween_scheduler.play_tween(), or as part of an Animation.
     """
+    __slots__ = ("is_finished", "start_value", "current_value", "end_value", "duration", "on_value_updated_callback", "on_finished_callback", "getter", "animation", "slot",
+                 "__elapsed_time")
+    EASING = EASING_LINEAR
+    DIMENSIONS = 1
+    """The number of components of the value. Tuples have two."""
+
     def __init__(self, start_value, end_value, duration: float, value_updated_callback=None, finished_callback=None):
         self.is_finished = False
         self.start_value = start_value
         self.current_value = start_value
         self.end_value = end_value
         self.duration: float = duration
-        self.elapsed_time: float = 0
         self.on_value_updated_callback = value_updated_callback
         self.on_finished_callback = finished_callback
-        self.delta_time = 1/60
+        self.getter: Optional[Callable] = None
+        """Reads the current value. Only used by the follow easing."""
+        self.animation: Optional[Animation] = None
+        """The animation this tween is played as part of, if any."""
+        self.slot: int = -1
+        """The row of the tween in the tween scheduler's arrays, or -1 if the tween is not playing."""
+        self.__elapsed_time: float = 0
 
-    def update(self, dt):
-        self.delta_time = dt
-        self.elapsed_time += dt
-        if self.elapsed_time >= self.duration:
-            self.current_value = self.end_value
-            if self.on_value_updated_callback:
-                self.on_value_updated_callback(self.current_value)
-            if not self.is_finished:
-                self.is_finished = True
-                if self.on_finished_callback:
-                    self.on_finished_callback()
-            return self.current_value
+    @property
+    def elapsed_time(self) -> float:
+        if self.slot >= 0:
+            return float(tween_scheduler.elapsed_times[self.slot])
+        return self.__elapsed_time
 
-        progress = self.elapsed_time / self.duration
-        self.current_value = self._calculate_current(progress)
-
-        if self.on_value_updated_callback:
-            self.on_value_updated_callback(self.current_value)
-
-        return self.current_value
-
-    def _calculate_current(self, progress):
-        return lerp(self.start_value, self.end_value, progress)
+    @elapsed_time.setter
+    def elapsed_time(self, elapsed_time: float):
+        if self.slot >= 0:
+            tween_scheduler.elapsed_times[self.slot] = elapsed_time
+        self.__elapsed_time = elapsed_time
 
 
 class GetterTween(Tween):
     """
     Like a Tween, but for a getter function.
+    The value is re-read every update, so it follows changes made by others.
     """
+    __slots__ = ()
+    EASING = EASING_FOLLOW
+
     def __init__(self, getter, end_value, duration: float, value_updated_callback=None, finished_callback=None):
         super().__init__(getter(), end_value, duration, value_updated_callback, finished_callback)
         self.getter = getter
 
-    def _calculate_current(self, progress):
-        self.start_value = self.getter()
-        return lerp(self.start_value, self.end_value, progress * self.duration)     # Scuffed but works; this is not how lerp should work
-
 
 class TupleTween(Tween):
     """
     Like a Tween, but for a tuple.
     """
-    def __init__(self, start_pos: tuple, end_pos: tuple, duration: float, value_updated_callback=None, finished_callback=None):
-        super().__init__(start_pos, end_pos, duration, value_updated_callback, finished_callback)
-        self.delta_time = 1/60
-
-    def _calculate_current(self, progress):
-        return Vector2(self.start_value).lerp(self.end_value, progress)
+    __slots__ = ()
+    DIMENSIONS = 2
 
 
-class GetterTupleTween(Tween):
+class GetterTupleTween(GetterTween):
     """
     Like a GetterTween, but for a tuple.
     """
-    def __init__(self, getter, end_pos: tuple, duration: float, value_updated_callback=None, finished_callback=None):
-        super().__init__(getter(), end_pos, duration, value_updated_callback, finished_callback)
-        self.getter = getter
-
-    def _calculate_current(self, progress):
-        self.start_value = self.getter()
-        return Vector2(self.start_value).lerp(self.end_value, progress * self.duration)     # Scuffed but works; this is not how lerp should work
+    __slots__ = ()
+    DIMENSIONS = 2
 
 
 class Animation:
     """
-    A collection of multiple tweens.
+    A collection of multiple tweens, played together.
     Is_finished is True when all tweens are finished.
     """
+    __slots__ = ("tweens", "is_finished", "on_finished_callback", "name")
+
     def __init__(self, tweens: list[Tween], finished_callback=None, name="unnamed"):
         self.tweens = tweens
         self.is_finished = False
         self.on_finished_callback = finished_callback
         self.name = name
 
-    def update(self, dt):
-        for tween in self.tweens:
+    def finish(self):
+        if not self.is_finished:
+            self.is_finished = True
+            if self.on_finished_callback:
+                self.on_finished_callback()
+
+
+class TweenScheduler:
+    """
+    Advances all playing tweens in a single vectorised step.
+    The start and end values, durations, elapsed times and easings of the tweens are stored in NumPy arrays, one row per tween.
+    The new values are written back through each tween's value updated callback.
+    Paused tweens keep their row and elapsed time, and continue where they left off when played again.
+    """
+    INITIAL_CAPACITY = 64
+
+    def __init__(self):
+        capacity = self.INITIAL_CAPACITY
+        self.start_values: np.ndarray = np.zeros((capacity, 2))
+        self.end_values: np.ndarray = np.zeros((capacity, 2))
+        self.durations: np.ndarray = np.zeros(capacity)
+        self.elapsed_times: np.ndarray = np.zeros(capacity)
+        self.easings: np.ndarray = np.zeros(capacity, np.int8)
+        self.is_running: np.ndarray = np.zeros(capacity, bool)
+        """If the tween in the row is advanced by updates. False for paused tweens and free rows."""
+        self.tweens: List[Optional[Tween]] = [None] * capacity
+        """The tween in each row, or None if the row is free."""
+        self.__free_slots: List[int] = list(range(capacity - 1, -1, -1))
+        self.__animations_without_tweens: List[Animation] = []
+        """Played animations that have no unfinished tweens. They are finished on the next update."""
+
+    def get_playing_count(self) -> int:
+        return len(self.tweens) - len(self.__free_slots)
+
+    def play(self, animation: Animation):
+        """
+        Starts or resumes all unfinished tweens of the animation.
+        """
+        if animation.is_finished:
+            return
+        has_unfinished_tweens = False
+        for tween in animation.tweens:
             if not tween.is_finished:
-                tween.update(dt)
+                tween.animation = animation
+                self.play_tween(tween)
+                has_unfinished_tweens = True
+        if (not has_unfinished_tweens) and (animation not in self.__animations_without_tweens):
+            self.__animations_without_tweens.append(animation)
+
+    def pause(self, animation: Animation):
+        for tween in animation.tweens:
+            if tween.slot >= 0:
+                self.is_running[tween.slot] = False
+
+    def stop(self, animation: Animation):
+        """
+        Stops the animation without finishing it. Its tweens lose their rows, and their finished callbacks are not called.
+        """
+        for tween in animation.tweens:
+            self.stop_tween(tween)
+        if animation in self.__animations_without_tweens:
+            self.__animations_without_tweens.remove(animation)
+
+    def play_tween(self, tween: Tween):
+        if tween.is_finished:
+            return
+        if tween.slot < 0:
+            if not self.__free_slots:
+                self.__grow()
+            slot = self.__free_slots.pop()
+            dimensions = tween.DIMENSIONS
+            self.start_values[slot, :dimensions] = tween.start_value
+            self.end_values[slot, :dimensions] = tween.end_value
+            self.durations[slot] = tween.duration
+            self.elapsed_times[slot] = tween.elapsed_time
+            self.easings[slot] = tween.EASING
+            self.tweens[slot] = tween
+            tween.slot = slot
+        self.is_running[tween.slot] = True
+
+    def stop_tween(self, tween: Tween):
+        slot = tween.slot
+        if slot < 0:
+            return
+        # Keep the elapsed time on the tween, in case it's played again
+        tween.elapsed_time = float(self.elapsed_times[slot])
+        tween.slot = -1
+        self.tweens[slot] = None
+        self.is_running[slot] = False
+        self.__free_slots.append(slot)
+
+    def clear(self):
+        for tween in self.tweens:
+            if tween is not None:
+                self.stop_tween(tween)
+        self.__animations_without_tweens.clear()
+
+    def update(self, delta_time: float):
+        slots = np.flatnonzero(self.is_running)
+        if len(slots) > 0:
+            self.__advance(slots, delta_time)
+        if self.__animations_without_tweens:
+            animations = self.__animations_without_tweens
+            self.__animations_without_tweens = []
+            for animation in animations:
+                animation.finish()
+
+    def __advance(self, slots: np.ndarray, delta_time: float):
+        tweens = self.tweens
+        # Follow easing moves from the current value, so read it first
+        for slot in slots[self.easings[slots] == EASING_FOLLOW].tolist():
+            tween = tweens[slot]
+            self.start_values[slot, :tween.DIMENSIONS] = tween.getter()
+
+        elapsed_times = self.elapsed_times[slots] + delta_time
+        self.elapsed_times[slots] = elapsed_times
+        durations = self.durations[slots]
+        is_finished = elapsed_times >= durations
+        progress = np.divide(elapsed_times, durations, out=np.ones_like(elapsed_times), where=durations > 0)
+        weights = np.where(self.easings[slots] == EASING_FOLLOW, elapsed_times, progress)
+        np.clip(weights, 0, 1, out=weights)
+        start_values = self.start_values[slots]
+        values = start_values + (self.end_values[slots] - start_values) * weights[:, np.newaxis]
+
+        finished_tweens = []
+        for slot, value, tween_finished in zip(slots.tolist(), values.tolist(), is_finished.tolist()):
+            tween = tweens[slot]
+            if tween_finished:
+                value = tween.end_value
+                finished_tweens.append(tween)
+            elif tween.DIMENSIONS == 1:
+                value = value[0]
+            else:
+                value = (value[0], value[1])
+            tween.current_value = value
+            if tween.on_value_updated_callback:
+                tween.on_value_updated_callback(value)
+
+        # Finish the tweens first, then the animations whose tweens are all finished
+        finished_animations = []
+        for tween in finished_tweens:
+            if tween.slot < 0:
+                # Stopped by a callback of an earlier tween
+                continue
+            self.stop_tween(tween)
+            tween.is_finished = True
+            if tween.on_finished_callback:
+                tween.on_finished_callback()
+            animation = tween.animation
+            if (animation is not None) and (animation not in finished_animations) and all(animation_tween.is_finished for animation_tween in animation.tweens):
+                finished_animations.append(animation)
+        for animation in finished_animations:
+            animation.finish()
+
+    def __grow(self):
+        old_capacity = len(self.tweens)
+        capacity = old_capacity * 2
+        self.start_values = np.resize(self.start_values, (capacity, 2))
+        self.end_values = np.resize(self.end_values, (capacity, 2))
+        self.durations = np.resize(self.durations, capacity)
+        self.elapsed_times = np.resize(self.elapsed_times, capacity)
+        self.easings = np.resize(self.easings, capacity)
+        self.is_running = np.resize(self.is_running, capacity)
+        self.is_running[old_capacity:] = False
+        self.tweens.extend([None] * (capacity - old_capacity))
+        self.__free_slots.extend(range(capacity - 1, old_capacity - 1, -1))
+
 
-        if all(tween.is_finished for tween in self.tweens):
-            if not self.is_finished:
-                self.is_finished = True
-                if self.on_finished_callback:
-                    self.on_finished_callback()
+tween_scheduler = TweenScheduler()
@@ -0,0 +1,194 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+import json
+import os
+
+import pygame
+
+from utils.logging import log_info, log_warning
+
+if TYPE_CHECKING:
+    from typing import List, Dict, Optional
+
+
+class SpriteAtlas:
+    """
+    Packs many small sprites into a few large page surfaces, and hands out subsurfaces of the pages.
+    Sprites are looked up by their file path. Sprites that are too large to pack are not included, and should be loaded separately.
+    The packed pages and the rect index can be saved to disk, so later startups only have to load the pages.
+    """
+    PAGE_SIZE = 2048
+    """The width and maximum height of a page."""
+    MAX_SPRITE_SIZE = 512
+    """Sprites wider or taller than this are not packed."""
+    PADDING = 1
+    """Empty pixels between packed sprites."""
+    INDEX_FILE_NAME = "atlas.json"
+
+    def __init__(self):
+        self.pages: List[pygame.Surface] = []
+        self.rects: Dict[str, tuple[int, pygame.Rect]] = {}
+        """The page index and the rect of each packed sprite, keyed by normalized file path."""
+        self.sources: Dict[str, list] = {}
+        """The size and modification time of each source file, including the ones too large to pack. Used to detect a stale atlas."""
+        self.__sprites: Dict[str, pygame.Surface] = {}
+
+    def get_sprite(self, path: str) -> Optional[pygame.Surface]:
+        """
+        :return: A subsurface of the atlas page the sprite is packed in, or None if the sprite is not packed.
+        The subsurface shares its pixels with the page, so it must not be drawn on. Its alpha can be set freely.
+        """
+        path = os.path.normpath(path)
+        sprite = self.__sprites.get(path)
+        if sprite is None:
+            packed = self.rects.get(path)
+            if packed is None:
+                return None
+            page_index, rect = packed
+            sprite = self.pages[page_index].subsurface(rect)
+            self.__sprites[path] = sprite
+        return sprite
+
+    def pack(self, sprite_paths: List[str]):
+        """
+        Loads the sprites and packs them into new pages, replacing the current ones.
+        Uses shelf packing: the sprites are sorted by height, and placed left to right in rows.
+        """
+        sprites = []
+        sources = {}
+        for path in sprite_paths:
+            path = os.path.normpath(path)
+            image = pygame.image.load(path)
+            sources[path] = self.__get_source_info(path)
+            if image.get_width() > self.MAX_SPRITE_SIZE or image.get_height() > self.MAX_SPRITE_SIZE:
+                continue
+            sprites.append((path, image))
+        sprites.sort(key=lambda sprite: (sprite[1].get_height(), sprite[1].get_width()), reverse=True)
+
+        self.pages.clear()
+        self.rects.clear()
+        self.sources = sources
+        self.__sprites.clear()
+        page_blits = []
+        page_height = 0
+        shelf_x = 0
+        shelf_y = 0
+        shelf_height = 0
+        for path, image in sprites:
+            width, height = image.get_size()
+            if shelf_x + width > self.PAGE_SIZE:
+                # Start a new shelf
+                shelf_x = 0
+                shelf_y += shelf_height + self.PADDING
+                shelf_height = 0
+            if shelf_y + height > self.PAGE_SIZE:
+                # Start a new page
+                self.__add_page(page_blits, page_height)
+                page_blits = []
+                shelf_x = 0
+                shelf_y = 0
+                shelf_height = 0
+            rect = pygame.Rect(shelf_x, shelf_y, width, height)
+            page_blits.append((image, rect))
+            self.rects[path] = (len(self.pages), rect)
+            shelf_x += width + self.PADDING
+            shelf_height = max(shelf_height, height)
+            page_height = shelf_y + shelf_height
+        if page_blits:
+            self.__add_page(page_blits, page_height)
+
+    def save(self, folder: str):
+        os.makedirs(folder, exist_ok=True)
+        for page_index, page in enumerate(self.pages):
+            pygame.image.save(page, os.path.join(folder, f"atlas_{page_index}.png"))
+        index = {
+            "pages": len(self.pages),
+            "sprites": {path: {"page": page_index, "rect": list(rect)} for path, (page_index, rect) in self.rects.items()},
+            "sources": self.sources
+        }
+        with open(os.path.join(folder, self.INDEX_FILE_NAME), "w") as file:
+            json.dump(index, file, indent=2)
+
+    def load(self, folder: str, sprite_paths: List[str]) -> bool:
+        """
+        Loads a saved atlas.
+        :return: False if there is no saved atlas, or if it does not match the given sprite files.
+        """
+        index_path = os.path.join(folder, self.INDEX_FILE_NAME)
+        if not os.path.exists(index_path):
+            return False
+        with open(index_path, "r") as file:
+            index = json.load(file)
+        sources = {os.path.normpath(path): self.__get_source_info(path) for path in sprite_paths}
+        if index["sources"] != sources:
+            return False
+
+        sprites = index["sprites"]
+        self.pages = [pygame.image.load(os.path.join(folder, f"atlas_{page_index}.png")).convert_alpha() for page_index in range(index["pages"])]
+        self.rects = {path: (sprite["page"], pygame.Rect(sprite["rect"])) for path, sprite in sprites.items()}
+        self.sources = sources
+        self.__sprites.clear()
+        return True
+
+    def __add_page(self, blits: list, height: int):
+        page = pygame.Surface((self.PAGE_SIZE, height), pygame.SRCALPHA).convert_alpha()
+        page.fill((0, 0, 0, 0))
+        page.blits([(image.convert_alpha(), rect) for image, rect in blits], doreturn=False)
+        self.pages.append(page)
+
+    @staticmethod
+    def __get_source_info(path: str) -> list:
+        stat = os.stat(path)
+        return [stat.st_size, int(stat.st_mtime)]
+
+
+SPRITE_ATLAS_FOLDERS = [
+    "Content/Sprites/Cards",
+    "Content/Sprites/UI",
+    "Content/Sprites/Effects",
+    "Content/Sprites/Enemies",
+    "Content/Sprites/Bosses",
+]
+"""The folders whose sprites are packed into the atlas."""
+SPRITE_ATLAS_CACHE_FOLDER = "Content/Atlas"
+"""Where the packed atlas is saved to and loaded from."""
+
+sprite_atlas = SpriteAtlas()
+
+
+def initialize_sprite_atlas():
+    """
+    Loads the saved sprite atlas, or packs and saves a new one if the sprites have changed.
+    Must be called after the display mode has been set. Does nothing if the atlas is already loaded.
+    """
+    if sprite_atlas.pages:
+        return
+    sprite_paths = get_sprite_atlas_paths()
+    if sprite_atlas.load(SPRITE_ATLAS_CACHE_FOLDER, sprite_paths):
+        log_info(f"Loaded the sprite atlas: {len(sprite_atlas.rects)} sprites in {len(sprite_atlas.pages)} pages")
+        return
+    sprite_atlas.pack(sprite_paths)
+    log_info(f"Packed the sprite atlas: {len(sprite_atlas.rects)} sprites in {len(sprite_atlas.pages)} pages")
+    try:
+        sprite_atlas.save(SPRITE_ATLAS_CACHE_FOLDER)
+    except (OSError, pygame.error) as e:
+        log_warning(f"Could not save the sprite atlas: {str(e)}")
+
+
+def get_sprite_atlas_paths() -> List[str]:
+    sprite_paths = []
+    for folder in SPRITE_ATLAS_FOLDERS:
+        for filename in sorted(os.listdir(folder)):
+            if filename.endswith(".png"):
+                sprite_paths.append(os.path.join(folder, filename))
+    return sprite_paths
+
+
+if __name__ == "__main__":
+    # Pre-packs the atlas, for example before building a release: python -m utils.atlas
+    pygame.display.init()
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    sprite_atlas.pack(get_sprite_atlas_paths())
+    sprite_atlas.save(SPRITE_ATLAS_CACHE_FOLDER)
+    log_info(f"Packed the sprite atlas: {len(sprite_atlas.rects)} sprites in {len(sprite_atlas.pages)} pages")
@@ -35,6 +35,10 @@ def update(delta_time):
             looping_soundbank_sounds[index] = (soundbank, get_interval_seconds_func, next_play_time - delta_time)
 
 
+def has_delayed_sounds() -> bool:
+    return len(delayed_sounds) > 0
+
+
 def add_looping_soundbank(soundbank, get_interval_seconds_func, start_delayed):
     if start_delayed:
         looping_soundbank_sounds.append((soundbank, get_interval_seconds_func, get_interval_seconds_func()))
@@ -0,0 +1,50 @@
+import math
+
+
+class GameClock:
+    """
+    A fixed-timestep simulation clock.
+    Frame time is accumulated, and taken out in whole steps of time_step seconds, so the game advances the same way regardless of the frame rate.
+    The time left over is used to interpolate the drawn frame between the last two simulated steps.
+    """
+    def __init__(self, time_step: float, max_steps_per_frame: int):
+        self.time_step: float = time_step
+        self.max_steps_per_frame: int = max_steps_per_frame
+        """Limits how many steps are caught up per frame, so a slow frame doesn't cause even slower frames."""
+        self.time_scale: float = 1
+        """Multiplies the accumulated frame time. Above 1, the simulation is fast-forwarded by running more steps per frame."""
+        self.time: float = 0
+        """The simulated time in seconds."""
+        self.step_count: int = 0
+        """The number of steps simulated in total."""
+        self.accumulated_time: float = 0
+        """Frame time that has not been simulated yet."""
+
+    def advance(self, frame_time: float):
+        """
+        Adds the time of a rendered frame to be simulated.
+        """
+        self.accumulated_time += frame_time * self.time_scale
+
+    def take_steps(self) -> int:
+        """
+        Takes the accumulated whole steps out of the accumulated time.
+        :return: The number of steps to simulate this frame.
+        """
+        step_count = int(self.accumulated_time / self.time_step)
+        max_steps = math.ceil(self.max_steps_per_frame * max(self.time_scale, 1))
+        if step_count > max_steps:
+            # Drop the time that can't be caught up
+            step_count = max_steps
+            self.accumulated_time = 0
+        else:
+            self.accumulated_time -= step_count * self.time_step
+        self.time += step_count * self.time_step
+        self.step_count += step_count
+        return step_count
+
+    def get_interpolation(self) -> float:
+        """
+        :return: How far the drawn frame is between the previous and the latest simulated step, from 0 to 1.
+        """
+        return min(self.accumulated_time / self.time_step, 1)
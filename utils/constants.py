@@ -13,6 +13,28 @@ PLAYER_STARTING_CARDS = CardData.load_starting_cards()
 
 ENEMY_SPRITE_SCALING_FACTOR = 8
 
+# Rendering
+USE_DIRTY_RECT_RENDERING = False    # Only redraw and present the changed regions of the screen. Useful on low-end machines.
+TOOLTIP_HIT_TEST_USE_PIXEL_ALPHA = False     # Hit-test tooltips by reading single pixels instead of using cached collision masks. Uses less memory.
+TEXT_CACHE_MAX_SIZE = 512     # The maximum number of rendered text surfaces kept in the text cache.
+TEXT_TOOLTIP_CACHE_MAX_SIZE = 256     # The maximum number of shared text tooltips kept in the tooltip cache.
+SCALE_CACHE_STEPS = 64      # Scale factors of cached scaled surfaces are rounded to 1 / SCALE_CACHE_STEPS.
+SCALE_CACHE_MAX_SIZE = 128      # The maximum number of scaled surfaces kept in the scale cache.
+RENDER_SCALE = 1.0      # Draw the frame at this fraction of the window resolution (for example 0.5 or 0.75), and upscale it. Trades sharpness for fill rate.
+USE_RENDER_THREAD = False   # Draw each frame on a background thread while the next frame is updated. Faster on multi-core machines, but frames are shown one frame later.
+
+# Simulation
+SIMULATION_TIME_STEP = 1 / 120      # The game is simulated in fixed steps of this many seconds. Game objects are drawn between their last two simulated positions.
+MAX_SIMULATION_STEPS_PER_FRAME = 8      # If a frame takes longer than this many steps, the rest of the frame time is dropped instead of caught up.
+GAME_OBJECT_POOL_MAX_SIZE = 64      # The maximum number of destroyed cards kept for reuse.
+LEAK_REPORT_DELAY = 3000      # Destroyed game objects still referenced after this many milliseconds are reported as memory leaks.
+
+# Effects
+SLASH_EFFECT_LIFETIME = 1      # How many seconds the slash effect of a hit enemy takes to fade out.
+DAMAGE_NUMBER_LIFETIME = 3      # How many seconds a damage number takes to float up and fade out.
+DAMAGE_NUMBER_RISE = 200      # How many pixels a damage number floats up over its lifetime.
+DAMAGE_NUMBER_SWAY = 20      # How many pixels a damage number sways sideways while floating up.
+
 # Fonts
 BASE_FONT_PATH = "Content/Fonts/YoungSerif-Regular.ttf"
 FONT_UI_XXS = pygame.font.Font(BASE_FONT_PATH, 5)
@@ -2,13 +2,18 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from utils.constants import FONT_DEBUG
+from utils.drawing import text_tooltip_cache
 from utils.input import Inputs
+from utils.pooling import object_pools
+from utils.scaling import scaled_surface_cache
+from utils.text import text_cache
 
 if TYPE_CHECKING:
-    from typing import Optional
+    from typing import Optional, List
 
 from _weakref import ReferenceType
 from collections import Counter
+from types import FrameType, MethodType, ModuleType
 
 import pygame
 import weakref
@@ -43,7 +48,8 @@ def set_extended_referrer_debugging(value: bool):
     extended_referrer_debugging = value
 
 
-def set_stats(current_fps, current_delta_time, current_framebuffer_time, current_gameloop_update_time, current_debug_update_time):
+def set_stats(current_fps, current_delta_time, current_framebuffer_time, current_gameloop_update_time, current_debug_update_time, live_object_counts: Optional[Counter] = None,
+              culled_drawable_count: int = 0):
     global debug_stats_strings
     debug_stats_strings.clear()
     debug_stats_strings.append(f"FPS: {current_fps}")
@@ -52,6 +58,16 @@ def set_stats(current_fps, current_delta_time, current_framebuffer_time, current
     debug_stats_strings.append(f"Gameloop ms: {current_gameloop_update_time:.4f}")
     debug_stats_strings.append(f"Debug ms: {current_debug_update_time:.4f}")
     debug_stats_strings.append(f"Mouse pos: {Inputs.get_mouse_position()}")
+    debug_stats_strings.append(f"Culled drawables: {culled_drawable_count}")
+    debug_stats_strings.append(f"Text cache: {len(text_cache.surfaces)} ({text_cache.get_hit_rate():.0%} hits)")
+    debug_stats_strings.append(f"Scale cache: {len(scaled_surface_cache.surfaces)} ({scaled_surface_cache.get_hit_rate():.0%} hits)")
+    debug_stats_strings.append(f"Tooltip cache: {len(text_tooltip_cache.tooltips)} ({text_tooltip_cache.get_hit_rate():.0%} hits)")
+    for object_pool in object_pools:
+        debug_stats_strings.append(f"{object_pool.name} pool: {len(object_pool.free_objects)} ({object_pool.get_hit_rate():.0%} hits)")
+    if live_object_counts is not None:
+        debug_stats_strings.append(f"Live objects: {sum(live_object_counts.values())}")
+        for object_type, count in live_object_counts.most_common():
+            debug_stats_strings.append(f"  {object_type.__name__}: {count}")
 
 
 def set_debug_target_object(game_object):
@@ -158,9 +174,9 @@ def draw_debug_window():
         y_offset += FONT_DEBUG.get_height() + 5
         max_width = max(max_width, text_surface.get_width())
 
-    debug_surface_height = 95
-    debug_surface_width = 140
-    if debug_stats_surface is None:
+    debug_surface_height = y_offset
+    debug_surface_width = 200
+    if (debug_stats_surface is None) or (debug_stats_surface.get_height() != debug_surface_height):
         debug_stats_surface = pygame.Surface((debug_surface_width, debug_surface_height))
         debug_stats_surface.set_alpha(128)
 
@@ -212,3 +228,57 @@ def truncate_obj_as_list(obj):
     if len(list_elements) > 100:
         list_elements = f"{obj[:100]}..."
     return f"List of \"{list_elements}\" -> (MEM_ADDR={hex(id(obj))})"
+
+
+def get_referrer_owners(obj) -> List[str]:
+    """
+    Describes what keeps the object alive, as "Owner.attribute" for attributes, and "list in Owner.attribute" for containers.
+    Searches all objects tracked by the garbage collector, so it's slow. Only use it to report leaks.
+    """
+    referrers = gc.get_referrers(obj)
+    ignored_ids = {id(referrers)}
+    owners = []
+    for referrer in referrers:
+        if isinstance(referrer, FrameType):
+            continue
+        owners.append(describe_referrer(referrer, obj, ignored_ids))
+    return owners
+
+
+def describe_referrer(referrer, referent, ignored_ids: set, depth: int = 0) -> str:
+    """
+    Describes a referrer of the referent. Containers are described together with the attribute that holds them, up to three levels up.
+    """
+    # Instance attributes. Depending on the Python version, the referrer is either the instance or its __dict__.
+    attributes = getattr(referrer, "__dict__", None)
+    if isinstance(attributes, dict) and not isinstance(referrer, type):
+        for name, value in attributes.items():
+            if value is referent:
+                owner_name = referrer.__name__ if isinstance(referrer, ModuleType) else type(referrer).__name__
+                return f"{owner_name}.{name}"
+    # Slotted instance attributes
+    for owner_type in type(referrer).__mro__:
+        for name in owner_type.__dict__.get("__slots__", ()):
+            if name.startswith("__") and not name.endswith("__"):
+                name = f"_{owner_type.__name__.lstrip('_')}{name}"
+            if getattr(referrer, name, None) is referent:
+                return f"{type(referrer).__name__}.{name}"
+    if isinstance(referrer, dict):
+        owners = gc.get_referrers(referrer)
+        ignored_ids.add(id(owners))
+        for owner in owners:
+            if getattr(owner, "__dict__", None) is referrer:
+                return describe_referrer(owner, referent, ignored_ids, depth)
+
+    description = type(referrer).__name__
+    if isinstance(referrer, MethodType):
+        description = f"method {referrer.__func__.__qualname__}"
+    if depth >= 3:
+        return description
+    owners = gc.get_referrers(referrer)
+    ignored_ids.add(id(owners))
+    for owner in owners:
+        if (id(owner) in ignored_ids) or isinstance(owner, FrameType):
+            continue
+        return f"{description} in {describe_referrer(owner, referrer, ignored_ids, depth + 1)}"
+    return description
@@ -1,13 +1,293 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
 
-from utils.constants import FONT_TOOLTIP_GENERIC, LAYER_OVERRIDE_FG, FONT_BUTTON_GENERIC, LAYER_OVERRIDE_BG
+import weakref
+from collections import Counter, OrderedDict
+from typing import TYPE_CHECKING, Dict
+
+from utils.constants import FONT_TOOLTIP_GENERIC, LAYER_OVERRIDE_FG, FONT_BUTTON_GENERIC, LAYER_OVERRIDE_BG, TOOLTIP_HIT_TEST_USE_PIXEL_ALPHA, \
+    TEXT_TOOLTIP_CACHE_MAX_SIZE
 from utils.input import Inputs
+from utils.picking import HoverIndex
+from utils.render_thread import render_thread
+from utils.text import render_text
 
 import pygame
+import numpy as np
 
 if TYPE_CHECKING:
-    from typing import List, Optional
+    from typing import List, Optional, Callable, Union
+
+
+class MaskCache:
+    """
+    Caches the collision masks of surfaces, so that they don't have to be rebuilt every time the mouse is over them.
+    The masks are keyed by the surface and a content version. A mask is rebuilt if the version it was built with changes.
+    Masks are released automatically when their surface is garbage collected.
+    """
+    def __init__(self):
+        self.masks: weakref.WeakKeyDictionary[pygame.Surface, tuple[int, pygame.mask.Mask]] = weakref.WeakKeyDictionary()
+
+    def get_mask(self, surface: pygame.Surface, version: int = 0) -> pygame.mask.Mask:
+        cached = self.masks.get(surface)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        mask = pygame.mask.from_surface(surface)
+        self.masks[surface] = (version, mask)
+        return mask
+
+    def invalidate(self, surface: pygame.Surface):
+        self.masks.pop(surface, None)
+
+
+mask_cache = MaskCache()
+
+
+def is_surface_pixel_set(surface: pygame.Surface, position) -> bool:
+    """
+    Checks a single pixel the same way pygame.mask.from_surface() would, without building the whole mask.
+    """
+    color = surface.get_at(position)
+    colorkey = surface.get_colorkey()
+    if colorkey is not None:
+        return color != colorkey
+    return color.a > 127
+
+
+def composite_surfaces(size, blits) -> pygame.Surface:
+    """
+    Composites surfaces with per-pixel alpha onto a new transparent surface.
+    Unlike blitting them onto each other directly, the result looks the same as blitting each of the surfaces onto the screen in order,
+    even where the surfaces below are partially transparent.
+    :param size: The size of the composited surface.
+    :param blits: (surface, position) pairs, bottom first.
+    """
+    composited = pygame.Surface(size, pygame.SRCALPHA)
+    # The surfaces may be blitted by the render thread at the same time
+    with render_thread.surface_lock:
+        for surface, position in blits:
+            if surface.get_width() == 0 or surface.get_height() == 0:
+                continue    # Empty surfaces (like rendered empty strings) can't be pre-multiplied
+            # Converting also repacks padded surfaces (like rendered text), which premul_alpha() doesn't handle correctly
+            composited.blit(surface.convert_alpha().premul_alpha(), position, special_flags=pygame.BLEND_PREMULTIPLIED)
+
+    # Convert back to straight alpha, so the surface can be blitted normally
+    alpha = pygame.surfarray.pixels_alpha(composited)
+    colors = pygame.surfarray.pixels3d(composited)
+    visible = alpha > 0
+    visible_alpha = alpha[visible].astype(np.uint16)[:, np.newaxis]
+    colors[visible] = np.minimum((colors[visible].astype(np.uint16) * 255 + visible_alpha // 2) // visible_alpha, 255)
+    del alpha, colors
+    return composited
+
+
+def composite_blits(blits) -> tuple:
+    """
+    Composites the blits into a single surface, covering their combined area.
+    :param blits: (surface, rect) pairs, bottom first.
+    :return: The composited surface, and the area it covers in the coordinates of the blits.
+    """
+    area = blits[0][1].unionall([rect for _, rect in blits])
+    composited = composite_surfaces(area.size, [(surface, rect.move(-area.x, -area.y)) for surface, rect in blits])
+    return composited, area
+
+
+class StaticScreenCache:
+    """
+    Caches whatever static screens (menus, overlays, room screens) build from their content, usually composited surfaces.
+    Each screen has a single slot, which is rebuilt when the key of the screen changes, like when a different room is entered.
+    """
+    def __init__(self):
+        self.screens: Dict[str, tuple] = {}
+        """The cached (key, content) of each screen, keyed by the screen name."""
+
+    def get(self, name: str, key, build: Callable):
+        """
+        :param name: The name of the screen.
+        :param key: Everything the content depends on. The content is rebuilt if the key changes.
+        :param build: Builds the content of the screen.
+        :return: The cached content.
+        """
+        cached = self.screens.get(name)
+        if (cached is not None) and (cached[0] == key):
+            return cached[1]
+        content = build()
+        self.screens[name] = (key, content)
+        return content
+
+    def clear(self):
+        self.screens.clear()
+
+
+static_screen_cache = StaticScreenCache()
+
+
+def get_blit_alpha(surface_alpha: Optional[int], alpha: float) -> Optional[int]:
+    """
+    :return: The surface alpha to blit a surface with, so it's drawn with the given opacity on top of its own surface alpha.
+    """
+    if alpha >= 255:
+        return surface_alpha
+    if surface_alpha is None:
+        return int(alpha)
+    return surface_alpha * int(alpha) // 255
+
+
+class RenderTarget:
+    """
+    The surface the frame buffer draws the frame to. Drawables always draw in screen coordinates.
+    With a render scale below 1, the frame is drawn to a smaller internal surface, which is upscaled to the screen once per frame.
+    Positions are scaled on the fly, and each drawn surface is scaled once and reused for as long as the surface exists.
+    """
+    def __init__(self, screen: pygame.Surface, render_scale: float = 1):
+        if render_scale <= 0:
+            raise Exception(f"Invalid render scale: {render_scale}")
+        self.screen: pygame.Surface = screen
+        self.scale: float = render_scale
+        self.surface: pygame.Surface = screen
+        """The surface that is drawn to. The screen itself if the render scale is 1."""
+        if render_scale != 1:
+            self.surface = pygame.Surface((round(screen.get_width() * render_scale), round(screen.get_height() * render_scale))).convert()
+        self.__scaled_surfaces: weakref.WeakKeyDictionary[pygame.Surface, pygame.Surface] = weakref.WeakKeyDictionary()
+
+    def is_scaled(self) -> bool:
+        return self.surface is not self.screen
+
+    def get_rect(self) -> pygame.Rect:
+        """
+        The screen rect, in screen coordinates.
+        """
+        return self.screen.get_rect()
+
+    def blit(self, source: pygame.Surface, position, area: Optional[pygame.Rect] = None, alpha: float = 255):
+        """
+        :param alpha: The opacity the source is drawn with, from 0 to 255. Multiplied with the surface alpha of the source for this blit only,
+        so a surface shared by several drawables can be drawn faded by one of them without fading the others.
+        """
+        if alpha <= 0:
+            return
+        if not self.is_scaled():
+            if alpha >= 255:
+                self.surface.blit(source, position, area)
+                return
+            surface_alpha = source.get_alpha()
+            source.set_alpha(get_blit_alpha(surface_alpha, alpha))
+            self.surface.blit(source, position, area)
+            source.set_alpha(surface_alpha)
+            return
+        scaled_source = self.get_scaled_surface(source)
+        # The alpha may change every frame (fades), so it is copied right before blitting
+        scaled_source.set_alpha(get_blit_alpha(source.get_alpha(), alpha))
+        if area is not None:
+            area = self.scale_rect(area)
+        self.surface.blit(scaled_source, self.scale_position(position), area)
+
+    def blits(self, sequence: List[tuple]):
+        """
+        Blits a sequence of (surface, position) pairs with a single call, like pygame.Surface.blits().
+        """
+        if not self.is_scaled():
+            self.surface.blits(sequence, doreturn=False)
+            return
+        scaled_sequence = []
+        for source, position in sequence:
+            scaled_source = self.get_scaled_surface(source)
+            scaled_source.set_alpha(source.get_alpha())
+            scaled_sequence.append((scaled_source, self.scale_position(position)))
+        self.surface.blits(scaled_sequence, doreturn=False)
+
+    def fill(self, color, rect: Optional[pygame.Rect] = None):
+        if rect is not None:
+            rect = self.scale_rect(rect)
+        self.surface.fill(color, rect)
+
+    def draw_rect(self, color, rect: pygame.Rect, width: int = 0):
+        """
+        Draws a rect like pygame.draw.rect(). Outlines stay at least one pixel wide.
+        """
+        if width > 0:
+            width = max(1, round(width * self.scale))
+        pygame.draw.rect(self.surface, color, self.scale_rect(rect), width)
+
+    def get_scaled_surface(self, surface: pygame.Surface) -> pygame.Surface:
+        """
+        The surface scaled by the render scale. Cached until the surface is garbage collected, so surfaces must not be drawn onto after they have been drawn.
+        """
+        scaled_surface = self.__scaled_surfaces.get(surface)
+        if scaled_surface is None:
+            size = (round(surface.get_width() * self.scale), round(surface.get_height() * self.scale))
+            if surface.get_bitsize() >= 24 and surface.get_width() > 0 and surface.get_height() > 0:
+                scaled_surface = pygame.transform.smoothscale(surface, size)
+            else:
+                scaled_surface = pygame.transform.scale(surface, size)
+            self.__scaled_surfaces[surface] = scaled_surface
+        return scaled_surface
+
+    def scale_position(self, position) -> tuple:
+        if isinstance(position, pygame.Rect):
+            position = position.topleft
+        return round(position[0] * self.scale), round(position[1] * self.scale)
+
+    def scale_rect(self, rect) -> pygame.Rect:
+        rect = pygame.Rect(rect)
+        left, top = self.scale_position(rect.topleft)
+        right, bottom = self.scale_position(rect.bottomright)
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def upscale(self):
+        """
+        Upscales the internal surface to the screen. Does nothing if the render scale is 1.
+        """
+        if self.is_scaled():
+            pygame.transform.scale(self.surface, self.screen.get_size(), self.screen)
+
+
+class RenderCommandList:
+    """
+    Records the drawing of a frame, so it can be replayed onto a render target later, on the render thread.
+    Has the drawing methods of RenderTarget, so drawables draw into it the same way.
+    Positions and rects are copied when recorded, as the drawables keep moving while the frame waits to be replayed.
+    Surfaces are not copied: like with the scaled surface cache, a surface must not be changed after it has been drawn.
+    """
+    def __init__(self, screen_rect: pygame.Rect):
+        self.screen_rect: pygame.Rect = screen_rect
+        self.commands: List[tuple] = []
+        """The recorded RenderTarget methods and their arguments, in the order they were called."""
+
+    def get_rect(self) -> pygame.Rect:
+        return self.screen_rect.copy()
+
+    def blit(self, source: pygame.Surface, position, area: Optional[pygame.Rect] = None, alpha: float = 255):
+        if alpha <= 0:
+            return
+        if isinstance(position, pygame.Rect):
+            position = position.topleft
+        if area is not None:
+            area = pygame.Rect(area)
+        self.commands.append((RenderTarget.blit, (source, position, area, alpha)))
+
+    def blits(self, sequence: List[tuple]):
+        self.commands.append((RenderTarget.blits, (list(sequence),)))
+
+    def fill(self, color, rect: Optional[pygame.Rect] = None):
+        if rect is not None:
+            rect = pygame.Rect(rect)
+        self.commands.append((RenderTarget.fill, (color, rect)))
+
+    def draw_rect(self, color, rect: pygame.Rect, width: int = 0):
+        self.commands.append((RenderTarget.draw_rect, (color, pygame.Rect(rect), width)))
+
+    def upscale(self):
+        self.commands.append((RenderTarget.upscale, ()))
+
+    def replay(self, render_target: RenderTarget):
+        for method, arguments in self.commands:
+            method(render_target, *arguments)
+
+    def clear(self):
+        """
+        Removes the recorded commands, and releases the surfaces they reference.
+        """
+        self.commands.clear()
 
 
 class Drawable:
@@ -16,6 +296,8 @@ class Drawable:
     Not automatically added to the frame buffer.
     Optionally has a tooltip.
     """
+    __slots__ = ("drawn_surface", "rect", "draw_order", "alpha", "tooltip", "mask_tooltip_surface", "mask_version", "blocks_tooltips", "__weakref__")
+
     def __init__(self, drawn_surface: pygame.Surface, position, draw_order: int, tooltip: Optional[Drawable], mask_tooltip_surface: bool = True, blocks_tooltips: bool = False):
         self.drawn_surface: pygame.Surface = drawn_surface
         """The surface that will be drawn to the screen."""
@@ -24,25 +306,68 @@ class Drawable:
         self.rect.center = position
         self.draw_order: int = draw_order
         """The order in which this object will be drawn. Objects with a lower draw order will be drawn first."""
+        self.alpha: float = 255
+        """The opacity the drawn surface is drawn with, from 0 to 255. Applied when blitting, so the drawn surface itself is never faded and can be shared."""
         self.tooltip: Drawable = tooltip
         """The tooltip that will be shown when the mouse hovers over this object."""
         self.mask_tooltip_surface = mask_tooltip_surface
+        self.mask_version: int = 0
+        """The content version of the drawn surface. Call invalidate_mask() after drawing onto the drawn surface."""
         self.blocks_tooltips = blocks_tooltips
 
-    def draw(self, screen: pygame.Surface):
-        screen.blit(self.drawn_surface, self.rect)
+    def draw(self, screen: RenderTarget):
+        screen.blit(self.drawn_surface, self.get_surface_position(), alpha=self.alpha)
 
     def should_show_tooltip(self, mouse_pos):
         if self.rect.collidepoint(mouse_pos):
             if not self.mask_tooltip_surface:
                 return True
-            mask = pygame.mask.from_surface(self.drawn_surface)
-            pos_x = mouse_pos[0] - self.rect.x
-            pos_y = mouse_pos[1] - self.rect.y
-            if pos_x < self.drawn_surface.get_width() and pos_y < self.drawn_surface.get_height():
+            surface_x, surface_y = self.get_surface_position()
+            pos_x = mouse_pos[0] - surface_x
+            pos_y = mouse_pos[1] - surface_y
+            if 0 <= pos_x < self.drawn_surface.get_width() and 0 <= pos_y < self.drawn_surface.get_height():
+                if TOOLTIP_HIT_TEST_USE_PIXEL_ALPHA:
+                    return is_surface_pixel_set(self.drawn_surface, (pos_x, pos_y))
+                mask = mask_cache.get_mask(self.drawn_surface, self.mask_version)
                 return mask.get_at((pos_x, pos_y))
         return False
 
+    def invalidate_mask(self):
+        """
+        Discards the cached collision mask of the drawn surface.
+        Call this when the drawn surface is swapped or its content changes.
+        """
+        mask_cache.invalidate(self.drawn_surface)
+        self.mask_version += 1
+
+    def get_surface_position(self) -> tuple:
+        """
+        The screen position the drawn surface is blitted at.
+        Override this if the drawn surface overhangs the rect.
+        """
+        return self.rect.topleft
+
+    def should_draw(self) -> bool:
+        """
+        If False, the frame buffer skips this drawable.
+        """
+        return True
+
+    def get_draw_bounds(self) -> pygame.Rect:
+        """
+        The screen area this drawable may touch when drawn.
+        Override this if the draw method draws outside the rect.
+        """
+        return self.rect
+
+    def get_draw_state(self) -> tuple:
+        """
+        A hashable snapshot of everything that affects how this drawable looks.
+        Used by the frame buffer to detect which drawables have changed since the previous frame.
+        Override this if the draw method depends on more than the drawn surface.
+        """
+        return self.drawn_surface, self.drawn_surface.get_alpha(), int(self.alpha)
+
     def update_tooltip_position(self, screen: pygame.Surface, mouse_position):
         if self.tooltip is None:
             return
@@ -50,76 +375,393 @@ class Drawable:
         self.tooltip.rect.clamp_ip(screen.get_rect())
 
 
+class DrawLayer:
+    """
+    The drawables of a single draw order.
+    Retained drawables stay in the layer until removed, transient drawables are cleared at the end of each frame.
+    Retained drawables are drawn before the transient ones.
+    """
+    def __init__(self, draw_order: int):
+        self.draw_order: int = draw_order
+        self.retained_drawables: Dict[Drawable, None] = {}
+        """The retained drawables, in insertion order. A dict is used to allow removing drawables in constant time."""
+        self.transient_drawables: List[Drawable] = []
+
+
 class FrameBuffer:
     """
     A buffer that stores drawables and draws them in order based on their draw order attribute.
-    The buffer is cleared at the end of each frame.
+    Drawables are kept in layers, one per draw order, so no sorting is needed when drawing.
+    Retained drawables (game objects) are added once and stay until removed.
+    Transient drawables (draw calls) are cleared at the end of each frame.
+    In dirty rect mode only the screen regions that changed since the previous frame are redrawn and presented.
+    With a render scale below 1, the frame is drawn at a lower resolution and upscaled, see RenderTarget.
+    With the render thread, the frame is recorded into a command list and drawn on the render thread while the next frame is updated, see RenderThread.
+    Two command lists are used in turns: one is recorded while the other is replayed. A frame is shown one frame after it was recorded.
     """
-    def __init__(self, screen: pygame.Surface):
+    FULL_REDRAW_AREA_RATIO = 0.75
+    """In dirty rect mode, if the dirty area covers more than this ratio of the screen, the whole screen is redrawn instead."""
+
+    def __init__(self, screen: pygame.Surface, use_dirty_rects: bool = False, render_scale: float = 1, use_render_thread: bool = False):
         self.screen = screen
-        self.drawables: list[Drawable] = []
+        self.render_target: RenderTarget = RenderTarget(screen, render_scale)
+        """What the frame is drawn to. With the render thread, only drawn to by the render thread."""
+        self.use_render_thread: bool = use_render_thread
+        """If True, the frame is drawn on the render thread, while the next frame is updated."""
+        self.__recorded_commands: RenderCommandList = RenderCommandList(screen.get_rect())
+        """The commands of the frame being recorded. Only used with the render thread."""
+        self.__submitted_commands: RenderCommandList = RenderCommandList(screen.get_rect())
+        """The commands of the frame submitted to the render thread. Only used with the render thread."""
+        self.__draw_target: Union[RenderTarget, RenderCommandList] = self.__recorded_commands if use_render_thread else self.render_target
+        """What the drawables are drawn to."""
+        self.layers: Dict[int, DrawLayer] = {}
+        self.sorted_layers: List[DrawLayer] = []
+        """The layers, sorted by their draw order."""
+        self.drawables: List[Drawable] = []
+        """The drawables drawn this frame, in the order they were drawn. Refilled every frame."""
+        self.culled_count: int = 0
+        """The number of drawables skipped this frame, as they were entirely off the screen."""
+        self.hover_index: HoverIndex = HoverIndex(screen.get_rect())
+        """Finds the drawables under the mouse. Shared by the tooltips, target selection and debug picking."""
+        # The scaled frame is always redrawn whole: rounding the scaled positions would leave seams around the redrawn regions.
+        # With the render thread, the screen is a frame behind the recorded frame, so the dirty regions wouldn't match it.
+        self.use_dirty_rects: bool = use_dirty_rects and not self.render_target.is_scaled() and not use_render_thread
+        """If True, only the changed regions of the screen are redrawn and presented."""
+        self.background: Optional[pygame.Surface] = None
+        """The surface used to restore the screen behind changed drawables. Only used in dirty rect mode."""
+        self.dirty_rects: List[pygame.Rect] = []
+        """The screen regions that were redrawn this frame, and should be presented."""
+        self.__previous_draw_states: Counter = Counter()
+        self.__needs_full_redraw: bool = True
+        self.__simple_blit_types: Dict[type, bool] = {}
 
     def add_drawable(self, drawable: Drawable):
-        self.drawables.append(drawable)
+        """
+        Adds a drawable to be drawn this frame only.
+        """
+        self.__get_layer(drawable.draw_order).transient_drawables.append(drawable)
+
+    def add_retained_drawable(self, drawable: Drawable):
+        """
+        Adds a drawable to be drawn every frame, until removed with remove_retained_drawable().
+        If the draw order of the drawable changes, it has to be removed and added again.
+        """
+        self.__get_layer(drawable.draw_order).retained_drawables[drawable] = None
+
+    def remove_retained_drawable(self, drawable: Drawable):
+        layer = self.layers.get(drawable.draw_order)
+        if layer is not None:
+            layer.retained_drawables.pop(drawable, None)
+
+    def __get_layer(self, draw_order: int) -> DrawLayer:
+        layer = self.layers.get(draw_order)
+        if layer is None:
+            layer = DrawLayer(draw_order)
+            self.layers[draw_order] = layer
+            # New layers are rare, so a linear insert is fine
+            index = 0
+            while index < len(self.sorted_layers) and self.sorted_layers[index].draw_order < draw_order:
+                index += 1
+            self.sorted_layers.insert(index, layer)
+        return layer
+
+    def set_background(self, background: Optional[pygame.Surface]):
+        if background is not self.background:
+            self.background = background
+            self.invalidate()
+
+    def invalidate(self):
+        """
+        Forces the whole screen to be presented this frame, and redrawn the next frame.
+        Call this after drawing directly to the screen, bypassing the frame buffer.
+        """
+        self.__needs_full_redraw = True
+        self.dirty_rects = [self.screen.get_rect()]
 
     def draw(self):
-        # Sort the drawables based on their draw order attribute
-        sorted_drawables = sorted(self.drawables, key=lambda d: d.draw_order)
+        if self.use_render_thread:
+            self.__recorded_commands.clear()
+
+        # Walk the layers in draw order. Drawables entirely off the screen are culled before they are drawn or hit tested.
+        self.drawables.clear()
+        self.culled_count = 0
+        screen_rect = self.screen.get_rect()
+        for layer in self.sorted_layers:
+            for drawable in layer.retained_drawables:
+                if drawable.should_draw():
+                    self.__add_visible_drawable(drawable, screen_rect)
+            for drawable in layer.transient_drawables:
+                self.__add_visible_drawable(drawable, screen_rect)
 
-        for drawable in sorted_drawables:
-            drawable.draw(self.screen)
+        self.hover_index.update(self.drawables)
 
         mouse_pos = Inputs.get_mouse_position()
-        # Reverse the list so that the drawables with the highest draw order are checked first.
-        for drawable in reversed(sorted_drawables):
-            if self.__draw_object_tooltip(drawable, mouse_pos):
+        shown_tooltips = self.__get_shown_tooltips(mouse_pos)
+
+        if self.use_dirty_rects:
+            self.__draw_dirty_regions(self.drawables + shown_tooltips)
+            return
+
+        self.__restore_background(self.screen.get_rect())
+
+        self.__draw_drawables(self.drawables)
+        self.__draw_drawables(shown_tooltips)
+
+        self.__draw_target.upscale()
+
+    def __add_visible_drawable(self, drawable: Drawable, screen_rect: pygame.Rect):
+        if screen_rect.colliderect(drawable.get_draw_bounds()):
+            self.drawables.append(drawable)
+        else:
+            self.culled_count += 1
+
+    def present(self):
+        """
+        Presents the drawn frame on the display.
+        With the render thread, presents the previous frame instead, and submits the drawn frame to the render thread.
+        """
+        if self.use_render_thread:
+            render_thread.wait()
+            pygame.display.flip()
+            if self.__recorded_commands.commands:
+                self.__recorded_commands, self.__submitted_commands = self.__submitted_commands, self.__recorded_commands
+                self.__draw_target = self.__recorded_commands
+                render_thread.submit(self.__submitted_commands, self.render_target)
+            return
+        if self.use_dirty_rects:
+            pygame.display.update(self.dirty_rects)
+        else:
+            pygame.display.flip()
+
+    def flush(self):
+        """
+        With the render thread, waits for the submitted frame to be drawn, and presents it without waiting for the next present().
+        Call this before pausing, so the latest frame isn't left undisplayed.
+        """
+        if self.use_render_thread:
+            render_thread.wait()
+            pygame.display.flip()
+
+    def synchronize(self):
+        """
+        With the render thread, waits for the submitted frame to be drawn, and draws the recorded frame right away.
+        Afterward the screen holds the latest drawn frame, like without the render thread.
+        Call this before drawing directly to the screen, bypassing the frame buffer.
+        """
+        if not self.use_render_thread:
+            return
+        render_thread.wait()
+        self.__recorded_commands.replay(self.render_target)
+        self.__recorded_commands.clear()
+
+    def __get_shown_tooltips(self, mouse_pos) -> List[Drawable]:
+        """
+        :param mouse_pos: The mouse position.
+        :return: The tooltips that should be shown this frame, in the order they should be drawn.
+        """
+        shown_tooltips = []
+        # The hovered drawables are sorted so that the drawables with the highest draw order are checked first.
+        for drawable in self.hover_index.get_hovered_drawables(mouse_pos):
+            if self.__collect_object_tooltip(drawable, mouse_pos, shown_tooltips):
                 break
+        return shown_tooltips
 
-    def __draw_object_tooltip(self, drawable: Drawable, mouse_pos) -> bool:
+    def __collect_object_tooltip(self, drawable: Drawable, mouse_pos, shown_tooltips: List[Drawable]) -> bool:
         """
-        Call the draw method of the tooltip.
+        Add the tooltip of the drawable to the shown tooltips.
         Recursively repeat until the tooltip has no tooltip.
-        :param drawable: The drawable to draw the tooltip for.
+        :param drawable: The drawable to collect the tooltip for.
         :param mouse_pos: The mouse position.
+        :param shown_tooltips: The list the shown tooltips are added to.
         :return: True if the mouse collided with the drawable's rect.
         """
-        drawable.update_tooltip_position(self.screen, mouse_pos)
         if drawable.should_show_tooltip(mouse_pos):
+            # Positioned after should_show_tooltip(), as drawables may pick their tooltip there
+            drawable.update_tooltip_position(self.screen, mouse_pos)
             if drawable.tooltip is None:
                 if drawable.blocks_tooltips:
                     return True
                 return False
-            drawable.tooltip.draw(self.screen)
-            self.__draw_object_tooltip(drawable.tooltip, mouse_pos)
+            shown_tooltips.append(drawable.tooltip)
+            self.__collect_object_tooltip(drawable.tooltip, mouse_pos, shown_tooltips)
             return True
         return False
 
+    def __draw_dirty_regions(self, drawables: List[Drawable]):
+        """
+        Redraws only the regions of the screen where a drawable appeared, disappeared or changed since the previous frame.
+        :param drawables: All drawables of this frame, in the order they should be drawn.
+        """
+        screen_rect = self.screen.get_rect()
+        drawn_bounds = [drawable.get_draw_bounds().clip(screen_rect) for drawable in drawables]
+        current_draw_states = Counter((tuple(bounds), drawable.get_draw_state()) for drawable, bounds in zip(drawables, drawn_bounds))
+
+        if not self.__needs_full_redraw:
+            changed_draw_states = (current_draw_states - self.__previous_draw_states) + (self.__previous_draw_states - current_draw_states)
+            self.dirty_rects = self.__grow_dirty_rects([pygame.Rect(bounds) for bounds, _ in changed_draw_states], drawn_bounds, screen_rect)
+            dirty_area = sum(rect.width * rect.height for rect in self.dirty_rects)
+            if dirty_area > screen_rect.width * screen_rect.height * self.FULL_REDRAW_AREA_RATIO:
+                self.__needs_full_redraw = True
+
+        if self.__needs_full_redraw:
+            self.dirty_rects = [screen_rect]
+
+        for dirty_rect in self.dirty_rects:
+            self.__restore_background(dirty_rect)
+        self.__draw_drawables([drawable for drawable, bounds in zip(drawables, drawn_bounds) if bounds.collidelist(self.dirty_rects) != -1])
+
+        self.__previous_draw_states = current_draw_states
+        self.__needs_full_redraw = False
+
+    def __draw_drawables(self, drawables: List[Drawable]):
+        """
+        Draws the drawables in order. Consecutive opaque drawables that only blit their drawn surface are batched into a single blits() call.
+        """
+        blit_sequence = []
+        for drawable in drawables:
+            if (drawable.alpha >= 255) and self.__is_simple_blit(type(drawable)):
+                blit_sequence.append((drawable.drawn_surface, drawable.rect.topleft))
+                continue
+            if blit_sequence:
+                self.__draw_target.blits(blit_sequence)
+                blit_sequence = []
+            drawable.draw(self.__draw_target)
+        if blit_sequence:
+            self.__draw_target.blits(blit_sequence)
+
+    def __is_simple_blit(self, drawable_type: type) -> bool:
+        """
+        If the drawables of the type are drawn by blitting the drawn surface at the rect, without overriding draw() or get_surface_position().
+        """
+        is_simple_blit = self.__simple_blit_types.get(drawable_type)
+        if is_simple_blit is None:
+            is_simple_blit = (drawable_type.draw is Drawable.draw) and (drawable_type.get_surface_position is Drawable.get_surface_position)
+            self.__simple_blit_types[drawable_type] = is_simple_blit
+        return is_simple_blit
+
+    @staticmethod
+    def __grow_dirty_rects(changed_rects: List[pygame.Rect], drawn_bounds: List[pygame.Rect], screen_rect: pygame.Rect) -> List[pygame.Rect]:
+        """
+        Grows the dirty rects until they fully contain every drawable they touch.
+        Touched drawables are redrawn whole, so the areas they cover have to be restored and redrawn too.
+        Clipping the drawing to the dirty rects instead would not work, as pygame.draw outlines clipped shapes along the clip edge.
+        """
+        dirty_rects = merge_overlapping_rects(changed_rects, screen_rect)
+        has_grown = True
+        while has_grown and dirty_rects:
+            has_grown = False
+            for bounds in drawn_bounds:
+                if bounds.collidelist(dirty_rects) == -1:
+                    continue
+                if any(dirty_rect.contains(bounds) for dirty_rect in dirty_rects):
+                    continue
+                dirty_rects = merge_overlapping_rects(dirty_rects + [bounds], screen_rect)
+                has_grown = True
+        return dirty_rects
+
+    def __restore_background(self, rect: pygame.Rect):
+        if self.background is None:
+            self.__draw_target.fill("black", rect)
+        else:
+            self.__draw_target.blit(self.background, rect, rect)
+
     def clear(self):
-        self.drawables.clear()
+        """
+        Clears the transient drawables. Retained drawables are kept.
+        """
+        for layer in self.sorted_layers:
+            layer.transient_drawables.clear()
 
 
 class TextTooltip(Drawable):
     """
     A tooltip that displays multiple lines of text.
+    The tooltip surface is only rendered the first time the tooltip is drawn.
+    Use get_text_tooltip() instead of creating tooltips directly, so identical tooltips are shared.
     """
+    TEXT_PADDING = 5
+    TEXT_SPACING = 5
+
     def __init__(self, text_lines: List[str]):
-        self.TEXT_PADDING = 5
-        self.TEXT_SPACING = 5
         self.text_lines = text_lines
-        self.text_surfaces = [FONT_TOOLTIP_GENERIC.render(line, True, (255, 255, 255)) for line in self.text_lines]
-        self.width = max([surface.get_width() for surface in self.text_surfaces]) + self.TEXT_PADDING * 2
-        self.height = sum([surface.get_height() for surface in self.text_surfaces]) + self.TEXT_SPACING * (len(self.text_surfaces) - 1) + self.TEXT_PADDING * 2
-        self.__surface: Optional[pygame.Surface] = pygame.Surface((self.width, self.height))
-        self.__surface.set_alpha(200)
-        super().__init__(self.__surface, (0, 0), LAYER_OVERRIDE_FG, None)
+        line_sizes = [FONT_TOOLTIP_GENERIC.size(line) for line in self.text_lines]
+        self.width = max([width for width, _ in line_sizes]) + self.TEXT_PADDING * 2
+        self.height = sum([height for _, height in line_sizes]) + self.TEXT_SPACING * (len(line_sizes) - 1) + self.TEXT_PADDING * 2
+        self.is_rendered: bool = False
+        """If the tooltip surface has been rendered. Until then, the drawn surface is an empty placeholder."""
+        super().__init__(pygame.Surface((0, 0)), (0, 0), LAYER_OVERRIDE_FG, None, mask_tooltip_surface=False)
+        self.rect = pygame.Rect(0, 0, self.width, self.height)
+
+    def draw(self, screen: RenderTarget):
+        self.__render()
+        super().draw(screen)
+
+    def get_draw_state(self) -> tuple:
+        self.__render()
+        return super().get_draw_state()
+
+    def __render(self):
+        if self.is_rendered:
+            return
+        self.is_rendered = True
+        surface = pygame.Surface((self.width, self.height))
+        surface.set_alpha(200)
         # Draw tooltip background
-        self.__surface.fill((80, 80, 80))
+        surface.fill((80, 80, 80))
         # Draw tooltip bounds
         rect = pygame.Rect(0, 0, self.width, self.height)
-        pygame.draw.rect(self.__surface, (255, 255, 255), rect, 1)
-        # Draw tooltip text
-        for i, surface in enumerate(self.text_surfaces):
-            self.__surface.blit(surface, (self.TEXT_PADDING, self.TEXT_PADDING + i * (surface.get_height() + self.TEXT_SPACING)))
+        pygame.draw.rect(surface, (255, 255, 255), rect, 1)
+        # Draw tooltip text. The cached text surfaces may be blitted by the render thread at the same time.
+        with render_thread.surface_lock:
+            for i, line in enumerate(self.text_lines):
+                text_surface = render_text(FONT_TOOLTIP_GENERIC, line, True, (255, 255, 255))
+                surface.blit(text_surface, (self.TEXT_PADDING, self.TEXT_PADDING + i * (text_surface.get_height() + self.TEXT_SPACING)))
+        self.drawn_surface = surface
+
+
+class TextTooltipCache:
+    """
+    A least-recently-used cache of text tooltips, keyed by their lines.
+    Some tooltips show changing values (like damage or health), so the cache is bounded. Evicted tooltips keep working for whoever still uses them.
+    """
+    def __init__(self, max_size: int):
+        self.max_size: int = max_size
+        self.tooltips: OrderedDict[tuple, TextTooltip] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def get(self, text_lines: List[str]) -> TextTooltip:
+        key = tuple(text_lines)
+        tooltip = self.tooltips.get(key)
+        if tooltip is not None:
+            self.tooltips.move_to_end(key)
+            self.hits += 1
+            return tooltip
+        self.misses += 1
+        tooltip = TextTooltip(list(text_lines))
+        self.tooltips[key] = tooltip
+        if len(self.tooltips) > self.max_size:
+            self.tooltips.popitem(last=False)
+        return tooltip
+
+    def get_hit_rate(self) -> float:
+        total = self.hits + self.misses
+        if total == 0:
+            return 0
+        return self.hits / total
+
+    def clear(self):
+        self.tooltips.clear()
+
+
+text_tooltip_cache = TextTooltipCache(TEXT_TOOLTIP_CACHE_MAX_SIZE)
+
+
+def get_text_tooltip(text_lines: List[str]) -> TextTooltip:
+    """
+    Gets the shared tooltip for the lines from the tooltip cache, creating it if needed.
+    """
+    return text_tooltip_cache.get(text_lines)
 
 
 class DrawCall(Drawable):
@@ -128,7 +770,10 @@ class DrawCall(Drawable):
     Useful for drawing sprites that are not GameObjects.
     Call queue() to automatically add the draw call to the frame buffer.
     """
-    def __init__(self, image: pygame.Surface, position_or_rect, draw_order: int, tooltip_text_lines: List[str] = None, mask_tooltip_surface: bool = True, blocks_tooltips: bool = False):
+    __slots__ = ("image", "frame_buffer", "position")
+
+    def __init__(self, image: pygame.Surface, position_or_rect, draw_order: int, tooltip_text_lines: List[str] = None, mask_tooltip_surface: bool = True, blocks_tooltips: bool = False,
+                 alpha: float = 255):
         self.image = image
         self.draw_order = draw_order
         self.frame_buffer: Optional[FrameBuffer] = None
@@ -137,9 +782,10 @@ class DrawCall(Drawable):
         else:
             self.position = position_or_rect
         if (tooltip_text_lines is not None) and len(tooltip_text_lines) > 0:
-            super().__init__(image, self.position, draw_order, TextTooltip(tooltip_text_lines), mask_tooltip_surface, blocks_tooltips)
+            super().__init__(image, self.position, draw_order, get_text_tooltip(tooltip_text_lines), mask_tooltip_surface, blocks_tooltips)
         else:
             super().__init__(image, self.position, draw_order, None, mask_tooltip_surface=mask_tooltip_surface, blocks_tooltips=blocks_tooltips)
+        self.alpha = alpha
 
     def queue(self, frame_buffer: FrameBuffer):
         self.frame_buffer = frame_buffer
@@ -150,27 +796,52 @@ class DrawCall(Drawable):
         return should
 
 
+button_surfaces: Dict[tuple, tuple] = {}
+"""The composited button surfaces and their offsets from the button rect, keyed by the button size, text and colors."""
+
+
+def get_button_surface(size, text: str, button_color: tuple, text_color: tuple) -> tuple:
+    """
+    :return: The composited button surface, and its offset from the top left corner of the button. Texts wider than the button overhang it.
+    """
+    key = (tuple(size), text, button_color, text_color)
+    button = button_surfaces.get(key)
+    if button is None:
+        button_background = pygame.Surface(size)
+        button_background.fill(button_color)
+        text_surface = render_text(FONT_BUTTON_GENERIC, text, True, text_color)
+        text_rect = text_surface.get_rect(center=button_background.get_rect().center)
+        button_surface, area = composite_blits([(button_background, button_background.get_rect()), (text_surface, text_rect)])
+        button = (button_surface, area.topleft)
+        button_surfaces[key] = button
+    return button
+
+
 def draw_button(frame_buffer, text: str, button_rect: pygame.Rect, button_color: tuple, text_color: tuple, tooltip_text_lines=None):
-    # Create the button sprite
-    button_surface = pygame.Surface((button_rect.width, button_rect.height))
-    button_surface.fill(button_color)
-
-    # Create the button text
-    text_surface = FONT_BUTTON_GENERIC.render(text, True, text_color)
-
-    # Calculate button and text positions
-    text_rect = text_surface.get_rect()
-    text_rect.center = button_rect.center
-
-    if tooltip_text_lines:
-        DrawCall(button_surface, button_rect, LAYER_OVERRIDE_BG, tooltip_text_lines).queue(frame_buffer)
-        DrawCall(text_surface, text_rect, LAYER_OVERRIDE_BG).queue(frame_buffer)
-    else:
-        DrawCall(button_surface, button_rect, LAYER_OVERRIDE_BG).queue(frame_buffer)
-        DrawCall(text_surface, text_rect, LAYER_OVERRIDE_BG).queue(frame_buffer)
+    button_surface, offset = get_button_surface(button_rect.size, text, button_color, text_color)
+    button_surface_rect = button_surface.get_rect(topleft=(button_rect.x + offset[0], button_rect.y + offset[1]))
+    DrawCall(button_surface, button_surface_rect, LAYER_OVERRIDE_BG, tooltip_text_lines).queue(frame_buffer)
     return button_rect
 
 
+def merge_overlapping_rects(rects: List[pygame.Rect], bounds: pygame.Rect) -> List[pygame.Rect]:
+    """
+    Clips the rects to the bounds, and merges the overlapping ones together.
+    :return: A list of non-overlapping rects covering the same area as the given rects.
+    """
+    merged_rects: List[pygame.Rect] = []
+    for rect in rects:
+        rect = rect.clip(bounds)
+        if rect.width == 0 or rect.height == 0:
+            continue
+        index = rect.collidelist(merged_rects)
+        while index != -1:
+            rect.union_ip(merged_rects.pop(index))
+            index = rect.collidelist(merged_rects)
+        merged_rects.append(rect)
+    return merged_rects
+
+
 def is_rect_clicked(rect: pygame.Rect):
     if Inputs.is_mouse_button_up(1):
         if rect.collidepoint(Inputs.get_mouse_position()):
@@ -4,6 +4,7 @@ import pygame
 class Inputs:
     """
     Used to keep track of all the global inputs in the game.
+    Only used on the main thread. The render thread never reads inputs: anything drawn that depends on them, like tooltips, is decided while the frame is recorded.
     """
     def __init__(self):
         self.quit = False
@@ -15,6 +16,10 @@ class Inputs:
         self.keys_up = set()
         self.keys_down = set()
         self.unicode: str = ""
+        self.event_count: int = 0
+        """The number of events handled this frame."""
+        self.woken_event = None
+        """The event that ended wait_for_event(). It was taken from the front of the queue, so it is handled before the queued events."""
 
     @staticmethod
     def is_key_down(key):
@@ -52,6 +57,24 @@ class Inputs:
     def get_unicode():
         return global_inputs.unicode
 
+    @staticmethod
+    def has_events_this_frame() -> bool:
+        return global_inputs.event_count > 0
+
+    @staticmethod
+    def wait_for_event(timeout: float) -> bool:
+        """
+        Blocks until an event arrives, or the timeout passes. The event is kept for handle_input_events().
+        :param timeout: The maximum time to wait, in seconds.
+        :return: True if an event arrived.
+        """
+        event = pygame.event.wait(int(timeout * 1000))
+        if event.type == pygame.NOEVENT:
+            return False
+        # Posting the event back would put it behind the events that arrived with it, like a click behind its mouse motion
+        global_inputs.woken_event = event
+        return True
+
     @staticmethod
     def handle_input_events():
         global_inputs.keys_up.clear()
@@ -59,8 +82,14 @@ class Inputs:
         global_inputs.keys_pressed_this_frame.clear()
         global_inputs.mouse_buttons_pressed_this_frame.clear()
         global_inputs.unicode = ""
+        global_inputs.event_count = 0
 
-        for event in pygame.event.get():
+        events = pygame.event.get()
+        if global_inputs.woken_event is not None:
+            events.insert(0, global_inputs.woken_event)
+            global_inputs.woken_event = None
+        for event in events:
+            global_inputs.event_count += 1
             if event.type == pygame.QUIT:
                 global_inputs.quit = True
             elif event.type == pygame.KEYDOWN:
@@ -5,6 +5,8 @@ from typing import TYPE_CHECKING
 
 import pygame
 
+from utils.atlas import sprite_atlas, initialize_sprite_atlas
+
 if TYPE_CHECKING:
     from typing import List
 
@@ -31,6 +33,17 @@ def load_image(path, convert_alpha=True):
         raise SystemExit(f"Error loading image @ {path}: {str(e)}")
 
 
+def load_sprite(path) -> pygame.Surface:
+    """
+    Loads a sprite from the sprite atlas, or from its own file if it is not packed in the atlas.
+    Atlas sprites are shared subsurfaces, so they must not be drawn on.
+    """
+    sprite = sprite_atlas.get_sprite(path)
+    if sprite is None:
+        return load_image(path)
+    return sprite
+
+
 def load_sound(filename):
     sound = pygame.mixer.Sound(filename)
     return sound
@@ -46,32 +59,34 @@ def get_sounds_in_directory(folder_path):
 
 class ImageLibrary:
     def __init__(self):
+        initialize_sprite_atlas()
+
         # UI
-        self.icon_level: pygame.Surface = load_image("Content/Sprites/UI/icon_level.png")
-        self.icon_draw_pile: pygame.Surface = load_image("Content/Sprites/UI/icon_draw_pile.png")
-        self.icon_discard_pile: pygame.Surface = load_image("Content/Sprites/UI/icon_discard_pile.png")
-        self.icon_target: pygame.Surface = load_image("Content/Sprites/UI/icon_target.png")
-        self.icon_mana: pygame.Surface = load_image("Content/Sprites/UI/icon_mana.png")
-        self.icon_block: pygame.Surface = load_image("Content/Sprites/UI/icon_block.png")
-        self.icon_health: pygame.Surface = load_image("Content/Sprites/UI/icon_health.png")
+        self.icon_level: pygame.Surface = load_sprite("Content/Sprites/UI/icon_level.png")
+        self.icon_draw_pile: pygame.Surface = load_sprite("Content/Sprites/UI/icon_draw_pile.png")
+        self.icon_discard_pile: pygame.Surface = load_sprite("Content/Sprites/UI/icon_discard_pile.png")
+        self.icon_target: pygame.Surface = load_sprite("Content/Sprites/UI/icon_target.png")
+        self.icon_mana: pygame.Surface = load_sprite("Content/Sprites/UI/icon_mana.png")
+        self.icon_block: pygame.Surface = load_sprite("Content/Sprites/UI/icon_block.png")
+        self.icon_health: pygame.Surface = load_sprite("Content/Sprites/UI/icon_health.png")
         # Intention icons
-        self.icon_intention_negative: pygame.Surface = load_image("Content/Sprites/UI/icon_intention_negative.png")
-        self.icon_intention_block: pygame.Surface = load_image("Content/Sprites/UI/icon_intention_block.png")
-        self.icon_intention_buff: pygame.Surface = load_image("Content/Sprites/UI/icon_intention_buff.png")
-        self.icon_intention_unknown: pygame.Surface = load_image("Content/Sprites/UI/icon_intention_unknown.png")
-        self.icon_intention_damage_low: pygame.Surface = load_image("Content/Sprites/UI/icon_intention_damage_low.png")
-        self.icon_intention_damage_medium: pygame.Surface = load_image("Content/Sprites/UI/icon_intention_damage_medium.png")
-        self.icon_intention_damage_high: pygame.Surface = load_image("Content/Sprites/UI/icon_intention_damage_high.png")
-        self.icon_intention_damage_veryhigh: pygame.Surface = load_image("Content/Sprites/UI/icon_intention_damage_veryhigh.png")
-        self.icon_intention_die: pygame.Surface = load_image("Content/Sprites/UI/icon_intention_die.png")
+        self.icon_intention_negative: pygame.Surface = load_sprite("Content/Sprites/UI/icon_intention_negative.png")
+        self.icon_intention_block: pygame.Surface = load_sprite("Content/Sprites/UI/icon_intention_block.png")
+        self.icon_intention_buff: pygame.Surface = load_sprite("Content/Sprites/UI/icon_intention_buff.png")
+        self.icon_intention_unknown: pygame.Surface = load_sprite("Content/Sprites/UI/icon_intention_unknown.png")
+        self.icon_intention_damage_low: pygame.Surface = load_sprite("Content/Sprites/UI/icon_intention_damage_low.png")
+        self.icon_intention_damage_medium: pygame.Surface = load_sprite("Content/Sprites/UI/icon_intention_damage_medium.png")
+        self.icon_intention_damage_high: pygame.Surface = load_sprite("Content/Sprites/UI/icon_intention_damage_high.png")
+        self.icon_intention_damage_veryhigh: pygame.Surface = load_sprite("Content/Sprites/UI/icon_intention_damage_veryhigh.png")
+        self.icon_intention_die: pygame.Surface = load_sprite("Content/Sprites/UI/icon_intention_die.png")
 
         # Effects
-        self.effect_damaged_self: pygame.Surface = load_image("Content/Sprites/Effects/effect_damaged_self.png")
+        self.effect_damaged_self: pygame.Surface = load_sprite("Content/Sprites/Effects/effect_damaged_self.png")
         self.slash_effects_list: List[pygame.Surface] = [
-            load_image("Content/Sprites/Effects/effect_slash_1.png"),
-            load_image("Content/Sprites/Effects/effect_slash_2.png"),
-            load_image("Content/Sprites/Effects/effect_slash_3.png"),
-            load_image("Content/Sprites/Effects/effect_slash_4.png")
+            load_sprite("Content/Sprites/Effects/effect_slash_1.png"),
+            load_sprite("Content/Sprites/Effects/effect_slash_2.png"),
+            load_sprite("Content/Sprites/Effects/effect_slash_3.png"),
+            load_sprite("Content/Sprites/Effects/effect_slash_4.png")
         ]
 
     def get_damage_icon_from_damage_amount(self, damage: int) -> pygame.Surface:
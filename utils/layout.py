@@ -15,6 +15,10 @@ from utils.input import Inputs
 
 class GridLayout:
     PADDING = 10
+    SETTLE_FRACTION = 0.1
+    """The fraction of the remaining distance to its place an item moves every SETTLE_INTERVAL seconds."""
+    SETTLE_INTERVAL = 1 / 60
+    """The frame time the layout was tuned at, back when items were moved once per frame."""
 
     def __init__(self, item_size, max_horizontal_items):
         self.item_size = item_size
@@ -22,6 +26,8 @@ class GridLayout:
         self.item_reposition_funcs = {}
         self.scroll_offset = 0
         self.scroll_tween: Optional[animations.Tween] = None
+        self.is_moving: bool = False
+        """If any item moved during the last update."""
 
     def add_item(self, game_object, reposition_func):
         self.item_reposition_funcs[game_object] = reposition_func
@@ -34,11 +40,12 @@ class GridLayout:
 
     def update(self, delta_time):
         if self.scroll_tween is not None:
-            self.scroll_tween.update(delta_time)
             if self.scroll_tween.is_finished:
                 self.scroll_tween = None
-        self.__handle_scroll()
         x, y = self.PADDING, self.PADDING
+        self.is_moving = self.scroll_tween is not None
+        # Scaled by the time step, so the items settle at the same speed regardless of the simulation step length
+        settle_fraction = 1 - (1 - self.SETTLE_FRACTION) ** (delta_time / self.SETTLE_INTERVAL)
 
         for index, reposition_func in enumerate(self.item_reposition_funcs.values()):
             setter, getter = reposition_func
@@ -47,27 +54,40 @@ class GridLayout:
 
             # Adjust position for scrolling
             item_y += self.scroll_offset
-            target = math.lerp_tuple(getter(), (item_x, item_y), 0.1)
+            position = getter()
+            target = math.lerp_tuple(position, (item_x, item_y), settle_fraction)
             setter(target)
+            # Positions are rounded when set, so items settle a few pixels short of their target
+            if getter() != position:
+                self.is_moving = True
 
     def __get_max_scroll_offset(self):
         return max(0, ceil_div(len(self.item_reposition_funcs), self.max_horizontal_items) * (self.item_size[1] + self.PADDING) - 600)
 
-    def __handle_scroll(self):
+    def handle_scroll_input(self):
+        """
+        Starts scrolling on mouse wheel input. Called once per frame, while update() is called once per simulation step.
+        """
         if Inputs.is_mouse_button_pressed(pygame.BUTTON_WHEELUP):
-            self.scroll_tween = animations.Tween(
+            self.__play_scroll_tween(animations.Tween(
                 self.scroll_offset,
                 self.scroll_offset + 100,
                 0.1,
                 self.__update_scroll_offset
-            )
+            ))
         elif Inputs.is_mouse_button_pressed(pygame.BUTTON_WHEELDOWN):
-            self.scroll_tween = animations.Tween(
+            self.__play_scroll_tween(animations.Tween(
                 self.scroll_offset,
                 self.scroll_offset - 100,
                 0.1,
                 self.__update_scroll_offset
-            )
+            ))
+
+    def __play_scroll_tween(self, tween: animations.Tween):
+        if self.scroll_tween is not None:
+            animations.tween_scheduler.stop_tween(self.scroll_tween)
+        self.scroll_tween = tween
+        animations.tween_scheduler.play_tween(tween)
 
     def __update_scroll_offset(self, new_offset):
         self.scroll_offset = new_offset
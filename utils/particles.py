@@ -0,0 +1,186 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pygame
+
+from utils.drawing import Drawable, RenderTarget
+from utils.render_thread import render_thread
+
+if TYPE_CHECKING:
+    from typing import List, Dict
+
+
+class ParticleSystem(Drawable):
+    """
+    Simulates and draws short-lived sprites, such as hit effects and floating damage numbers, as a single drawable.
+    The positions, lifetimes and alphas of the particles are stored in NumPy arrays, one row per particle, and advanced in one vectorised step.
+    Each particle fades out over its lifetime, and can rise while swaying sideways. All particles are drawn with a single Surface.blits() call.
+    Every particle draws a copy of its source surface, so fading one particle doesn't fade others drawing the same sprite.
+    """
+    INITIAL_CAPACITY = 64
+    SWAY_WAVELENGTH = 20
+    """How many pixels a particle rises for each radian of its sideways sway."""
+    MAX_FREE_SURFACES = 64
+    """The maximum number of surface copies kept for reuse, per source surface."""
+
+    def __init__(self, draw_order: int):
+        super().__init__(pygame.Surface((0, 0)), (0, 0), draw_order, None)
+        capacity = self.INITIAL_CAPACITY
+        self.origins: np.ndarray = np.zeros((capacity, 2))
+        """The center of each particle when it was emitted."""
+        self.rises: np.ndarray = np.zeros(capacity)
+        """How many pixels each particle moves up over its lifetime."""
+        self.sway_amplitudes: np.ndarray = np.zeros(capacity)
+        """How many pixels each particle sways sideways while rising."""
+        self.elapsed_times: np.ndarray = np.zeros(capacity)
+        self.lifetimes: np.ndarray = np.zeros(capacity)
+        self.sizes: np.ndarray = np.zeros((capacity, 2), np.int64)
+        self.applied_alphas: np.ndarray = np.zeros(capacity, np.int64)
+        """The alpha last set on the surface of each particle, or -1 if it hasn't been drawn yet."""
+        self.particle_count: int = 0
+        """The number of live particles. They occupy the first rows of the arrays, in the order they were emitted."""
+        self.surfaces: List[pygame.Surface] = []
+        """The surface copy drawn by each particle."""
+        self.source_surfaces: List[pygame.Surface] = []
+        """The surface each particle's copy was made from. The copies are reused for new particles of the same source."""
+        self.version: int = 0
+        """Changes every time the particles change. Used as the draw state, so the frame buffer redraws the particles when they move or fade."""
+        self.__free_surfaces: Dict[pygame.Surface, List[pygame.Surface]] = {}
+        self.__prepared_version: int = -1
+        self.__blit_sequence: list = []
+        self.__draw_bounds: pygame.Rect = pygame.Rect(0, 0, 0, 0)
+
+    def emit(self, source_surface: pygame.Surface, position, lifetime: float, rise: float = 0, sway_amplitude: float = 0):
+        """
+        Adds a particle centered on the position.
+        :param lifetime: How many seconds the particle lives. It fades out over this time.
+        :param rise: How many pixels the particle moves up over its lifetime.
+        :param sway_amplitude: How many pixels the particle sways sideways while rising.
+        """
+        if self.particle_count == len(self.lifetimes):
+            self.__grow()
+        index = self.particle_count
+        self.origins[index] = position
+        self.rises[index] = rise
+        self.sway_amplitudes[index] = sway_amplitude
+        self.elapsed_times[index] = 0
+        self.lifetimes[index] = lifetime
+        self.sizes[index] = source_surface.get_size()
+        self.applied_alphas[index] = -1
+        self.surfaces.append(self.__acquire_surface(source_surface))
+        self.source_surfaces.append(source_surface)
+        self.particle_count += 1
+        self.version += 1
+
+    def update(self, delta_time: float):
+        count = self.particle_count
+        if count == 0:
+            return
+        elapsed_times = self.elapsed_times[:count]
+        elapsed_times += delta_time
+        is_alive = elapsed_times < self.lifetimes[:count]
+        if not is_alive.all():
+            self.__remove_dead_particles(is_alive)
+        self.version += 1
+
+    def clear(self):
+        self.particle_count = 0
+        self.surfaces.clear()
+        self.source_surfaces.clear()
+        self.__free_surfaces.clear()
+        self.version += 1
+
+    def is_animating(self) -> bool:
+        return self.particle_count > 0
+
+    def should_draw(self) -> bool:
+        return self.particle_count > 0
+
+    def should_show_tooltip(self, mouse_pos):
+        return False
+
+    def get_draw_bounds(self) -> pygame.Rect:
+        self.__prepare()
+        return self.__draw_bounds
+
+    def get_draw_state(self) -> tuple:
+        return self.version,
+
+    def draw(self, screen: RenderTarget):
+        self.__prepare()
+        screen.blits(self.__blit_sequence)
+
+    def __prepare(self):
+        """
+        Calculates the positions and alphas of the particles, and applies the alphas to their surfaces. Only done once per change.
+        """
+        if self.__prepared_version == self.version:
+            return
+        self.__prepared_version = self.version
+        count = self.particle_count
+        if count == 0:
+            self.__blit_sequence = []
+            self.__draw_bounds = pygame.Rect(0, 0, 0, 0)
+            return
+
+        progress = self.elapsed_times[:count] / self.lifetimes[:count]
+        alphas = 255 - (progress * 255).astype(np.int64)
+        centers_y = self.origins[:count, 1] - self.rises[:count] * progress
+        centers_x = self.origins[:count, 0] + np.sin(centers_y / self.SWAY_WAVELENGTH) * self.sway_amplitudes[:count]
+        # Rounded half away from zero, like a pygame.Rect center is
+        centers = np.stack((centers_x, centers_y), axis=1)
+        centers = np.copysign(np.floor(np.abs(centers) + 0.5), centers).astype(np.int64)
+        sizes = self.sizes[:count]
+        top_lefts = centers - sizes // 2
+
+        surfaces = self.surfaces
+        changed_alphas = np.flatnonzero(alphas != self.applied_alphas[:count])
+        if len(changed_alphas) > 0:
+            # The surfaces may be in the frame the render thread is drawing, so they are only changed once it is done
+            with render_thread.surface_lock:
+                for index, alpha in zip(changed_alphas.tolist(), alphas[changed_alphas].tolist()):
+                    surfaces[index].set_alpha(alpha)
+            self.applied_alphas[:count] = alphas
+
+        self.__blit_sequence = list(zip(surfaces, top_lefts.tolist()))
+        left, top = top_lefts.min(axis=0).tolist()
+        right, bottom = (top_lefts + sizes).max(axis=0).tolist()
+        self.__draw_bounds = pygame.Rect(left, top, right - left, bottom - top)
+
+    def __remove_dead_particles(self, is_alive: np.ndarray):
+        count = self.particle_count
+        for index in np.flatnonzero(~is_alive).tolist():
+            self.__release_surface(self.source_surfaces[index], self.surfaces[index])
+        alive_indices = np.flatnonzero(is_alive)
+        alive_count = len(alive_indices)
+        # Keeps the emission order, so overlapping particles are drawn the same way every frame
+        for array in (self.origins, self.rises, self.sway_amplitudes, self.elapsed_times, self.lifetimes, self.sizes, self.applied_alphas):
+            array[:alive_count] = array[:count][alive_indices]
+        alive_index_list = alive_indices.tolist()
+        self.surfaces = [self.surfaces[index] for index in alive_index_list]
+        self.source_surfaces = [self.source_surfaces[index] for index in alive_index_list]
+        self.particle_count = alive_count
+
+    def __acquire_surface(self, source_surface: pygame.Surface) -> pygame.Surface:
+        free_surfaces = self.__free_surfaces.get(source_surface)
+        if free_surfaces:
+            return free_surfaces.pop()
+        # The source may be blitted by the render thread at the same time
+        with render_thread.surface_lock:
+            return source_surface.copy()
+
+    def __release_surface(self, source_surface: pygame.Surface, surface: pygame.Surface):
+        free_surfaces = self.__free_surfaces.setdefault(source_surface, [])
+        if len(free_surfaces) < self.MAX_FREE_SURFACES:
+            free_surfaces.append(surface)
+
+    def __grow(self):
+        capacity = len(self.lifetimes) * 2
+        self.origins = np.resize(self.origins, (capacity, 2))
+        self.rises = np.resize(self.rises, capacity)
+        self.sway_amplitudes = np.resize(self.sway_amplitudes, capacity)
+        self.elapsed_times = np.resize(self.elapsed_times, capacity)
+        self.lifetimes = np.resize(self.lifetimes, capacity)
+        self.sizes = np.resize(self.sizes, (capacity, 2))
+        self.applied_alphas = np.resize(self.applied_alphas, capacity)
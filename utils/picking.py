@@ -0,0 +1,68 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+import pygame
+
+if TYPE_CHECKING:
+    from typing import List, Dict, Tuple, Optional
+    from utils.drawing import Drawable
+
+
+class HoverIndex:
+    """
+    Answers "what is under the mouse" for the drawables of the last drawn frame.
+    The drawables are bucketed into a uniform grid by their rects, so a lookup only has to check the drawables in a single cell.
+    The grid is only rebuilt when the scene changes, and the hovered drawables are only looked up again when the mouse moves or the scene changes.
+    """
+    CELL_SIZE = 128
+
+    def __init__(self, bounds: pygame.Rect):
+        self.bounds: pygame.Rect = bounds
+        """The area that is indexed. Parts of drawables outside the bounds can't be hovered."""
+        self.drawables: List[Drawable] = []
+        """The indexed drawables, in the order they were drawn."""
+        self.__scene_signature: List[tuple] = []
+        self.__cells: Dict[Tuple[int, int], List[int]] = {}
+        self.__hovered_indices: List[int] = []
+        self.__hovered_position: Optional[tuple] = None
+
+    def update(self, drawables: List[Drawable]):
+        """
+        Updates the index to match the drawn drawables.
+        The grid is only rebuilt if the order or rect of any drawable has changed.
+        :param drawables: The drawn drawables, in the order they were drawn.
+        """
+        self.drawables = drawables
+        # Drawables recreated every frame (draw calls) count as unchanged, as long as they are drawn in the same order at the same place
+        scene_signature = [(drawable.draw_order, drawable.rect.x, drawable.rect.y, drawable.rect.width, drawable.rect.height) for drawable in drawables]
+        if scene_signature == self.__scene_signature:
+            return
+        self.__scene_signature = scene_signature
+        self.__rebuild_cells()
+
+    def get_hovered_drawables(self, position) -> List[Drawable]:
+        """
+        :param position: The mouse position.
+        :return: The drawables whose rect contains the position, topmost (last drawn) first.
+        """
+        if position != self.__hovered_position:
+            self.__hovered_position = position
+            self.__hovered_indices = []
+            if self.bounds.collidepoint(position):
+                cell = (int(position[0]) // self.CELL_SIZE, int(position[1]) // self.CELL_SIZE)
+                for index in reversed(self.__cells.get(cell, ())):
+                    if self.drawables[index].rect.collidepoint(position):
+                        self.__hovered_indices.append(index)
+        return [self.drawables[index] for index in self.__hovered_indices]
+
+    def __rebuild_cells(self):
+        self.__cells.clear()
+        self.__hovered_position = None
+        for index, drawable in enumerate(self.drawables):
+            rect = drawable.rect.clip(self.bounds)
+            if rect.width == 0 or rect.height == 0:
+                continue
+            for cell_x in range(rect.left // self.CELL_SIZE, (rect.right - 1) // self.CELL_SIZE + 1):
+                for cell_y in range(rect.top // self.CELL_SIZE, (rect.bottom - 1) // self.CELL_SIZE + 1):
+                    # Indices are appended in draw order, so each cell stays sorted from bottom to top
+                    self.__cells.setdefault((cell_x, cell_y), []).append(index)
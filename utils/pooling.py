@@ -0,0 +1,71 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import List, Optional
+
+
+class ObjectPool:
+    """
+    Keeps released objects of one type for reuse, so they don't have to be created again.
+    Released objects only become reusable after recycle(), which is called at the start of each frame.
+    Until then, code holding a reference to a released object can still see it as destroyed.
+    """
+    def __init__(self, name: str, max_size: int):
+        self.name: str = name
+        self.max_size: int = max_size
+        """The maximum number of objects kept. Objects released to a full pool are left to the garbage collector."""
+        self.free_objects: List[object] = []
+        """Objects that can be reused."""
+        self.released_objects: List[object] = []
+        """Objects released this frame. They become free on the next recycle()."""
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def acquire(self) -> Optional[object]:
+        """
+        :return: A free object to reset and reuse, or None if the pool is empty.
+        """
+        if self.free_objects:
+            self.hits += 1
+            return self.free_objects.pop()
+        self.misses += 1
+        return None
+
+    def release(self, pooled_object: object):
+        if len(self.free_objects) + len(self.released_objects) < self.max_size:
+            self.released_objects.append(pooled_object)
+
+    def recycle(self):
+        self.free_objects.extend(self.released_objects)
+        self.released_objects.clear()
+
+    def get_hit_rate(self) -> float:
+        total = self.hits + self.misses
+        if total == 0:
+            return 0
+        return self.hits / total
+
+    def clear(self):
+        self.free_objects.clear()
+        self.released_objects.clear()
+
+
+object_pools: List[ObjectPool] = []
+"""All pools created with create_object_pool()."""
+
+
+def create_object_pool(name: str, max_size: int) -> ObjectPool:
+    object_pool = ObjectPool(name, max_size)
+    object_pools.append(object_pool)
+    return object_pool
+
+
+def recycle_object_pools():
+    for object_pool in object_pools:
+        object_pool.recycle()
+
+
+def clear_object_pools():
+    for object_pool in object_pools:
+        object_pool.clear()
@@ -0,0 +1,88 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+import threading
+import time
+
+if TYPE_CHECKING:
+    from typing import Optional
+    from utils.drawing import RenderCommandList, RenderTarget
+
+
+class RenderThread:
+    """
+    Replays recorded frames on a background thread, so a frame is drawn while the next one is simulated.
+    pygame releases the GIL while blitting, so on a multi-core machine the drawing overlaps the Python code of the next frame.
+
+    The render thread only replays the blits of a RenderCommandList. Everything else stays on the main thread:
+    events and Inputs, updating the game, picking what to draw (including tooltips and hover), and presenting the display.
+    Inputs are read once per frame, and the whole frame is updated and recorded against them before its commands are submitted,
+    so the render thread never sees inputs or game objects in the middle of a change.
+
+    Only one frame is replayed at a time, while the main thread records the next one.
+    The recorded surfaces must not be changed after they have been drawn. The few places that change or read them on the main thread anyway
+    (compositing, copying particle surfaces, fading particles) hold surface_lock while doing so.
+    """
+    def __init__(self):
+        self.surface_lock: threading.Lock = threading.Lock()
+        """Held while a frame is replayed. pygame surfaces are not thread safe, so take it before blitting from shared surfaces on the main thread."""
+        self.replay_time: float = 0
+        """How many seconds replaying the latest frame took."""
+        self.__condition: threading.Condition = threading.Condition()
+        self.__submitted_frame: Optional[tuple] = None
+        """The command list and the render target of the frame waiting to be replayed."""
+        self.__is_busy: bool = False
+        """If a submitted frame has not finished replaying yet."""
+        self.__error: Optional[Exception] = None
+        """The error raised while replaying the latest frame. Raised again on the main thread by wait()."""
+        self.__thread: Optional[threading.Thread] = None
+
+    def submit(self, command_list: RenderCommandList, render_target: RenderTarget):
+        """
+        Replays the commands onto the render target on the render thread. Waits for the previous frame to finish first.
+        The command list must not be changed until the frame has been replayed.
+        """
+        self.wait()
+        with self.__condition:
+            self.__submitted_frame = (command_list, render_target)
+            self.__is_busy = True
+            self.__condition.notify_all()
+        if self.__thread is None:
+            # Daemonic, so a frame being replayed doesn't keep the game from quitting
+            self.__thread = threading.Thread(target=self.__run, name="Render thread", daemon=True)
+            self.__thread.start()
+
+    def wait(self):
+        """
+        Blocks until the submitted frame has been replayed. Returns immediately if no frame is being replayed.
+        """
+        with self.__condition:
+            while self.__is_busy:
+                self.__condition.wait()
+            error = self.__error
+            self.__error = None
+        if error is not None:
+            raise Exception("The render thread failed to draw a frame.") from error
+
+    def __run(self):
+        while True:
+            with self.__condition:
+                while self.__submitted_frame is None:
+                    self.__condition.wait()
+                command_list, render_target = self.__submitted_frame
+                self.__submitted_frame = None
+            start = time.time()
+            error = None
+            try:
+                with self.surface_lock:
+                    command_list.replay(render_target)
+            except Exception as replay_error:
+                error = replay_error
+            self.replay_time = time.time() - start
+            with self.__condition:
+                self.__error = error
+                self.__is_busy = False
+                self.__condition.notify_all()
+
+
+render_thread = RenderThread()
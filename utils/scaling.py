@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import weakref
+from collections import OrderedDict
+from typing import Dict, Set
+
+import pygame
+
+from utils.constants import SCALE_CACHE_STEPS, SCALE_CACHE_MAX_SIZE
+
+
+class ScaledSurfaceCache:
+    """
+    A least-recently-used cache of scaled surfaces.
+    Scale factors are quantised to 1 / steps, so animated scales reuse the same few surfaces,
+    and everything scaling the same source surface shares them.
+    The cached surfaces must not be drawn onto. Changing their alpha right before blitting them is fine.
+    Source surfaces are only weakly referenced, so discarding a surface also drops its scaled copies.
+    """
+    def __init__(self, steps: int, max_size: int):
+        self.steps: int = steps
+        self.max_size: int = max_size
+        self.surfaces: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        """The scaled surfaces, keyed by the id of their source surface and their scale step."""
+        self.hits: int = 0
+        self.misses: int = 0
+        self.__source_steps: Dict[int, Set[int]] = {}
+        """The cached scale steps of each source surface, keyed by its id."""
+        self.__source_finalizers: Dict[int, weakref.finalize] = {}
+        """Removes the scaled copies of a source surface once it has been garbage collected, before its id can be reused."""
+
+    def get_scaled(self, surface: pygame.Surface, scale: float) -> pygame.Surface:
+        step = max(1, round(scale * self.steps))
+        key = (id(surface), step)
+        scaled_surface = self.surfaces.get(key)
+        if scaled_surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return scaled_surface
+        self.misses += 1
+        quantised_scale = step / self.steps
+        size = (int(surface.get_width() * quantised_scale), int(surface.get_height() * quantised_scale))
+        scaled_surface = pygame.transform.scale(surface, size)
+        self.surfaces[key] = scaled_surface
+        self.__add_source_step(surface, step)
+        if len(self.surfaces) > self.max_size:
+            (evicted_source_id, evicted_step), _ = self.surfaces.popitem(last=False)
+            self.__remove_source_step(evicted_source_id, evicted_step)
+        return scaled_surface
+
+    def get_hit_rate(self) -> float:
+        total = self.hits + self.misses
+        if total == 0:
+            return 0
+        return self.hits / total
+
+    def clear(self):
+        self.surfaces.clear()
+        self.__source_steps.clear()
+        for finalizer in self.__source_finalizers.values():
+            finalizer.detach()
+        self.__source_finalizers.clear()
+
+    def __add_source_step(self, surface: pygame.Surface, step: int):
+        source_id = id(surface)
+        steps = self.__source_steps.get(source_id)
+        if steps is None:
+            steps = set()
+            self.__source_steps[source_id] = steps
+            self.__source_finalizers[source_id] = weakref.finalize(surface, self.__forget_source, source_id)
+        steps.add(step)
+
+    def __remove_source_step(self, source_id: int, step: int):
+        steps = self.__source_steps[source_id]
+        steps.discard(step)
+        if not steps:
+            del self.__source_steps[source_id]
+            self.__source_finalizers.pop(source_id).detach()
+
+    def __forget_source(self, source_id: int):
+        self.__source_finalizers.pop(source_id, None)
+        for step in self.__source_steps.pop(source_id, ()):
+            self.surfaces.pop((source_id, step), None)
+
+
+scaled_surface_cache = ScaledSurfaceCache(SCALE_CACHE_STEPS, SCALE_CACHE_MAX_SIZE)
+
+
+def get_scaled_surface(surface: pygame.Surface, scale: float) -> pygame.Surface:
+    """
+    Scales the surface using the shared scale cache. The scale is quantised to 1 / SCALE_CACHE_STEPS.
+    The returned surface is shared, and must not be drawn onto.
+    """
+    return scaled_surface_cache.get_scaled(surface, scale)
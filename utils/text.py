@@ -0,0 +1,64 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+from collections import OrderedDict
+
+import pygame
+
+from utils.constants import TEXT_CACHE_MAX_SIZE
+
+if TYPE_CHECKING:
+    from typing import Optional
+
+
+class TextCache:
+    """
+    A least-recently-used cache of rendered text surfaces.
+    The surfaces are shared between all users of the same text, so they must not be modified.
+    Copy the surface first if it needs to be changed (for example with set_alpha).
+    """
+    def __init__(self, max_size: int):
+        self.max_size: int = max_size
+        self.surfaces: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def render(self, font: pygame.font.Font, text: str, antialias: bool, color, background=None) -> pygame.Surface:
+        key = (font, text, antialias, self.__get_color_key(color), self.__get_color_key(background))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color, background)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def get_hit_rate(self) -> float:
+        total = self.hits + self.misses
+        if total == 0:
+            return 0
+        return self.hits / total
+
+    def clear(self):
+        self.surfaces.clear()
+
+    @staticmethod
+    def __get_color_key(color) -> Optional[tuple]:
+        if color is None or isinstance(color, tuple):
+            return color
+        return tuple(pygame.Color(color))
+
+
+text_cache = TextCache(TEXT_CACHE_MAX_SIZE)
+
+
+def render_text(font: pygame.font.Font, text: str, antialias: bool, color, background=None) -> pygame.Surface:
+    """
+    Renders the text using the shared text cache. Has the same signature as pygame.font.Font.render().
+    The returned surface is shared, and must not be modified.
+    """
+    return text_cache.render(font, text, antialias, color, background)